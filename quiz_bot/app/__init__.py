@@ -2,17 +2,33 @@ import asyncio
 import logging
 from app.core.config import config
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand
 
 from app.core.config import config
 from app.bot.handlers import router
+from app.bot.survey import QUESTION_TEXTS
+from app.bot.con_funcs.client import init_client, close_client
+from app.bot.con_funcs.question import register_questions, seed_questions
+from app.bot.answer_buffer import answer_buffer
+from app.bot.storage import create_fsm_storage, close_storage
+from app.bot.webhook import WEBHOOK_PATH, update_queue
+from app.core.crypto import pii_cipher
+from app.bot.middlewares import throttling, update_scheduler
+from app.bot.sessions import session_checkpointer
+from app.bot.outbound import send_scheduler
 # 
 # импорты роутеров бота 
 # 
 
 bot = Bot(token=config.TELEGRAM_BOT_TOKEN)
-dp = Dispatcher()
+# Все исходящие запросы проходят через лимиты Telegram: общий и на чат
+bot.session.middleware(send_scheduler)
+dp = Dispatcher(storage=create_fsm_storage())
+# Обновления сверх лимита пользователя и при перегрузке отбрасываются до
+# постановки в очередь; обновления одного пользователя обрабатываются по
+# порядку, разных — параллельно
+dp.update.outer_middleware(throttling)
+dp.update.outer_middleware(update_scheduler)
 
 commands = [
         BotCommand(command="/start", description="Начать работу"),
@@ -34,7 +50,18 @@ async def start():
 
 async def on_startup():
     logging.info("🚀 Starting application")
+    # Без ключей шифрования приложение не запускается
+    pii_cipher.load()
+    await init_client()
+    register_questions(QUESTION_TEXTS)
+    answer_buffer.start()
+    # Сессии восстанавливаются до приема обновлений
+    if session_checkpointer is not None:
+        await session_checkpointer.start()
     await start()
+    # В режиме 'http' API начинает принимать запросы только после старта,
+    # поэтому кэш вопросов заполняется в фоне или при первом обращении
+    _ = asyncio.create_task(seed_questions())
     if config.DEBUG:
         _ = asyncio.create_task(
             dp.start_polling(
@@ -44,18 +71,27 @@ async def on_startup():
                 allowed_updates=dp.resolve_used_update_types(),
             )
         )
-    # else:
-    #     WEBHOOK_PATH = f"webhook/{settings.BOT_TOKEN}"
-    #     await bot.set_webhook(
-    #         f"https://{settings.DOMAIN}/{WEBHOOK_PATH}",
-    #         allowed_updates=dp.resolve_used_update_types(),
-    #     )
+    elif config.WEBHOOK_URL:
+        update_queue.start(bot, dp)
+        await bot.set_webhook(
+            f"{config.WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+            secret_token=config.WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
 
 
 async def on_shutdown():
     if config.DEBUG:
         await dp.stop_polling()
-    # else:
-    #     await dp.delete_webhook()
+    else:
+        # Webhook не удаляется: при перезапуске одного из процессов остальные
+        # продолжают принимать обновления
+        await update_queue.stop()
     # logging.info("⛔️ Stop bot")
     # logging.info("⛔️ Stop application"
+    await answer_buffer.stop()
+    if session_checkpointer is not None:
+        await session_checkpointer.stop()
+    await close_client()
+    await close_storage()
+    pii_cipher.close()
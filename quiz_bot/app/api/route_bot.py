@@ -0,0 +1,49 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from app.bot.sessions import session_store
+from app.bot.webhook import update_queue
+from app.bot.middlewares import throttling, update_scheduler
+from app.bot.con_funcs.client import client_stats
+from app.bot.outbound import send_scheduler
+from app.core.config import config
+
+router = APIRouter(prefix='/bot', tags=['Bot'])
+
+@router.post('/webhook')
+async def webhook(request: Request, x_telegram_bot_api_secret_token: str | None = Header(default=None)):
+    """
+    Принимает обновление Telegram и ставит его в очередь обработки.
+
+    Ответ отправляется сразу, не дожидаясь обработки обновления. При
+    переполненной очереди возвращается 503, и Telegram повторит доставку.
+
+    Raises:
+        HTTPException: 404, если бот работает не в режиме webhook, 401 при
+            неверном секретном токене, 503 при переполненной очереди.
+    """
+    if not update_queue.running:
+        raise HTTPException(status_code=404, detail="Режим webhook не включен")
+    if config.WEBHOOK_SECRET and not hmac.compare_digest(x_telegram_bot_api_secret_token or "", config.WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Неверный секретный токен")
+    if not update_queue.put(await request.json()):
+        raise HTTPException(status_code=503, detail="Очередь обновлений переполнена")
+    return {"ok": True}
+
+@router.get('/stats')
+async def stats():
+    """
+    Возвращает метрики бота: хранилище сессий, очередь, ограничение и
+    планировщик обновлений, запросы к API и планировщик исходящих запросов.
+
+    Returns:
+        dict: Метрики компонентов бота по разделам.
+    """
+    return {
+        "sessions": session_store.stats(),
+        "updates": update_queue.stats(),
+        "throttling": throttling.stats(),
+        "scheduler": update_scheduler.stats(),
+        "api": client_stats(),
+        "outbound": send_scheduler.stats(),
+    }
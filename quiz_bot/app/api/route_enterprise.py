@@ -2,9 +2,12 @@ from datetime import datetime
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.enterprise import EnterpriseCreate, EnterpriseOut, EnterpriseUpdate
+from app.db.schemas.enterprise import EnterpriseCreate, EnterpriseOut, EnterpriseUpdate, EnterpriseFilter
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
 from app.db import get_db 
 from app.services import service_enterprise as service
 
@@ -33,6 +36,30 @@ async def create(data: EnterpriseCreate, db: AsyncSession = Depends(get_db)):
             "time": datetime.now().isoformat(),
         }))
 
+@router.post('/upsert', response_model=EnterpriseOut)
+async def upsert_by_inn(data: EnterpriseCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Возвращает предприятие с таким же ИНН (обновив название) или создает новое
+    одним запросом к БД.
+
+    Args:
+        data (EnterpriseCreate): Данные предприятия.
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        EnterpriseOut: Существующее или созданное предприятие.
+    """
+    try:
+        return await service.upsert_by_inn(db, data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при сохранении предприятия по ИНН на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
 @router.get('/', response_model=EnterpriseOut)
 async def get(enterprise_id: int, db: AsyncSession = Depends(get_db)):
     """
@@ -57,18 +84,24 @@ async def get(enterprise_id: int, db: AsyncSession = Depends(get_db)):
         }))
 
 @router.get('/all', response_model=list[EnterpriseOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[EnterpriseFilter, Query()], db: AsyncSession = Depends(get_db)):
     """
-    Получает все предприятия через API.
+    Получает страницу списка предприятий через API.
 
     Args:
+        filters (EnterpriseFilter): Фильтры, after_id (курсор) и limit (размер страницы).
+        response (Response): Ответ; в заголовок X-Next-Cursor записывается курсор следующей страницы.
         db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
 
     Returns:
         list[EnterpriseOut]: Список предприятий или вызывает исключение при ошибке.
     """
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
@@ -2,9 +2,12 @@ from datetime import datetime
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.question import QuestionCreate, QuestionOut, QuestionUpdate
+from app.db.schemas.question import QuestionCreate, QuestionOut, QuestionUpdate, QuestionFilter
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
 from app.db import get_db 
 from app.services import service_question as service
 
@@ -33,6 +36,29 @@ async def create(data: QuestionCreate, db: AsyncSession = Depends(get_db)):
             "time": datetime.now().isoformat(),
         }))
 
+@router.post('/get_or_create', response_model=QuestionOut)
+async def get_or_create(data: QuestionCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Возвращает вопрос с таким же номером или создает новый одним запросом к БД.
+
+    Args:
+        data (QuestionCreate): Данные вопроса.
+        db (AsyncSession): Асинхронная сессия с базой данных.
+
+    Returns:
+        QuestionOut: Существующий или созданный вопрос.
+    """
+    try:
+        return await service.get_or_create(db, data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при получении или создании вопроса на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
 @router.get('/', response_model=QuestionOut)
 async def get(question_id: int, db: AsyncSession = Depends(get_db)):
     """
@@ -57,18 +83,24 @@ async def get(question_id: int, db: AsyncSession = Depends(get_db)):
         }))
 
 @router.get('/all', response_model=list[QuestionOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[QuestionFilter, Query()], db: AsyncSession = Depends(get_db)):
     """
-    Получает список всех вопросов.
+    Получает страницу списка вопросов.
 
     Args:
+        filters (QuestionFilter): Фильтры, after_id (курсор) и limit (размер страницы).
+        response (Response): Ответ; в заголовок X-Next-Cursor записывается курсор следующей страницы.
         db (AsyncSession): Асинхронная сессия с базой данных.
 
     Returns:
         list[QuestionOut]: Список всех вопросов.
     """
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
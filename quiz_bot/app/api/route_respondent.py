@@ -2,9 +2,12 @@ from datetime import datetime
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.respondent import RespondentCreate, RespondentOut, RespondentUpdate
+from app.db.schemas.respondent import RespondentCreate, RespondentOut, RespondentUpdate, RespondentFilter
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
 from app.db import get_db 
 from app.services import service_respondent as service
 
@@ -56,19 +59,94 @@ async def get(respondent_id: int, db: AsyncSession = Depends(get_db)):
             "time": datetime.now().isoformat(),
         }))
 
+@router.get('/by_phone', response_model=list[RespondentOut])
+async def get_by_phone(phone: str, db: AsyncSession = Depends(get_db)):
+    """
+    Находит респондентов по телефону через слепой индекс.
+
+    Args:
+        phone (str): Телефон в любом формате записи.
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        list[RespondentOut]: Найденные респонденты.
+    """
+    try:
+        return await service.get_by_contact(db, phone=phone)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при поиске респондентов по телефону на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
+@router.get('/by_email', response_model=list[RespondentOut])
+async def get_by_email(email: str, db: AsyncSession = Depends(get_db)):
+    """
+    Находит респондентов по email через слепой индекс.
+
+    Args:
+        email (str): Email без учета регистра.
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        list[RespondentOut]: Найденные респонденты.
+    """
+    try:
+        return await service.get_by_contact(db, email=email)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при поиске респондентов по email на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
+@router.post('/reindex')
+async def reindex_contacts(db: AsyncSession = Depends(get_db)):
+    """
+    Заполняет слепые индексы контактов у респондентов, сохраненных до их появления.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        dict: Число обработанных респондентов.
+    """
+    try:
+        return {"processed": await service.reindex_contacts(db)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при построении индекса контактов респондентов на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        raise HTTPException(status_code=500, detail="Не удалось построить индекс контактов")
+
 @router.get('/all', response_model=list[RespondentOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[RespondentFilter, Query()], db: AsyncSession = Depends(get_db)):
     """
-    Получает всех респондентов через API.
+    Получает страницу списка респондентов через API.
 
     Args:
+        filters (RespondentFilter): Фильтры, after_id (курсор) и limit (размер страницы).
+        response (Response): Ответ; в заголовок X-Next-Cursor записывается курсор следующей страницы.
         db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
 
     Returns:
         list[RespondentOut]: Список респондентов или вызывает исключение при ошибке.
     """
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
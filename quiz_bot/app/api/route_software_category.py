@@ -2,9 +2,12 @@ from datetime import datetime
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.software_category import SoftwareCategoryCreate, SoftwareCategoryOut, SoftwareCategoryUpdate
+from app.db.schemas.software_category import SoftwareCategoryCreate, SoftwareCategoryOut, SoftwareCategoryUpdate, SoftwareCategoryFilter, SoftwareCategorySearch
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
 from app.db import get_db 
 from app.services import service_software_category as service
 
@@ -33,6 +36,53 @@ async def create(data: SoftwareCategoryCreate, db: AsyncSession = Depends(get_db
             "time": datetime.now().isoformat(),
         }))
 
+@router.post('/get_or_create', response_model=SoftwareCategoryOut)
+async def get_or_create(data: SoftwareCategoryCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Возвращает категорию ПО с таким же именем без учета регистра или создаёт новую.
+
+    Args:
+        data (SoftwareCategoryCreate): Данные категории.
+        db (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        SoftwareCategoryOut: Данные существующей или созданной категории ПО.
+    """
+    try:
+        return await service.get_or_create(db, data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при получении или создании категории ПО на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
+@router.get('/search', response_model=list[SoftwareCategoryOut])
+async def search(params: Annotated[SoftwareCategorySearch, Query()], db: AsyncSession = Depends(get_db)):
+    """
+    Ищет категории ПО по началу названия без учета регистра (автодополнение
+    своего варианта класса ПО).
+
+    Args:
+        params (SoftwareCategorySearch): Префикс и максимальное число результатов.
+        db (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        list[SoftwareCategoryOut]: Найденные категории по алфавиту.
+    """
+    try:
+        return await service.search(db, params)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при поиске категорий ПО на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
 @router.get('/', response_model=SoftwareCategoryOut)
 async def get(software_category_id: int, db: AsyncSession = Depends(get_db)):
     """
@@ -57,18 +107,24 @@ async def get(software_category_id: int, db: AsyncSession = Depends(get_db)):
         }))
 
 @router.get('/all', response_model=list[SoftwareCategoryOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[SoftwareCategoryFilter, Query()], db: AsyncSession = Depends(get_db)):
     """
-    Получает список всех категорий программного обеспечения.
+    Получает страницу списка категорий программного обеспечения.
 
     Args:
+        filters (SoftwareCategoryFilter): Фильтры, after_id (курсор) и limit (размер страницы).
+        response (Response): Ответ; в заголовок X-Next-Cursor записывается курсор следующей страницы.
         db (AsyncSession): Асинхронная сессия базы данных.
 
     Returns:
         list[SoftwareCategoryOut]: Список всех категорий ПО.
     """
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
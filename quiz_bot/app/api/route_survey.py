@@ -2,9 +2,12 @@ from datetime import datetime
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.survey import SurveyCreate, SurveyOut, SurveyUpdate
+from app.db.schemas.survey import SurveyCreate, SurveyOut, SurveyUpdate, SurveyStart, SurveyStartOut, SurveyActiveOut, SurveyFilter
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
 from app.db import get_db 
 from app.services import service_survey as service
 
@@ -33,6 +36,52 @@ async def create(data: SurveyCreate, db: AsyncSession = Depends(get_db)):
             "time": datetime.now().isoformat(),
         }))
 
+@router.post('/start', response_model=SurveyStartOut)
+async def start(data: SurveyStart, db: AsyncSession = Depends(get_db)):
+    """
+    Начинает опрос одним запросом: предприятие, респондент, опрос и первый вопрос.
+
+    Args:
+        data (SurveyStart): Данные для начала опроса.
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        SurveyStartOut: Идентификаторы предприятия, респондента, опроса и первого вопроса.
+    """
+    try:
+        return await service.start(db, data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при начале опроса на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
+@router.get('/active', response_model=Optional[SurveyActiveOut])
+async def get_active(telegram_user_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Получает последний незавершенный опрос пользователя Telegram для продолжения.
+
+    Args:
+        telegram_user_id (int): Идентификатор пользователя Telegram.
+        db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
+
+    Returns:
+        SurveyActiveOut | None: Опрос с номерами отвеченных вопросов или null.
+    """
+    try:
+        return await service.get_active(db, telegram_user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при получении незавершенного опроса на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+
 @router.get('/', response_model=SurveyOut)
 async def get(survey_id: int, db: AsyncSession = Depends(get_db)):
     """
@@ -57,18 +106,24 @@ async def get(survey_id: int, db: AsyncSession = Depends(get_db)):
         }))
 
 @router.get('/all', response_model=list[SurveyOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[SurveyFilter, Query()], db: AsyncSession = Depends(get_db)):
     """
-    Получает все опросы через API.
+    Получает страницу списка опросов через API.
 
     Args:
+        filters (SurveyFilter): Фильтры, after_id (курсор) и limit (размер страницы).
+        response (Response): Ответ; в заголовок X-Next-Cursor записывается курсор следующей страницы.
         db (AsyncSession): Асинхронная сессия БД (автоматически внедряется).
 
     Returns:
         list[SurveyOut]: Список опросов или вызывает исключение при ошибке.
     """
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
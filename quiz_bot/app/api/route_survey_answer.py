@@ -1,28 +1,67 @@
 from datetime import datetime
+import csv
+import io
 import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.survey_answer import SurveyAnswerCreate, SurveyAnswerOut, SurveyAnswerUpdate
-from app.db import get_db 
+from app.db.schemas.survey_answer import SurveyAnswerCreate, SurveyAnswerOut, SurveyAnswerUpdate, SurveyAnswerFilter, SurveyAnswerExportParams
+from app.db.schemas.pagination import NEXT_CURSOR_HEADER
+from app.crud.pagination import next_cursor
+from app.db import AsyncSessionLocal, get_db 
+from app.core.config import config
+from app.crud.crud_survey_answer import EXPORT_COLUMNS, EXPORT_CONTACT_COLUMNS
 from app.services import service_survey_answer as service
 
 router = APIRouter(prefix='/survey_answers', tags=['SurveyAnswers'])
 
+def _rejected(e: IntegrityError | DataError) -> HTTPException:
+    # 409 — ссылка на несуществующий опрос или вопрос, 422 — недопустимое значение;
+    # бот отбрасывает такие строки, а при 5xx повторяет запрос
+    if isinstance(e, IntegrityError):
+        return HTTPException(status_code=409, detail="Ответ нарушает ограничения целостности")
+    return HTTPException(status_code=422, detail="Недопустимые данные ответа")
+
 @router.post('/', response_model=SurveyAnswerOut)
 async def create(data: SurveyAnswerCreate, db: AsyncSession = Depends(get_db)):
 
     try:
-        return await service.create(db, data)
+        survey_answer = await service.create(db, data)
     except HTTPException:
         raise
+    except (IntegrityError, DataError) as e:
+        raise _rejected(e)
     except Exception as e:
         logging.error(json.dumps({
             "message": "Ошибка при созданиии ответа на вопрос на стороне API",
             "error": str(e),
             "time": datetime.now().isoformat(),
         }))
+        raise HTTPException(status_code=500, detail="Не удалось сохранить ответ")
+    if not survey_answer:
+        raise HTTPException(status_code=500, detail="Не удалось сохранить ответ")
+    return survey_answer
+
+@router.post('/bulk', response_model=list[SurveyAnswerOut])
+async def create_many(data: list[SurveyAnswerCreate], db: AsyncSession = Depends(get_db)):
+
+    try:
+        return await service.create_many(db, data)
+    except HTTPException:
+        raise
+    except (IntegrityError, DataError) as e:
+        raise _rejected(e)
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка при созданиии пачки ответов на вопросы на стороне API",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        raise HTTPException(status_code=500, detail="Не удалось сохранить ответы")
 
 @router.get('/', response_model=SurveyAnswerOut)
 async def get(survey_answer_id: int, db: AsyncSession = Depends(get_db)):
@@ -39,10 +78,14 @@ async def get(survey_answer_id: int, db: AsyncSession = Depends(get_db)):
         }))
 
 @router.get('/all', response_model=list[SurveyAnswerOut])
-async def get_all(db: AsyncSession = Depends(get_db)):
+async def get_all(response: Response, filters: Annotated[SurveyAnswerFilter, Query()], db: AsyncSession = Depends(get_db)):
 
     try:
-        return await service.get_all(db)
+        items = await service.get_all(db, filters)
+        cursor = next_cursor(items, filters)
+        if cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+        return items
     except HTTPException:
         raise
     except Exception as e:
@@ -52,6 +95,72 @@ async def get_all(db: AsyncSession = Depends(get_db)):
             "time": datetime.now().isoformat(),
         }))
 
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def _export_rows(params: SurveyAnswerExportParams):
+    columns = EXPORT_COLUMNS + (EXPORT_CONTACT_COLUMNS if params.include_contacts else [])
+    if params.format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        yield ",".join(columns) + "\r\n"
+    # Сессия зависимости get_db закрывается до начала передачи ответа,
+    # поэтому выгрузка открывает свою на время потока
+    async with AsyncSessionLocal() as session:
+        try:
+            async for rows in service.export(session, params, config.EXPORT_BATCH_SIZE):
+                if params.format == 'csv':
+                    for row in rows:
+                        writer.writerow([
+                            json.dumps(row[c], ensure_ascii=False) if c == "answer" else _export_value(row[c])
+                            for c in columns
+                        ])
+                    chunk = buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    chunk = "".join(
+                        json.dumps({c: _export_value(row[c]) for c in columns}, ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+                yield chunk
+        except Exception as e:
+            # Заголовки уже отправлены: клиент увидит оборванный поток и может
+            # продолжить выгрузку с after_id последней полученной строки
+            logging.error(json.dumps({
+                "message": "Ошибка при выгрузке ответов на вопросы на стороне API",
+                "error": str(e),
+                "time": datetime.now().isoformat(),
+            }))
+            raise
+
+@router.get('/export')
+async def export(params: Annotated[SurveyAnswerExportParams, Query()]):
+    """
+    Потоково выгружает ответы на вопросы вместе с текстами вопросов, датами
+    опросов, респондентами и предприятиями в формате NDJSON или CSV.
+
+    Строки читаются из БД серверным курсором и отправляются клиенту по мере
+    чтения, поэтому выгрузка миллионов строк не накапливается в памяти API.
+
+    Args:
+        params (SurveyAnswerExportParams): Формат, фильтры, after_id и include_contacts.
+
+    Returns:
+        StreamingResponse: Поток строк выгрузки.
+    """
+    if params.format == 'csv':
+        media_type, extension = 'text/csv; charset=utf-8', 'csv'
+    else:
+        media_type, extension = 'application/x-ndjson', 'ndjson'
+    return StreamingResponse(
+        _export_rows(params),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="survey_answers.{extension}"'},
+    )
+
 @router.put('/', response_model=SurveyAnswerOut)
 async def update(survey_answer_id: int, data: SurveyAnswerUpdate, db: AsyncSession = Depends(get_db)):
 
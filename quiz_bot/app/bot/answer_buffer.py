@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+import httpx
+from app.core.config import config
+from app.bot.con_funcs.survey_answer import create_survey_answer, create_survey_answers
+
+# Ответы, которые не удалось сохранить, пишутся в отдельный журнал одной
+# JSON-строкой на ответ, чтобы их можно было загрузить повторно
+dead_letters = logging.getLogger("quiz_bot.answer_dead_letters")
+
+# Максимальная пауза между повторами сброса при недоступном API, в секундах
+MAX_RETRY_DELAY = 30.0
+
+def _is_rejected(e: httpx.HTTPStatusError) -> bool:
+    # 4xx: API отклонил данные, повтор не поможет; 5xx: временная ошибка сервера
+    return 400 <= e.response.status_code < 500
+
+class SurveyAnswerBuffer:
+    """
+    Буфер отложенной записи ответов на опрос.
+
+    Обработчики кладут ответы в буфер и сразу отправляют пользователю следующий
+    вопрос, а фоновая задача сбрасывает накопленные ответы всех пользователей
+    одним запросом к /survey_answers/bulk каждые flush_interval секунд или по
+    достижении max_rows строк. При остановке приложения буфер сбрасывается полностью.
+
+    Пока API недоступен, сброс повторяется с растущей паузой (до MAX_RETRY_DELAY).
+    Ответ, не сохраненный за max_retries попыток, ответ, отклоненный API, и
+    самые старые ответы при переполнении буфера (больше max_buffered строк)
+    пишутся в журнал dead_letters.
+
+    Attributes:
+        flush_interval: Период сброса буфера в секундах.
+        max_rows: Максимальное число строк в одной пачке.
+        max_buffered: Максимальное число ответов в буфере.
+        max_retries: Число неудачных попыток сохранения ответа до его отбрасывания.
+    """
+
+    def __init__(self, flush_interval: float, max_rows: int, max_buffered: int, max_retries: int):
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.max_buffered = max_buffered
+        self.max_retries = max_retries
+        # Ответ и число неудачных попыток его сохранения
+        self._rows: list[tuple[dict, int]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, data: dict):
+        """
+        Добавляет ответ в буфер.
+
+        Args:
+            data (dict): Данные ответа на опрос (survey_id, question_id, answer).
+        """
+        if len(self._rows) >= self.max_buffered:
+            oldest, _ = self._rows.pop(0)
+            self._dead_letter(oldest, "буфер переполнен")
+        self._rows.append((data, 0))
+        if len(self._rows) >= self.max_rows:
+            self._wakeup.set()
+
+    def _dead_letter(self, data: dict, reason: str):
+        self.dropped += 1
+        dead_letters.error(json.dumps({"reason": reason, "answer": data}, ensure_ascii=False))
+
+    def _requeue(self, rows: list[tuple[dict, int]]):
+        # Ответы возвращаются в начало буфера с учетом еще одной неудачной попытки
+        retry = []
+        for data, attempts in rows:
+            if attempts + 1 >= self.max_retries:
+                self._dead_letter(data, f"не сохранен за {self.max_retries} попыток")
+            else:
+                retry.append((data, attempts + 1))
+        self._rows[:0] = retry
+
+    async def flush(self) -> bool:
+        """
+        Сбрасывает все накопленные ответы в API пачками по max_rows строк.
+
+        Пачка, отклоненная API как некорректная (4xx), сохраняется по одной
+        строке, и отбрасываются только отклоненные строки. При ошибке сервера
+        (5xx) или сети пачка возвращается в буфер и повторяется при следующем сбросе.
+
+        Returns:
+            bool: True, если буфер сброшен полностью, иначе False (ответы остаются в буфере).
+        """
+        async with self._flush_lock:
+            while self._rows:
+                batch = self._rows[:self.max_rows]
+                del self._rows[:len(batch)]
+                try:
+                    await create_survey_answers([data for data, _ in batch])
+                except httpx.HTTPStatusError as e:
+                    if not _is_rejected(e):
+                        logging.error(f"API недоступен при сбросе буфера ответов, пачка из {len(batch)} строк будет повторена: {str(e)}")
+                        self._requeue(batch)
+                        return False
+                    # API отклонил пачку целиком: сохраняем ответы по одному,
+                    # чтобы некорректная строка не блокировала остальные
+                    if not await self._save_one_by_one(batch):
+                        return False
+                except Exception as e:
+                    logging.error(f"Ошибка при сбросе буфера ответов, пачка из {len(batch)} строк будет повторена: {str(e)}")
+                    self._requeue(batch)
+                    return False
+        return True
+
+    async def _save_one_by_one(self, batch: list[tuple[dict, int]]) -> bool:
+        for i, (data, _) in enumerate(batch):
+            try:
+                await create_survey_answer(data)
+            except httpx.HTTPStatusError as e:
+                if _is_rejected(e):
+                    logging.error(f"Ответ отклонен API и не будет сохранен: {data}, ошибка: {str(e)}")
+                    self._dead_letter(data, f"отклонен API: {e.response.status_code}")
+                    continue
+                logging.error(f"API недоступен при сохранении ответа, {len(batch) - i} ответов будут повторены: {str(e)}")
+                self._requeue(batch[i:])
+                return False
+            except Exception as e:
+                logging.error(f"Ошибка при сохранении ответа, {len(batch) - i} ответов будут повторены: {str(e)}")
+                self._requeue(batch[i:])
+                return False
+        return True
+
+    async def _run(self):
+        failures = 0
+        while True:
+            if failures:
+                # API недоступен: повторяем с растущей паузой, не реагируя на
+                # заполнение буфера, чтобы не нагружать API повторами
+                await asyncio.sleep(min(self.flush_interval * 2 ** failures, MAX_RETRY_DELAY))
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            failures = 0 if await self.flush() else failures + 1
+
+    def start(self):
+        """
+        Запускает фоновую задачу периодического сброса буфера.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Останавливает фоновую задачу и сбрасывает оставшиеся ответы.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not await self.flush():
+            logging.error(f"При остановке не удалось сохранить {len(self._rows)} ответов")
+            for data, _ in self._rows:
+                self._dead_letter(data, "не сохранен при остановке")
+            self._rows.clear()
+
+
+answer_buffer = SurveyAnswerBuffer(
+    flush_interval=config.ANSWER_FLUSH_INTERVAL_MS / 1000,
+    max_rows=config.ANSWER_FLUSH_MAX_ROWS,
+    max_buffered=config.ANSWER_BUFFER_MAX_ROWS,
+    max_retries=config.ANSWER_MAX_RETRIES,
+)
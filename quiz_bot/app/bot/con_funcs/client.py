@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import httpx
+from app.core.config import config
+from app.db.schemas.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+
+HTTP_TRANSPORT = 'http'
+ASGI_TRANSPORT = 'asgi'
+
+_client: httpx.AsyncClient | None = None
+_transport: "LimitedTransport | None" = None
+_asgi_app = None
+
+def bind_app(asgi_app):
+    """
+    Запоминает ASGI-приложение API для режима транспорта 'asgi'.
+
+    В этом режиме запросы бота передаются приложению FastAPI напрямую в памяти
+    процесса, без сокета и сетевого стека. Режим 'http' остается для
+    раздельного развертывания бота и API.
+
+    Args:
+        asgi_app: Приложение FastAPI, обслуживающее API.
+    """
+    global _asgi_app
+    _asgi_app = asgi_app
+
+class LimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Транспорт, ограничивающий число одновременных запросов бота к API.
+
+    Шаг опроса делает несколько запросов к API, и каждый из них занимает
+    соединение с PostgreSQL; без ограничения всплеск обновлений на стороне
+    бота напрямую превращался во всплеск нагрузки на БД. Запросы сверх
+    max_concurrency ждут свободного слота.
+
+    Attributes:
+        max_concurrency: Максимальное число одновременных запросов к API.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrency: int):
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+            # Тело ответа читается внутри слота, иначе соединение осталось бы
+            # занятым после его освобождения
+            await response.aread()
+            return response
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+def _create_transport() -> LimitedTransport:
+    if config.API_TRANSPORT == ASGI_TRANSPORT:
+        if _asgi_app is None:
+            raise RuntimeError("Для транспорта 'asgi' необходимо вызвать bind_app() с приложением API")
+        transport = httpx.ASGITransport(app=_asgi_app, raise_app_exceptions=False)
+    elif config.API_TRANSPORT == HTTP_TRANSPORT:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=config.API_MAX_CONNECTIONS,
+                max_keepalive_connections=config.API_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=config.API_KEEPALIVE_EXPIRY,
+            ),
+        )
+    else:
+        raise ValueError(f"Неизвестный транспорт API: {config.API_TRANSPORT}")
+    return LimitedTransport(transport, config.API_MAX_CONCURRENCY)
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Возвращает общий HTTP-клиент для обращений бота к API.
+
+    Клиент создается один раз на процесс и держит пул keep-alive соединений,
+    поэтому шаги опроса не платят за новое TCP-подключение на каждый запрос.
+
+    Returns:
+        httpx.AsyncClient: Общий асинхронный HTTP-клиент.
+    """
+    global _client, _transport
+    if _client is None or _client.is_closed:
+        _transport = _create_transport()
+        _client = httpx.AsyncClient(
+            transport=_transport,
+            timeout=httpx.Timeout(config.API_TIMEOUT, connect=config.API_CONNECT_TIMEOUT),
+        )
+    return _client
+
+def client_stats() -> dict:
+    """
+    Возвращает метрики ограничения одновременных запросов к API.
+
+    Returns:
+        dict: Метрики транспорта или пустой словарь, если клиент не создан.
+    """
+    if _client is None or _client.is_closed:
+        return {}
+    return _transport.stats()
+
+async def get_all_pages(url: str, params: dict | None = None) -> list:
+    """
+    Получает полный список из постраничного маршрута /all, переходя по
+    курсору из заголовка X-Next-Cursor.
+
+    Args:
+        url (str): Адрес маршрута списка.
+        params (dict | None): Фильтры списка.
+
+    Returns:
+        list: Записи всех страниц.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    client = get_client()
+    params = {**(params or {}), 'limit': MAX_PAGE_SIZE}
+    items = []
+    while True:
+        response = await client.get(url, params=params)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении списка {url}. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        items.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return items
+        params['after_id'] = cursor
+
+async def init_client() -> httpx.AsyncClient:
+    """
+    Создает общий HTTP-клиент при старте приложения.
+
+    Returns:
+        httpx.AsyncClient: Общий асинхронный HTTP-клиент.
+    """
+    client = get_client()
+    logging.info(f"HTTP-клиент для обращений к API создан (транспорт: {config.API_TRANSPORT})")
+    return client
+
+async def close_client():
+    """
+    Закрывает общий HTTP-клиент и все соединения пула при остановке приложения.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logging.info("HTTP-клиент для обращений к API закрыт")
@@ -1,6 +1,7 @@
 import logging
 import httpx
-from app.core.request_conf import URL, ENTERPRISES, ALL
+from app.bot.con_funcs.client import get_all_pages, get_client
+from app.core.request_conf import URL, ENTERPRISES, ALL, UPSERT
 
 async def create_enterprise(data: dict):
     """
@@ -16,14 +17,14 @@ async def create_enterprise(data: dict):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f'{URL}{ENTERPRISES}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании предприятия. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                enterprise = response.json()
-                return enterprise
+        client = get_client()
+        response = await client.post(f'{URL}{ENTERPRISES}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании предприятия. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            enterprise = response.json()
+            return enterprise
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании предприятия: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -32,6 +33,36 @@ async def create_enterprise(data: dict):
             response=e.response
         )
 
+async def upsert_enterprise(data: dict):
+    """
+    Возвращает предприятие с таким же ИНН или создает новое.
+
+    Args:
+        data (dict): Данные предприятия для отправки в API.
+
+    Returns:
+        dict: Объект существующего или созданного предприятия при успешном запросе.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.post(f'{URL}{ENTERPRISES}{UPSERT}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при сохранении предприятия. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            enterprise = response.json()
+            return enterprise
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при сохранении предприятия: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при сохранении предприятия",
+            request=e.request,
+            response=e.response
+        )
+
 async def get_enterprise(enterprise_id: int):
     """
     Получает предприятие по ID.
@@ -46,14 +77,14 @@ async def get_enterprise(enterprise_id: int):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{ENTERPRISES}', params={'enterprise_id': enterprise_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении предприятия. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                enterprise = response.json()
-                return enterprise
+        client = get_client()
+        response = await client.get(f'{URL}{ENTERPRISES}', params={'enterprise_id': enterprise_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении предприятия. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            enterprise = response.json()
+            return enterprise
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении предприятия: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -73,14 +104,8 @@ async def get_enterprises():
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{ENTERPRISES}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении предприятий. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                enterprises = response.json()
-                return enterprises
+        enterprises = await get_all_pages(f'{URL}{ENTERPRISES}{ALL}')
+        return enterprises
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении предприятий: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import httpx
-from app.core.request_conf import URL, QUESTIONS, ALL
+from app.bot.con_funcs.client import get_all_pages, get_client
+from app.core.request_conf import URL, QUESTIONS, ALL, GET_OR_CREATE
 
 async def create_question(data: dict):
     """
@@ -21,23 +23,15 @@ async def create_question(data: dict):
         if "number" not in data:
             data["number"] = 1  # Значение по умолчанию, если не указано
 
-        async with httpx.AsyncClient() as client:
-            # Сначала проверяем, существует ли вопрос с таким number
-            response = await client.get(f'{URL}{QUESTIONS}', params={'number': data["number"]})
-            if response.status_code == 200:
-                questions = response.json()
-                if questions and len(questions) > 0:
-                    logging.info(f"Вопрос с number {data['number']} уже существует, возвращаем существующий.")
-                    return questions[0]  # Возвращаем первый совпавший вопрос
-
-            # Если вопроса нет, создаем новый
-            response = await client.post(f'{URL}{QUESTIONS}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании вопроса. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                question = response.json()
-                return question
+        client = get_client()
+        # Номер вопроса уникален: API возвращает существующий вопрос или создает новый
+        response = await client.post(f'{URL}{QUESTIONS}{GET_OR_CREATE}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании вопроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            question = response.json()
+            return question
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании вопроса: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -60,14 +54,14 @@ async def get_question(question_id: int):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{QUESTIONS}', params={'question_id': question_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении вопроса. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                question = response.json()
-                return question
+        client = get_client()
+        response = await client.get(f'{URL}{QUESTIONS}', params={'question_id': question_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении вопроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            question = response.json()
+            return question
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении вопроса: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -87,18 +81,98 @@ async def get_questions():
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{QUESTIONS}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении вопросов. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                questions = response.json()
-                return questions
+        questions = await get_all_pages(f'{URL}{QUESTIONS}{ALL}')
+        return questions
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении вопросов: {str(e)}")
         raise httpx.HTTPStatusError(
             message="Произошла ошибка при получении вопросов",
             request=e.request,
             response=e.response
-        )
\ No newline at end of file
+        )
+
+# Кэш идентификаторов вопросов по их номеру. Набор вопросов анкеты не меняется
+# во время работы, поэтому после заполнения кэша шаг опроса не обращается к API.
+_question_ids: dict[int, int] = {}
+_question_texts: dict[int, str] = {}
+_seeded = False
+_cache_lock = asyncio.Lock()
+
+def register_questions(questions: dict[int, str]):
+    """
+    Регистрирует тексты вопросов анкеты, по которым заполняется кэш.
+
+    Args:
+        questions (dict[int, str]): Тексты вопросов по их номерам.
+    """
+    _question_texts.update(questions)
+
+async def _seed():
+    global _seeded
+    existing = await get_questions() or []
+    for question in sorted(existing, key=lambda q: q["id"]):
+        _question_ids.setdefault(question["number"], question["id"])
+    for number, text in _question_texts.items():
+        if number not in _question_ids:
+            question = await create_question({"text": text, "number": number, "answer_type": "string"})
+            _question_ids[number] = question["id"]
+    _seeded = True
+    logging.info(f"Кэш вопросов заполнен: {len(_question_ids)} шт.")
+
+async def seed_questions() -> bool:
+    """
+    Заполняет кэш вопросов одним запросом списка и создает недостающие вопросы.
+
+    Returns:
+        bool: True, если кэш заполнен, иначе False (кэш будет заполнен при первом обращении).
+    """
+    try:
+        async with _cache_lock:
+            await _seed()
+        return True
+    except Exception as e:
+        logging.warning(f"Не удалось заполнить кэш вопросов при старте: {str(e)}")
+        return False
+
+async def get_question_id(number: int) -> int:
+    """
+    Возвращает идентификатор вопроса по его номеру из кэша.
+
+    При первом промахе кэш заполняется целиком; вопрос с незарегистрированным
+    номером создается через API и также попадает в кэш.
+
+    Args:
+        number (int): Номер вопроса в анкете.
+
+    Returns:
+        int: Идентификатор вопроса.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    question_id = _question_ids.get(number)
+    if question_id is not None:
+        return question_id
+    async with _cache_lock:
+        if number not in _question_ids:
+            if not _seeded:
+                await _seed()
+            if number not in _question_ids:
+                text = _question_texts.get(number, f"Вопрос {number}")
+                question = await create_question({"text": text, "number": number, "answer_type": "string"})
+                _question_ids[number] = question["id"]
+    return _question_ids[number]
+
+def invalidate_questions(number: int | None = None):
+    """
+    Сбрасывает кэш вопросов целиком или для одного номера.
+
+    Args:
+        number (int | None): Номер вопроса; если не указан, сбрасывается весь кэш.
+    """
+    global _seeded
+    if number is None:
+        _question_ids.clear()
+        _seeded = False
+    else:
+        _question_ids.pop(number, None)
@@ -1,5 +1,6 @@
 import logging
 import httpx
+from app.bot.con_funcs.client import get_all_pages, get_client
 from app.core.request_conf import URL, RESPONDENTS, ALL
 
 async def create_respondent(data: dict):
@@ -16,14 +17,14 @@ async def create_respondent(data: dict):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f'{URL}{RESPONDENTS}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании респондента. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                respondent = response.json()
-                return respondent
+        client = get_client()
+        response = await client.post(f'{URL}{RESPONDENTS}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании респондента. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            respondent = response.json()
+            return respondent
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании респондента: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -46,14 +47,14 @@ async def get_respondent(respondent_id: int):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{RESPONDENTS}', params={'respondent_id': respondent_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении респондента. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                respondent = response.json()
-                return respondent
+        client = get_client()
+        response = await client.get(f'{URL}{RESPONDENTS}', params={'respondent_id': respondent_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении респондента. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            respondent = response.json()
+            return respondent
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении респондента: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -73,14 +74,8 @@ async def get_respondents():
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{RESPONDENTS}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении респондентов. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                respondents = response.json()
-                return respondents
+        respondents = await get_all_pages(f'{URL}{RESPONDENTS}{ALL}')
+        return respondents
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении респондентов: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -1,6 +1,9 @@
 import logging
+from collections import OrderedDict
 import httpx
-from app.core.request_conf import URL, SOFTWARE_CATEGORIES, ALL
+from app.bot.con_funcs.client import get_all_pages, get_client
+from app.core.config import config
+from app.core.request_conf import URL, SOFTWARE_CATEGORIES, ALL, GET_OR_CREATE, SEARCH
 
 async def create_software_category(data: dict):
     """
@@ -16,14 +19,14 @@ async def create_software_category(data: dict):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f'{URL}{SOFTWARE_CATEGORIES}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании категории ПО. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                software_category = response.json()
-                return software_category
+        client = get_client()
+        response = await client.post(f'{URL}{SOFTWARE_CATEGORIES}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании категории ПО. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            software_category = response.json()
+            return software_category
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании категории ПО: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -46,14 +49,14 @@ async def get_software_category(soft_cat_id: int):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SOFTWARE_CATEGORIES}', params={'software_category_id': soft_cat_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении категории ПО. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                software_category = response.json()
-                return software_category
+        client = get_client()
+        response = await client.get(f'{URL}{SOFTWARE_CATEGORIES}', params={'software_category_id': soft_cat_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении категории ПО. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            software_category = response.json()
+            return software_category
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении категории ПО: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -73,18 +76,115 @@ async def get_software_categories():
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SOFTWARE_CATEGORIES}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении категорий ПО. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                software_categories = response.json()
-                return software_categories
+        software_categories = await get_all_pages(f'{URL}{SOFTWARE_CATEGORIES}{ALL}')
+        return software_categories
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении категорий ПО: {str(e)}")
         raise httpx.HTTPStatusError(
             message="Произошла ошибка при получении категорий ПО",
             request=e.request,
             response=e.response
-        )
\ No newline at end of file
+        )
+
+async def get_or_create_software_category(data: dict):
+    """
+    Возвращает категорию ПО с таким же именем без учета регистра или создает новую.
+
+    Args:
+        data (Dict[str, Any]): Словарь с именем и описанием категории ПО.
+
+    Returns:
+        Dict[str, Any]: Объект существующей или созданной категории ПО при успешном запросе.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.post(f'{URL}{SOFTWARE_CATEGORIES}{GET_OR_CREATE}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении или создании категории ПО. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            software_category = response.json()
+            return software_category
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при получении или создании категории ПО: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при получении или создании категории ПО",
+            request=e.request,
+            response=e.response
+        )
+
+
+async def search_software_categories(prefix: str, limit: int = 10):
+    """
+    Ищет категории ПО по началу названия без учета регистра.
+
+    Args:
+        prefix (str): Начало названия категории.
+        limit (int): Максимальное число результатов.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные категории по алфавиту.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.get(f'{URL}{SOFTWARE_CATEGORIES}{SEARCH}', params={"prefix": prefix, "limit": limit})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при поиске категорий ПО. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            software_categories = response.json()
+            return software_categories
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при поиске категорий ПО: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при поиске категорий ПО",
+            request=e.request,
+            response=e.response
+        )
+
+
+# Уже разрешенные категории ПО "нормализованное имя -> id" в памяти бота.
+# Категории не удаляются и не переименовываются при прохождении опроса,
+# поэтому записи не устаревают; число записей ограничено
+# SOFTWARE_CATEGORY_CACHE_SIZE, давно не использованные вытесняются первыми
+_category_index: OrderedDict[str, int] = OrderedDict()
+
+def _normalize_name(name: str) -> str:
+    # Совпадает с нормализацией на стороне API (crud_software_category.normalize_name)
+    return " ".join(name.split())[:100].lower()
+
+async def resolve_software_category(name: str, description: str) -> int | None:
+    """
+    Возвращает идентификатор категории ПО по имени без учета регистра.
+
+    При промахе по кэшу в памяти выполняется один запрос get-or-create к API:
+    категория ищется по уникальному индексу lower(name) и создается, если ее нет.
+
+    Args:
+        name (str): Название категории ПО.
+        description (str): Описание на случай создания новой категории.
+
+    Returns:
+        int | None: Идентификатор категории ПО или None, если API не вернул категорию.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    key = _normalize_name(name)
+    software_category_id = _category_index.get(key)
+    if software_category_id is not None:
+        _category_index.move_to_end(key)
+        return software_category_id
+    software_category = await get_or_create_software_category({"name": name.strip(), "description": description})
+    if not software_category:
+        return None
+    _category_index[key] = software_category["id"]
+    while len(_category_index) > config.SOFTWARE_CATEGORY_CACHE_SIZE:
+        _category_index.popitem(last=False)
+    return software_category["id"]
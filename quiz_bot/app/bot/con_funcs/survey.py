@@ -1,17 +1,19 @@
 import logging
 import httpx
-from app.core.request_conf import URL, SURVEYS, ALL
+from app.bot.con_funcs.client import get_all_pages, get_client
+from datetime import datetime
+from app.core.request_conf import URL, SURVEYS, ALL, START, ACTIVE
 
 async def create_survey(data: dict):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f'{URL}{SURVEYS}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании опроса. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                survey = response.json()
-                return survey
+        client = get_client()
+        response = await client.post(f'{URL}{SURVEYS}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании опроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey = response.json()
+            return survey
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании опроса: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -20,16 +22,110 @@ async def create_survey(data: dict):
             response=e.response
         )
 
+async def start_survey(data: dict):
+    """
+    Начинает опрос одним запросом: предприятие, респондент, опрос и первый вопрос.
+
+    Args:
+        data (dict): Данные предприятия, респондента, опроса и первого вопроса.
+
+    Returns:
+        dict: Идентификаторы enterprise_id, respondent_id, survey_id и question_id.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.post(f'{URL}{SURVEYS}{START}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при начале опроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            started = response.json()
+            return started
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при начале опроса: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при начале опроса",
+            request=e.request,
+            response=e.response
+        )
+
+async def get_active_survey(telegram_user_id: int):
+    """
+    Получает последний незавершенный опрос пользователя Telegram.
+
+    Args:
+        telegram_user_id (int): Идентификатор пользователя Telegram.
+
+    Returns:
+        dict | None: Идентификаторы опроса и номера отвеченных вопросов или None.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.get(f'{URL}{SURVEYS}{ACTIVE}', params={'telegram_user_id': telegram_user_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении незавершенного опроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey = response.json()
+            return survey
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при получении незавершенного опроса: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при получении незавершенного опроса",
+            request=e.request,
+            response=e.response
+        )
+
+async def complete_survey(sur_id: int):
+    """
+    Отмечает опрос завершенным.
+
+    Args:
+        sur_id (int): Идентификатор опроса.
+
+    Returns:
+        dict: Обновленный опрос.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.put(
+            f'{URL}{SURVEYS}',
+            params={'survey_id': sur_id},
+            json={'completed_at': datetime.utcnow().isoformat() + "Z"}
+        )
+        if response.status_code != 200:
+            logging.error(f"Ошибка при завершении опроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey = response.json()
+            return survey
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при завершении опроса: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при завершении опроса",
+            request=e.request,
+            response=e.response
+        )
+
 async def get_survey(sur_id: int):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SURVEYS}', params={'survey_id': sur_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении опроса. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                survey = response.json()
-                return survey
+        client = get_client()
+        response = await client.get(f'{URL}{SURVEYS}', params={'survey_id': sur_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении опроса. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey = response.json()
+            return survey
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении опроса: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -40,14 +136,8 @@ async def get_survey(sur_id: int):
     
 async def get_surveys():
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SURVEYS}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении опросов. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                surveys = response.json()
-                return surveys
+        surveys = await get_all_pages(f'{URL}{SURVEYS}{ALL}')
+        return surveys
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении опросов: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -1,6 +1,7 @@
 import logging
 import httpx
-from app.core.request_conf import URL, SURVEY_ANSWERS, ALL
+from app.bot.con_funcs.client import get_all_pages, get_client
+from app.core.request_conf import URL, SURVEY_ANSWERS, ALL, BULK
 
 async def create_survey_answer(data: dict):
     """
@@ -16,14 +17,14 @@ async def create_survey_answer(data: dict):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f'{URL}{SURVEY_ANSWERS}', json=data)
-            if response.status_code != 200:
-                logging.error(f"Ошибка при создании ответа на опрос. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                survey_answer = response.json()
-                return survey_answer
+        client = get_client()
+        response = await client.post(f'{URL}{SURVEY_ANSWERS}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании ответа на опрос. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey_answer = response.json()
+            return survey_answer
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при создании ответа на опрос: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -32,6 +33,36 @@ async def create_survey_answer(data: dict):
             response=e.response
         )
 
+async def create_survey_answers(data: list[dict]):
+    """
+    Создает пачку ответов на опрос одним запросом.
+
+    Args:
+        data (List[Dict[str, Any]]): Список словарей с данными ответов на опрос.
+
+    Returns:
+        List[Dict[str, Any]]: Список созданных ответов при успешном запросе.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    try:
+        client = get_client()
+        response = await client.post(f'{URL}{SURVEY_ANSWERS}{BULK}', json=data)
+        if response.status_code != 200:
+            logging.error(f"Ошибка при создании ответов на опрос. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey_answers = response.json()
+            return survey_answers
+    except httpx.HTTPStatusError as e:
+        logging.exception(f"Произошла ошибка при создании ответов на опрос: {str(e)}")
+        raise httpx.HTTPStatusError(
+            message="Произошла ошибка при создании ответов на опрос",
+            request=e.request,
+            response=e.response
+        )
+
 async def get_survey_answer(sur_ans_id: int):
     """
     Получает данные ответа на опрос по его идентификатору.
@@ -46,14 +77,14 @@ async def get_survey_answer(sur_ans_id: int):
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SURVEY_ANSWERS}', params={'survey_answer_id': sur_ans_id})
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении ответа на опрос. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                survey_answer = response.json()
-                return survey_answer
+        client = get_client()
+        response = await client.get(f'{URL}{SURVEY_ANSWERS}', params={'survey_answer_id': sur_ans_id})
+        if response.status_code != 200:
+            logging.error(f"Ошибка при получении ответа на опрос. Код: {response.status_code}, Тело ответа: {response.text}")
+        response.raise_for_status()
+        if response.status_code == 200:
+            survey_answer = response.json()
+            return survey_answer
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении ответа на опрос: {str(e)}")
         raise httpx.HTTPStatusError(
@@ -73,14 +104,8 @@ async def get_survey_answers():
         httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f'{URL}{SURVEY_ANSWERS}{ALL}')
-            if response.status_code != 200:
-                logging.error(f"Ошибка при получении ответов на опросы. Код: {response.status_code}, Тело ответа: {response.text}")
-            response.raise_for_status()
-            if response.status_code == 200:
-                survey_answers = response.json()
-                return survey_answers
+        survey_answers = await get_all_pages(f'{URL}{SURVEY_ANSWERS}{ALL}')
+        return survey_answers
     except httpx.HTTPStatusError as e:
         logging.exception(f"Произошла ошибка при получении ответов на опросы: {str(e)}")
         raise httpx.HTTPStatusError(
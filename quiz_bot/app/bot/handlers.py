@@ -1,947 +1,414 @@
-from aiogram import Router, F
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from aiogram import F, Router
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.fsm.context import FSMContext
 from aiogram.filters.command import Command
-from .states import SurveyStates
 from .utils import create_inline_keyboard
-from .keyboards.inline import (
-    IMPLEMENTATION_STAGE_BUTTONS,
-    PAIN_POINTS_BUTTONS,
-    FUNCTIONALITY_DETAILS_BUTTONS,
-    INTEGRATION_DETAILS_BUTTONS,
-    PERSONNEL_DETAILS_BUTTONS,
-    COMPATIBILITY_DETAILS_BUTTONS,
-    COSTS_DETAILS_BUTTONS,
-    SUPPORT_DETAILS_BUTTONS,
-    MAIN_BARRIER_BUTTONS,
-    DIRECT_REPLACEMENT_BUTTONS,
-    PILOT_TESTING_BUTTONS,
-    YES_NO_DEPENDS_BUTTONS,
-    YES_NO_BUTTONS
+from .survey import (
+    CHOICE,
+    FINAL,
+    PAGES,
+    TEXT,
+    PAIN_POINTS_INDEX,
+    QUESTION_TEXTS,
+    SURVEY_STEPS,
+    Step,
+    compile_survey,
 )
-from cryptography.fernet import Fernet
-import base64
-import re
 from datetime import datetime
-from app.bot.con_funcs.enterprise import create_enterprise
-from app.bot.con_funcs.respondent import create_respondent
-from app.bot.con_funcs.survey import create_survey
-from app.bot.con_funcs.survey_answer import create_survey_answer
-from app.bot.con_funcs.software_category import *
-from app.bot.con_funcs.question import create_question, get_questions  # Добавили импорт
+from app.bot.con_funcs.survey import complete_survey, get_active_survey, start_survey
+from app.bot.keyboards.inline import RESUME_BUTTONS
+from app.bot.states import SurveyStates
+from app.bot.answer_buffer import answer_buffer
+from app.bot.con_funcs.software_category import resolve_software_category
+from app.bot.con_funcs.question import get_question_id
+from app.bot.middlewares import SessionMiddleware
+from app.bot.sessions import SurveySession, session_store
+from app.core.config import config
+from app.core.crypto import pii_cipher
 
 router = Router()
 
-# In-memory storage for responses (to be replaced with DB later)
-user_responses = {}
-
-# Generate a Fernet key for encryption (in production, store this securely)
-fernet_key = Fernet.generate_key()
-cipher_suite = Fernet(fernet_key)
-
-def encrypt_data(data: str) -> str:
-    if not data:
-        return ""
-    return cipher_suite.encrypt(data.encode()).decode()
-
-def decrypt_data(data: str) -> str:
-    if not data:
-        return ""
-    return cipher_suite.decrypt(data.encode()).decode()
-
-# Pain points pages with descriptions and follow-up states
-PAIN_POINTS_PAGES = [
-    {
-        "label": "Функционал",
-        "description": "(отсутствие нужного функционала для ваших систем/оборудования)",
-        "callback_data": "functionality",
-        "follow_up_state": SurveyStates.pain_points_functionality_details,
-        "follow_up_message": "Укажите конкретные модули/процессы:"
-    },
-    {
-        "label": "Интеграция",
-        "description": "(уровень сложности интеграции ваших систем/оборудования с отечественным ПО)",
-        "callback_data": "integration",
-        "follow_up_state": SurveyStates.pain_points_integration_details,
-        "follow_up_message": "Укажите уровень сложности:",
-        "follow_up_buttons": INTEGRATION_DETAILS_BUTTONS
-    },
-    {
-        "label": "Кадры",
-        "description": "(доступность специалистов с опытом работы в нужном отечественном ПО)",
-        "callback_data": "personnel",
-        "follow_up_state": SurveyStates.pain_points_personnel_details,
-        "follow_up_message": "Укажите:",
-        "follow_up_buttons": PERSONNEL_DETAILS_BUTTONS
-    },
-    {
-        "label": "Совместимость",
-        "description": "(острота проблемы совместимости отечественного ПО с вашим имеющимся ПО)",
-        "callback_data": "compatibility",
-        "follow_up_state": SurveyStates.pain_points_compatibility_details,
-        "follow_up_message": "Укажите:",
-        "follow_up_buttons": COMPATIBILITY_DETAILS_BUTTONS
-    },
-    {
-        "label": "Затраты",
-        "description": "(направления затрат, которые вызывают наибольшее беспокойство)",
-        "callback_data": "costs",
-        "follow_up_state": SurveyStates.pain_points_costs_details,
-        "follow_up_message": "Укажите:",
-        "follow_up_buttons": COSTS_DETAILS_BUTTONS
-    },
-    {
-        "label": "Техническая поддержка",
-        "description": "(важность уровня и скорости тех. поддержки)",
-        "callback_data": "support",
-        "follow_up_state": SurveyStates.pain_points_support_details,
-        "follow_up_message": "Укажите:",
-        "follow_up_buttons": SUPPORT_DETAILS_BUTTONS
-    }
-]
-
-ITEMS_PER_PAGE = 3
+# Данные ответов пользователя передаются обработчикам в аргументе session
+router.message.middleware(SessionMiddleware(session_store))
+router.callback_query.middleware(SessionMiddleware(session_store))
 
+@lru_cache(maxsize=None)
 def create_pagination_keyboard(current_page: int) -> InlineKeyboardMarkup:
     buttons = []
     nav_row = []
     if current_page > 0:
         nav_row.append(InlineKeyboardButton(text="<", callback_data=f"prev_{current_page}", disable=True if current_page == 0 else False))
     nav_row.append(InlineKeyboardButton(text="Выбрать", callback_data=f"choose_{current_page}", disable=True))
-    if current_page < (len(PAIN_POINTS_PAGES) - 1) // ITEMS_PER_PAGE:
-        nav_row.append(InlineKeyboardButton(text=">", callback_data=f"next_{current_page}", disable=True if current_page >= (len(PAIN_POINTS_PAGES) - 1) // ITEMS_PER_PAGE else False))
+    if current_page < PAIN_POINTS_INDEX.last_page:
+        nav_row.append(InlineKeyboardButton(text=">", callback_data=f"next_{current_page}", disable=True if current_page >= PAIN_POINTS_INDEX.last_page else False))
     buttons.append(nav_row)
     buttons.append([InlineKeyboardButton(text="Другое", callback_data="other", disable=True)])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 def get_page_options(current_page: int) -> list:
-    start_idx = current_page * ITEMS_PER_PAGE
-    end_idx = start_idx + ITEMS_PER_PAGE
-    return PAIN_POINTS_PAGES[start_idx:end_idx]
-
-@router.message(Command("start"))
-async def start(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id] = {}
-    consent_buttons = {"Согласен": "consent_agree", "Не согласен": "consent_disagree"}
-    keyboard = create_inline_keyboard(consent_buttons, 2)
-    await message.reply("Вы проходите опросник от АО «РНИЦ НСО» для сбора обратной связи. Согласны ли вы на обработку персональных данных вашей компании?", reply_markup=keyboard)
-    await state.set_state(SurveyStates.consent)
-
-@router.callback_query(SurveyStates.consent, F.data == "consent_agree")
-async def consent_agree(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["consent"] = True
-    await callback.message.edit_text("Введите полное название вашей компании или организации:", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.company_name)
-
-@router.callback_query(SurveyStates.consent, F.data == "consent_disagree")
-async def consent_disagree(callback: CallbackQuery, state: FSMContext):
-    await callback.message.edit_text("Вы не согласились на обработку персональных данных. Опрос завершен.", reply_markup=None)
-    await callback.answer()
-    await state.clear()
-
-@router.message(SurveyStates.company_name)
-async def company_name(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    company_name = message.text.strip()
-    if not company_name:
-        await message.reply("Пожалуйста, введите непустое название компании.")
-        return
-    user_responses[user_id]["company_name"] = company_name
-    await message.reply("Введите ИНН вашей компании:")
-    await state.set_state(SurveyStates.company_inn)
-
-@router.callback_query(SurveyStates.company_name, F.data == "skip_company_name")
-async def skip_company_name(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["company_name"] = None
-    await callback.message.edit_text("Название компании обязательно. Пожалуйста, введите название компании.", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.company_name)
-
-@router.message(SurveyStates.company_inn)
-async def company_inn(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    inn = message.text.strip()
-    if inn and not re.match(r'^\d{10}$|^\d{12}$', inn):
-        await message.reply("Пожалуйста, введите ИНН из 10 или 12 цифр.")
-        return
-    user_responses[user_id]["company_inn"] = inn if inn else None
-    # Сохранение данных предприятия
-    enterprise_data = {
-        "name": user_responses[user_id]["company_name"],
-        "inn": user_responses[user_id]["company_inn"] or "",
-        "short_name": "none",
-        "is_active": True
-    }
-    try:
-        enterprise = await create_enterprise(enterprise_data)
-        user_responses[user_id]["enterprise_id"] = enterprise.get("id") if enterprise else None
-    except Exception as e:
-        await message.reply(f"Ошибка при создании предприятия: {str(e)}")
-        await state.clear()
-        return
-    await message.reply("Введите ваше ФИО (полностью):")
-    await state.set_state(SurveyStates.full_name)
-
-@router.callback_query(SurveyStates.company_inn, F.data == "skip_company_inn")
-async def skip_company_inn(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["company_inn"] = None
-    # Сохранение данных предприятия
-    enterprise_data = {
-        "name": user_responses[user_id]["company_name"],
-        "inn": user_responses[user_id]["company_inn"] or "",
-        "short_name": "none",
-        "is_active": True
-    }
-    try:
-        enterprise = await create_enterprise(enterprise_data)
-        user_responses[user_id]["enterprise_id"] = enterprise.get("id") if enterprise else None
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при создании предприятия: {str(e)}")
-        await state.clear()
-        return
-    await callback.message.edit_text("Введите ваше ФИО (полностью):", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.full_name)
-
-@router.message(SurveyStates.full_name)
-async def full_name(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["full_name"] = message.text
-    await message.reply("Введите вашу должность:")
-    await state.set_state(SurveyStates.position)
-
-@router.callback_query(SurveyStates.full_name, F.data == "skip_full_name")
-async def skip_full_name(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["full_name"] = None
-    await callback.message.edit_text("Введите вашу должность:", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.position)
-
-@router.message(SurveyStates.position)
-async def position(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["position"] = message.text
-    await message.reply("Введите телефон для связи:")
-    await state.set_state(SurveyStates.phone_number)
-
-@router.callback_query(SurveyStates.position, F.data == "skip_position")
-async def skip_position(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["position"] = None
-    await callback.message.edit_text("Введите телефон для связи:", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.phone_number)
-
-@router.message(SurveyStates.phone_number)
-async def phone_number(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    phone = message.text.strip()
-    if not re.match(r'^\+?\d+$', phone):
-        await message.reply("Пожалуйста, введите телефон, содержащий только цифры (можно с ведущим +).")
-        return
-    user_responses[user_id]["phone_number"] = encrypt_data(phone)
-    await message.reply("Введите email вашей компании для связи:")
-    await state.set_state(SurveyStates.email)
-
-@router.callback_query(SurveyStates.phone_number, F.data == "skip_phone")
-async def skip_phone(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["phone_number"] = None
-    await callback.message.edit_text("Введите email вашей компании для связи:", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.email)
-
-@router.message(SurveyStates.email)
-async def email(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    email_input = message.text.strip()
-    if '@' not in email_input:
-        await message.reply("Пожалуйста, введите email, содержащий символ @.")
-        return
-    user_responses[user_id]["email"] = encrypt_data(email_input)
-    # Сохранение данных респондента
-    phone = decrypt_data(user_responses[user_id]["phone_number"]) if user_responses[user_id]["phone_number"] else None
-    email = decrypt_data(user_responses[user_id]["email"]) if user_responses[user_id]["email"] else None
-    respondent_data = {
-        "full_name": user_responses[user_id]["full_name"],
-        "position": user_responses[user_id]["position"],
+    return PAIN_POINTS_INDEX.page(current_page)
+
+def create_page_selection_keyboard(current_page: int, columns: int) -> InlineKeyboardMarkup:
+    buttons = {opt["label"]: opt["callback_data"] for opt in get_page_options(current_page)}
+    return create_inline_keyboard(buttons, columns)
+
+async def begin_survey(session: SurveySession):
+    """
+    Сохраняет предприятие, респондента и опрос одним запросом к API.
+
+    Args:
+        session (SurveySession): Сессия опроса пользователя.
+
+    Raises:
+        httpx.HTTPStatusError: Если сервер вернул ошибку HTTP.
+    """
+    phone = pii_cipher.decrypt(session.phone_number)
+    email = pii_cipher.decrypt(session.email)
+    start_data = {
+        "enterprise": {
+            "name": session.company_name,
+            "inn": session.company_inn or None,
+            "short_name": "none",
+            "is_active": True
+        },
+        "full_name": session.full_name,
+        "position": session.position,
         "phone": phone,
         "email": email,
-        "enterprise_id": user_responses[user_id]["enterprise_id"]
-    }
-    try:
-        respondent = await create_respondent(respondent_data)
-        user_responses[user_id]["respondent_id"] = respondent.get("id") if respondent else None
-    except Exception as e:
-        await message.reply(f"Ошибка при создании респондента: {str(e)}")
-        await state.clear()
-        return
-
-    # Создаем опрос после создания респондента
-    survey_data = {
-        "title": "Survey for user " + str(user_id),
-        "respondent_id": user_responses[user_id]["respondent_id"],
+        "consent": session.consent,
+        "telegram_user_id": session.telegram_user_id,
         "started_at": datetime.utcnow().isoformat() + "Z",
-        "ip_address": "unknown",
-        "user_agent": "Telegram Bot"
+        "user_agent": "Telegram Bot",
+        "question": {"text": QUESTION_TEXTS[1], "number": 1, "answer_type": "string"}
     }
-    try:
-        survey = await create_survey(survey_data)
-        user_responses[user_id]["survey_id"] = survey.get("id") if survey else None
-    except Exception as e:
-        await message.reply(f"Ошибка при создании опроса: {str(e)}")
-        await state.clear()
-        return
-
-    # Создаем вопрос о стадии перехода
-    question_text = "1. На какой стадии перехода на отечественное ПО находится ваше предприятие?"
-    try:
-        question_data = {"text": question_text, "number": 1, "answer_type": "string"}
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    keyboard = create_inline_keyboard(IMPLEMENTATION_STAGE_BUTTONS, 2)
-    await message.reply(
-        question_text,
-        reply_markup=keyboard
-    )
-    await state.set_state(SurveyStates.implementation_stage)
-
-@router.callback_query(SurveyStates.email, F.data == "skip_email")
-async def skip_email(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["email"] = None
-    # Сохранение данных респондента
-    phone = decrypt_data(user_responses[user_id]["phone_number"]) if user_responses[user_id]["phone_number"] else None
-    respondent_data = {
-        "full_name": user_responses[user_id]["full_name"],
-        "position": user_responses[user_id]["position"],
-        "phone": phone,
-        "email": None,
-        "enterprise_id": user_responses[user_id]["enterprise_id"]
-    }
-    try:
-        respondent = await create_respondent(respondent_data)
-        user_responses[user_id]["respondent_id"] = respondent.get("id") if respondent else None
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при создании респондента: {str(e)}")
-        await state.clear()
-        return
-
-    # Создаем опрос после создания респондента
-    survey_data = {
-        "title": "Survey for user " + str(user_id),
-        "respondent_id": user_responses[user_id]["respondent_id"],
-        "started_at": datetime.utcnow().isoformat() + "Z",
-        "ip_address": "unknown",
-        "user_agent": "Telegram Bot"
-    }
-    try:
-        survey = await create_survey(survey_data)
-        user_responses[user_id]["survey_id"] = survey.get("id") if survey else None
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при создании опроса: {str(e)}")
-        await state.clear()
-        return
-
-    # Создаем вопрос о стадии перехода
-    question_text = "1. На какой стадии перехода на отечественное ПО находится ваше предприятие?"
-    try:
-        question_data = {"text": question_text, "number": 1, "answer_type": "string"}
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    keyboard = create_inline_keyboard(IMPLEMENTATION_STAGE_BUTTONS, 2)
-    await callback.message.reply(
-        question_text,
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.implementation_stage)
-
-@router.callback_query(SurveyStates.implementation_stage, F.data.in_(IMPLEMENTATION_STAGE_BUTTONS.values()))
-async def implementation_stage(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    selected_stage = next((k for k, v in IMPLEMENTATION_STAGE_BUTTONS.items() if v == callback.data), None)
-    user_responses[user_id]["implementation_stage"] = selected_stage
-
-    # Сохранение ответа на опрос
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": selected_stage}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-
-    await state.update_data(current_page=0)
-    current_page = 0
-    options = get_page_options(current_page)
-    options_text = "\n".join([f"{opt['label']} {opt['description']}" for opt in options])
-    keyboard = create_pagination_keyboard(current_page)
-    await callback.message.edit_text(
-        f"4. Основные направления «болей» с которыми столкнулось ваше предприятие?\n\n{options_text}",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.pain_points_page)
-
-@router.callback_query(SurveyStates.pain_points_page, F.data.startswith("next_"))
-async def pain_points_next(callback: CallbackQuery, state: FSMContext):
-    data = await state.get_data()
-    current_page = data.get("current_page", 0)
-    new_page = current_page + 1
-    await state.update_data(current_page=new_page)
-    options = get_page_options(new_page)
-    options_text = "\n".join([f"{opt['label']} {opt['description']}" for opt in options])
-    keyboard = create_pagination_keyboard(new_page)
-    await callback.message.edit_text(
-        f"4. Основные направления «болей» с которыми столкнулось ваше предприятие?\n\n{options_text}",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-
-@router.callback_query(SurveyStates.pain_points_page, F.data == "other")
-async def pain_points_other(callback: CallbackQuery, state: FSMContext):
-    await callback.message.edit_text("Введите ваш вариант:", reply_markup=None)
-    await callback.answer()
-    await state.set_state(SurveyStates.pain_points_other)
-
-@router.message(SurveyStates.pain_points_other)
-async def pain_points_other_input(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["pain_points"] = user_responses[user_id].get("pain_points", [])
-    user_responses[user_id]["pain_points"].append("other")
-    user_responses[user_id]["pain_points_details"] = message.text
-
-    # Создаем новый вопрос для "other"
-    question_text = f"Другое направление 'болей': {message.text}"
-    try:
-        question_data = {"text": question_text, "number": 4, "answer_type": "string"}  # number=4 для вопроса 4
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await message.reply(f"Ошибка при работе с вопросами: {str(e)}")
+    started = await start_survey(start_data)
+    session.enterprise_id = started["enterprise_id"]
+    session.respondent_id = started["respondent_id"]
+    session.survey_id = started["survey_id"]
+    session.question_id = started["question_id"]
+
+# Действия шагов опроса: получают сессию и ответ пользователя
+
+async def set_consent(session: SurveySession, value: str):
+    session.consent = value == "consent_agree"
+
+async def start_survey_action(session: SurveySession, value: str | None):
+    await begin_survey(session)
+
+async def add_pain_point(session: SurveySession, value: str):
+    session.pain_points.append(value)
+
+async def add_other_pain_point(session: SurveySession, value: str):
+    session.pain_points.append("other")
+
+async def resolve_software_class(session: SurveySession, value: str):
+    # Категория ПО ищется в кэше бота и создается на стороне API только при промахе
+    session.software_category_id = await resolve_software_category(value, "string")
+
+async def resolve_custom_software_class(session: SurveySession, value: str):
+    session.software_category_id = await resolve_software_category(value, value)
+
+async def complete_survey_action(session: SurveySession, value: str):
+    # Ответы уже сохранены; ошибка отметки о завершении не должна прерывать
+    # опрос, иначе незавершенный опрос будет предложен к продолжению
+    try:
+        await complete_survey(session.survey_id)
+    except Exception as e:
+        logging.error(f"Не удалось отметить опрос {session.survey_id} завершенным: {str(e)}")
+
+ACTIONS = {
+    "set_consent": set_consent,
+    "begin_survey": start_survey_action,
+    "add_pain_point": add_pain_point,
+    "add_other_pain_point": add_other_pain_point,
+    "resolve_software_class": resolve_software_class,
+    "resolve_custom_software_class": resolve_custom_software_class,
+    "complete_survey": complete_survey_action,
+}
+
+# Таблица переходов строится один раз при импорте; ошибки в определении
+# опроса обнаруживаются при старте, а не на шаге пользователя
+survey = compile_survey(SURVEY_STEPS, ACTIONS)
+
+def in_survey(_, raw_state: str | None = None) -> bool:
+    return raw_state in survey.by_state
+
+def render_step(step: Step, page: int = 0) -> tuple[str, InlineKeyboardMarkup | None]:
+    """
+    Возвращает текст и клавиатуру шага опроса.
+
+    Шаги и их клавиатуры неизменяемы, поэтому результат для каждой пары
+    (шаг, страница) строится один раз и затем берется из кэша.
+
+    Args:
+        step (Step): Шаг опроса.
+        page (int): Номер страницы для шага PAGES.
+
+    Returns:
+        tuple[str, InlineKeyboardMarkup | None]: Текст сообщения и клавиатура.
+    """
+    return _render_step(step.name, page)
+
+@lru_cache(maxsize=None)
+def _render_step(name: str, page: int) -> tuple[str, InlineKeyboardMarkup | None]:
+    step = survey.steps[name]
+    if step.kind == PAGES:
+        options_text = "\n".join([f"{opt['label']} {opt['description']}" for opt in get_page_options(page)])
+        return f"{step.prompt}\n\n{options_text}", create_pagination_keyboard(page)
+    if step.buttons:
+        return step.prompt, create_inline_keyboard(step.buttons, step.columns)
+    return step.prompt, None
+
+async def go_to_step(event: Message | CallbackQuery, state: FSMContext, session: SurveySession, step: Step):
+    text, keyboard = render_step(step)
+    if isinstance(event, CallbackQuery):
+        await event.message.edit_text(text, reply_markup=keyboard)
+    else:
+        await event.reply(text, reply_markup=keyboard)
+    if step.kind == FINAL:
+        session.clear()
         await state.clear()
-        return
+    else:
+        session.step = step.name
+        await state.set_state(survey.state_of(step))
 
-    # Сохранение ответа на вопрос 4 (other)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": f"other: {message.text}"}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await state.set_state(SurveyStates.main_barrier)
+async def abort_survey(event: Message | CallbackQuery, state: FSMContext, session: SurveySession, text: str):
+    message = event.message if isinstance(event, CallbackQuery) else event
+    await message.reply(text)
+    session.clear()
+    await state.clear()
 
-@router.callback_query(SurveyStates.pain_points_page, F.data.startswith("choose_"))
-async def pain_points_choose(callback: CallbackQuery, state: FSMContext):
-    data = await state.get_data()
-    current_page = data.get("current_page", 0)
-    options = get_page_options(current_page)
-    buttons = {opt["label"]: opt["callback_data"] for opt in options}
-    keyboard = create_inline_keyboard(buttons, 1)
-    await callback.message.edit_text("Выберите один из вариантов:", reply_markup=keyboard)
-    await callback.answer()
-    await state.set_state(SurveyStates.pain_points_selection)
-
-@router.callback_query(SurveyStates.pain_points_selection)
-async def pain_points_selection(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    selected_option = callback.data
-    user_responses[user_id]["pain_points"] = user_responses[user_id].get("pain_points", [])
-    user_responses[user_id]["pain_points"].append(selected_option)
-    page = next((p for p in PAIN_POINTS_PAGES if p["callback_data"] == selected_option), None)
-    if page:
-        # Создаем новый вопрос для выбранного направления
-        question_text = f"Детали для {page['label']}: {page['description']}"
-        question_number = 4  # Устанавливаем номер для вопроса 4
+async def handle_answer(event: Message | CallbackQuery, state: FSMContext, session: SurveySession, step: Step, value: str | None):
+    """
+    Обрабатывает ответ на шаг опроса: сохраняет его в сессии, выполняет
+    действие шага, записывает ответ на вопрос и переходит к следующему шагу.
+
+    Args:
+        event (Message | CallbackQuery): Событие с ответом пользователя.
+        state (FSMContext): Состояние FSM пользователя.
+        session (SurveySession): Сессия опроса пользователя.
+        step (Step): Текущий шаг опроса.
+        value (str | None): Ответ пользователя или None при пропуске шага.
+    """
+    next_name = step.branches.get(value, step.next)
+    process = step.process_branches or value not in step.branches
+    if step.session_field:
+        setattr(session, step.session_field, (pii_cipher.encrypt(value) if step.encrypt else value) if value else None)
+
+    if step.action and process:
         try:
-            question_data = {"text": question_text, "number": question_number, "answer_type": "string"}
-            question = await create_question(question_data)
-            user_responses[user_id]["question_id"] = question.get("id")
+            await ACTIONS[step.action](session, value)
         except Exception as e:
-            await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-            await state.clear()
+            await abort_survey(event, state, session, f"{step.action_error}: {str(e)}")
             return
 
-        if "follow_up_buttons" in page:
-            keyboard = create_inline_keyboard(page["follow_up_buttons"], 2)
-            await callback.message.reply(page["follow_up_message"], reply_markup=keyboard)
-        else:
-            await callback.message.reply(page["follow_up_message"])
-        await state.set_state(page["follow_up_state"])
-    await callback.answer()
-
-@router.message(SurveyStates.pain_points_functionality_details)
-async def pain_points_functionality_details(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["pain_points_details"] = message.text
-    # Сохранение ответа на вопрос 4 (functionality)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": message.text}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.pain_points_integration_details)
-async def pain_points_integration_details(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pain_points_details"] = callback.data
-    # Сохранение ответа на вопрос 4 (integration)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await callback.message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.pain_points_personnel_details)
-async def pain_points_personnel_details(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pain_points_details"] = callback.data
-    # Сохранение ответа на вопрос 4 (personnel)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await callback.message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.pain_points_compatibility_details)
-async def pain_points_compatibility_details(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pain_points_details"] = callback.data
-    # Сохранение ответа на вопрос 4 (compatibility)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await callback.message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.pain_points_costs_details)
-async def pain_points_costs_details(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pain_points_details"] = callback.data
-    # Сохранение ответа на вопрос 4 (costs)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await callback.message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.pain_points_support_details)
-async def pain_points_support_details(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pain_points_details"] = callback.data
-    # Сохранение ответа на вопрос 4 (support)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    keyboard = create_inline_keyboard(MAIN_BARRIER_BUTTONS, 2)
-    await callback.message.reply(
-        "5. Что является главным барьером для перехода на отечественное ПО?",
-        reply_markup=keyboard
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.main_barrier)
-
-@router.callback_query(SurveyStates.main_barrier)
-async def main_barrier(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["main_barrier"] = callback.data
-    # Создаем новый вопрос для барьера
-    question_text = "5. Что является главным барьером для перехода на отечественное ПО?"
-    try:
-        question_data = {"text": question_text, "number": 5, "answer_type": "string"}  # number=5 для вопроса 5
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    # Сохранение ответа на вопрос 5
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    await callback.message.edit_text(
-        "6. Насколько важна для вас возможность прямого замещения зарубежного ПО на отечественное ПО? (аналог «один в один»)",
-        reply_markup=create_inline_keyboard(DIRECT_REPLACEMENT_BUTTONS, 2)
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.direct_replacement)
-
-@router.callback_query(SurveyStates.direct_replacement)
-async def direct_replacement(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["direct_replacement"] = callback.data
-    # Создаем новый вопрос для замещения
-    question_text = "6. Насколько важна для вас возможность прямого замещения зарубежного ПО на отечественное ПО? (аналог «один в один»)"
-    try:
-        question_data = {"text": question_text, "number": 6, "answer_type": "string"}  # number=6 для вопроса 6
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    # Сохранение ответа на вопрос 6
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    if callback.data == "other_repl":
-        await callback.message.edit_text("Введите свой вариант:", reply_markup=None)
-        await state.set_state(SurveyStates.direct_replacement_details)
-    else:
-        await callback.message.edit_text(
-            "7. Готовы ли вы выделить ресурсы (время специалистов, тестовый контур) для пилотного тестирования потенциальных российских решений?",
-            reply_markup=create_inline_keyboard(YES_NO_DEPENDS_BUTTONS, 2)
-        )
-        await state.set_state(SurveyStates.pilot_testing)
-    await callback.answer()
-
-@router.message(SurveyStates.direct_replacement_details)
-async def direct_replacement_details(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["direct_replacement_details"] = message.text
-    # Создаем новый вопрос для деталей замещения
-    question_text = f"Детали замещения: {message.text}"
-    try:
-        question_data = {"text": question_text, "number": 6, "answer_type": "string"}  # number=6 для вопроса 6 (other)
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    # Сохранение ответа на вопрос 6 (other)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": f"other: {message.text}"}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    await message.reply(
-        "7. Готовы ли вы выделить ресурсы (время специалистов, тестовый контур) для пилотного тестирования потенциальных российских решений?",
-        reply_markup=create_inline_keyboard(YES_NO_DEPENDS_BUTTONS, 2)
-    )
-    await state.set_state(SurveyStates.pilot_testing)
-
-@router.callback_query(SurveyStates.pilot_testing)
-async def pilot_testing(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["pilot_testing"] = callback.data
-    # Создаем новый вопрос для тестирования
-    question_text = "7. Готовы ли вы выделить ресурсы (время специалистов, тестовый контур) для пилотного тестирования потенциальных российских решений?"
-    try:
-        question_data = {"text": question_text, "number": 7, "answer_type": "string"}  # number=7 для вопроса 7
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    # Сохранение ответа на вопрос 7
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    await callback.message.edit_text(
-        "8. Какие классы ПО вы бы хотели протестировать? (выберите или укажите текстом)",
-        reply_markup=create_inline_keyboard(PILOT_TESTING_BUTTONS, 2)
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.software_classes)
-
-@router.callback_query(SurveyStates.software_classes)
-async def software_classes(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["software_classes"] = callback.data
-    
-    # Создаем новый вопрос для классов ПО
-    question_text = "8. Какие классы ПО вы бы хотели протестировать? (выберите или укажите текстом)"
-    try:
-        question_data = {"text": question_text, "number": 8, "answer_type": "string"}  # number=8 для вопроса 8
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    if callback.data != "other":
+    if step.question is not None and process:
         try:
-            # Проверяем, существует ли уже такая категория ПО
-            existing_categories = await get_software_categories()
-            category_exists = any(cat["name"].lower() == callback.data.lower() for cat in existing_categories)
-            
-            if not category_exists:
-                # Создаем новую категорию ПО только если она не существует
-                software_category_data = {"name": callback.data, "description": "string"}
-                software_category = await create_software_category(software_category_data)
-                user_responses[user_id]["software_category_id"] = software_category.get("id") if software_category else None
-            else:
-                # Если категория существует, находим её ID
-                existing_category = next(cat for cat in existing_categories if cat["name"].lower() == callback.data.lower())
-                user_responses[user_id]["software_category_id"] = existing_category.get("id")
-            
-            # Сохранение ответа на вопрос 8
-            survey_answer_data = {
-                "survey_id": user_responses[user_id]["survey_id"],
-                "question_id": user_responses[user_id]["question_id"],
-                "answer": {"value": callback.data}
-            }
-            await create_survey_answer(survey_answer_data)
-            
-            await callback.message.edit_text(
-                "9. Интересно ли вам участие в мероприятии, где можно пообщаться напрямую с разработчиками российского ПО?",
-                reply_markup=create_inline_keyboard(YES_NO_BUTTONS, 2)
-            )
-            await state.set_state(SurveyStates.event_interest)
-            
+            session.question_id = await get_question_id(step.question)
         except Exception as e:
-            await callback.message.reply(f"Ошибка при обработке категории ПО: {str(e)}")
-            await state.clear()
+            await abort_survey(event, state, session, f"Ошибка при работе с вопросами: {str(e)}")
             return
+        if step.answer_label:
+            value = survey.button_maps[step.name].label(value)
+        survey_answer_data = {
+            "survey_id": session.survey_id,
+            "question_id": session.question_id,
+            "answer": {"value": step.answer_format.format(value), **step.answer_extra}
+        }
+        answer_buffer.add(survey_answer_data)
+
+    await go_to_step(event, state, session, survey.steps[next_name])
+
+async def handle_page(callback: CallbackQuery, state: FSMContext, session: SurveySession, step: Step):
+    if callback.data == "other":
+        await go_to_step(callback, state, session, survey.steps[step.other])
+        return
+    command, _, page = callback.data.partition("_")
+    if not page.isdigit():
+        return
+    page = int(page)
+    if command == "choose" and page <= PAIN_POINTS_INDEX.last_page:
+        select = survey.steps[step.select]
+        await callback.message.edit_text(select.prompt, reply_markup=create_page_selection_keyboard(page, select.columns))
+        session.step = select.name
+        await state.set_state(survey.state_of(select))
+        return
+    if command == "next":
+        page += 1
+    elif command == "prev":
+        page -= 1
     else:
-        await callback.message.edit_text("Введите свой вариант:", reply_markup=None)
-        await state.set_state(SurveyStates.software_classes_details)
-    
-    await callback.answer()
-
-@router.message(SurveyStates.software_classes_details)
-async def software_classes_details(message: Message, state: FSMContext):
-    user_id = message.from_user.id
-    user_responses[user_id]["software_classes_details"] = message.text
-    # Создаем новый вопрос для деталей классов ПО
-    question_text = f"Детали классов ПО: {message.text}"
-    try:
-        question_data = {"text": question_text, "number": 8, "answer_type": "string"}  # number=8 для вопроса 8 (other)
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
-
-    # Сохранение категории ПО (пользовательский ввод)
-    software_category_data = {"name": message.text, "description": message.text}
-    software_category = await create_software_category(software_category_data)
-    user_responses[user_id]["software_category_id"] = software_category.get("id") if software_category else None
-    # Сохранение ответа на вопрос 8 (other)
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": f"other: {message.text}"}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
         return
-    await message.reply(
-        "9. Интересно ли вам участие в мероприятии, где можно пообщаться напрямую с разработчиками российского ПО?",
-        reply_markup=create_inline_keyboard(YES_NO_BUTTONS, 2)
+    page = max(0, min(page, PAIN_POINTS_INDEX.last_page))
+    text, keyboard = render_step(step, page)
+    await callback.message.edit_text(text, reply_markup=keyboard)
+
+async def find_resume_step(session: SurveySession) -> Step | None:
+    """
+    Ищет незавершенный опрос пользователя и заполняет по нему сессию.
+
+    Args:
+        session (SurveySession): Сессия опроса пользователя с telegram_user_id.
+
+    Returns:
+        Step | None: Шаг, с которого можно продолжить опрос, или None.
+    """
+    try:
+        active = await get_active_survey(session.telegram_user_id)
+    except Exception as e:
+        logging.error(f"Не удалось получить незавершенный опрос пользователя {session.telegram_user_id}: {str(e)}")
+        return None
+    if not active:
+        return None
+    step = survey.resume_step(active["answered_questions"])
+    if step is None:
+        return None
+    session.enterprise_id = active["enterprise_id"]
+    session.respondent_id = active["respondent_id"]
+    session.survey_id = active["survey_id"]
+    return step
+
+async def offer_resume(message: Message, state: FSMContext, session: SurveySession) -> bool:
+    """
+    Предлагает продолжить незавершенный опрос пользователя, если он есть.
+
+    Args:
+        message (Message): Сообщение, на которое отправляется предложение.
+        state (FSMContext): Состояние FSM пользователя.
+        session (SurveySession): Сессия опроса пользователя с telegram_user_id.
+
+    Returns:
+        bool: True, если предложение отправлено.
+    """
+    step = await find_resume_step(session)
+    if step is None:
+        return False
+    session.step = None
+    await state.set_state(SurveyStates.resume)
+    await state.update_data(resume_step=step.name)
+    await message.answer(
+        "У вас есть незавершенный опрос. Продолжить с того места, где вы остановились?",
+        reply_markup=create_inline_keyboard(RESUME_BUTTONS, 2)
     )
-    await state.set_state(SurveyStates.event_interest)
-
-@router.callback_query(SurveyStates.event_interest)
-async def event_interest(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["event_interest"] = callback.data
-    # Создаем новый вопрос для интереса к мероприятию
-    question_text = "9. Интересно ли вам участие в мероприятии, где можно пообщаться напрямую с разработчиками российского ПО?"
-    try:
-        question_data = {"text": question_text, "number": 9, "answer_type": "string"}  # number=9 для вопроса 9
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
+    return True
 
-    # Сохранение ответа на вопрос 9
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    await callback.message.edit_text(
-        "10. Хотели ли бы вы, чтобы вам помогли подобрать российское решение под ваш профиль?",
-        reply_markup=create_inline_keyboard(YES_NO_BUTTONS, 2)
-    )
-    await callback.answer()
-    await state.set_state(SurveyStates.solution_help)
-
-@router.callback_query(SurveyStates.solution_help)
-async def solution_help(callback: CallbackQuery, state: FSMContext):
-    user_id = callback.from_user.id
-    user_responses[user_id]["solution_help"] = callback.data
-    # Создаем новый вопрос для помощи с решением
-    question_text = "10. Хотели ли бы вы, чтобы вам помогли подобрать российское решение под ваш профиль?"
-    try:
-        question_data = {"text": question_text, "number": 10, "answer_type": "string"}  # number=10 для вопроса 10
-        question = await create_question(question_data)
-        user_responses[user_id]["question_id"] = question.get("id")
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при работе с вопросами: {str(e)}")
-        await state.clear()
-        return
+@router.message(Command("start"), flags={"new_session": True})
+async def start(message: Message, state: FSMContext, session: SurveySession):
+    session.reset()
+    session.telegram_user_id = message.from_user.id
+    if not await offer_resume(message, state, session):
+        await go_to_step(message, state, session, survey.steps["consent"])
 
-    # Сохранение ответа на вопрос 10
-    survey_answer_data = {
-        "survey_id": user_responses[user_id]["survey_id"],
-        "question_id": user_responses[user_id]["question_id"],
-        "answer": {"value": callback.data}
-    }
-    try:
-        await create_survey_answer(survey_answer_data)
-    except Exception as e:
-        await callback.message.reply(f"Ошибка при сохранении ответа: {str(e)}")
-        await state.clear()
-        return
-    await callback.message.edit_text("Спасибо, что прошли наш опрос!", reply_markup=None)
+@router.callback_query(SurveyStates.resume, F.data.in_(RESUME_BUTTONS.values()))
+async def resume(callback: CallbackQuery, state: FSMContext, session: SurveySession):
+    data = await state.get_data()
+    step = survey.steps.get(data.get("resume_step"))
+    if callback.data == "resume_continue" and step is not None:
+        await go_to_step(callback, state, session, step)
+    else:
+        telegram_user_id = session.telegram_user_id
+        session.reset()
+        session.telegram_user_id = telegram_user_id
+        await go_to_step(callback, state, session, survey.steps["consent"])
     await callback.answer()
-    await state.clear()
 
+# /cancel регистрируется до обработчиков состояний, иначе в шагах с вводом
+# текста команда попадала бы в ответ на вопрос
 @router.message(Command("cancel"))
-async def cancel(message: Message, state: FSMContext):
+async def cancel(message: Message, state: FSMContext, session: SurveySession):
     await message.reply("Опрос отменен.")
-    await state.clear()
\ No newline at end of file
+    session.clear()
+    await state.clear()
+
+# Все шаги опроса обслуживаются двумя обработчиками: шаг находится по
+# состоянию FSM в таблице переходов
+@router.message(in_survey)
+async def survey_message(message: Message, state: FSMContext, session: SurveySession, raw_state: str):
+    step = survey.by_state[raw_state]
+    if step.kind != TEXT:
+        return
+    value = (message.text or "").strip()
+    pattern = survey.patterns.get(step.name)
+    if pattern and not pattern.search(value):
+        await message.reply(step.error)
+        return
+    await handle_answer(message, state, session, step, value)
+
+@router.callback_query(in_survey)
+async def survey_callback(callback: CallbackQuery, state: FSMContext, session: SurveySession, raw_state: str):
+    step = survey.by_state[raw_state]
+    if step.kind == PAGES:
+        await handle_page(callback, state, session, step)
+    elif step.kind == CHOICE and callback.data in survey.button_maps[step.name]:
+        await handle_answer(callback, state, session, step, callback.data)
+    elif step.kind == TEXT and step.skip and callback.data == step.skip:
+        await handle_answer(callback, state, session, step, None)
+    await callback.answer()
+
+# Обработчики ниже срабатывают, только если событие не подошло ни одному
+# шагу, — обычно это значит, что состояние FSM потеряно при перезапуске бота.
+# Шаг восстанавливается из сессии (контрольная точка), а без сессии
+# пользователю предлагается продолжить незавершенный опрос из БД
+
+# Пользователи, для которых уже проверялся незавершенный опрос в БД:
+# повторно API опрашивается не раньше чем через SESSION_TTL секунд
+_resume_probed: OrderedDict[int, float] = OrderedDict()
+
+def should_probe_resume(user_id: int) -> bool:
+    """
+    Отмечает проверку незавершенного опроса пользователя и возвращает,
+    нужно ли ее выполнять.
+
+    Args:
+        user_id (int): Идентификатор пользователя Telegram.
+
+    Returns:
+        bool: True, если проверка для пользователя еще не выполнялась или устарела.
+    """
+    now = time.monotonic()
+    probed_at = _resume_probed.get(user_id)
+    if probed_at is not None and now - probed_at < config.SESSION_TTL:
+        return False
+    _resume_probed[user_id] = now
+    _resume_probed.move_to_end(user_id)
+    while len(_resume_probed) > config.SESSION_MAX_ENTRIES:
+        _resume_probed.popitem(last=False)
+    return True
+
+async def probe_resume(message: Message, state: FSMContext, session: SurveySession, user_id: int):
+    # Без незавершенного опроса сессия остается пустой и не сохраняется
+    if not should_probe_resume(user_id):
+        return
+    session.telegram_user_id = user_id
+    if not await offer_resume(message, state, session):
+        session.telegram_user_id = None
+
+async def restore_step(state: FSMContext, session: SurveySession) -> str | None:
+    step = survey.steps.get(session.step) if session.step else None
+    if step is None or step.kind == FINAL:
+        return None
+    raw_state = survey.state_of(step)
+    await state.set_state(raw_state)
+    return raw_state
+
+@router.message(F.text)
+async def restore_message(message: Message, state: FSMContext, session: SurveySession):
+    raw_state = await restore_step(state, session)
+    if raw_state is not None:
+        await survey_message(message, state, session, raw_state)
+        return
+    await probe_resume(message, state, session, message.from_user.id)
+
+@router.callback_query()
+async def restore_callback(callback: CallbackQuery, state: FSMContext, session: SurveySession):
+    raw_state = await restore_step(state, session)
+    if raw_state is not None:
+        await survey_callback(callback, state, session, raw_state)
+        return
+    if callback.message is not None:
+        await probe_resume(callback.message, state, session, callback.from_user.id)
+    await callback.answer()
@@ -2,6 +2,16 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from ..utils import create_inline_keyboard
 
 # Button definitions for different survey stages
+CONSENT_BUTTONS = {
+    "Согласен": "consent_agree",
+    "Не согласен": "consent_disagree"
+}
+
+RESUME_BUTTONS = {
+    "Продолжить": "resume_continue",
+    "Начать заново": "resume_restart"
+}
+
 IMPLEMENTATION_STAGE_BUTTONS = {
     "Планируем": "planning",
     "Пилотный проект": "pilot",
@@ -0,0 +1,113 @@
+from . import inline
+
+class ButtonMap:
+    """
+    Набор кнопок {текст: callback_data} с обратным индексом callback_data → текст.
+
+    Индекс строится один раз, поэтому проверка принадлежности ответа набору и
+    поиск текста кнопки по callback_data выполняются за O(1).
+
+    Attributes:
+        name: Имя набора кнопок.
+        buttons: Исходный словарь кнопок.
+        labels: Обратный индекс {callback_data: текст кнопки}.
+
+    Raises:
+        ValueError: Если callback_data кнопок набора не уникальны.
+    """
+
+    __slots__ = ("name", "buttons", "labels")
+
+    def __init__(self, name: str, buttons: dict[str, str]):
+        labels = {}
+        for label, value in buttons.items():
+            if value in labels:
+                raise ValueError(f"В наборе кнопок {name} повторяется callback_data {value}")
+            labels[value] = label
+        self.name = name
+        self.buttons = buttons
+        self.labels = labels
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.labels
+
+    def label(self, value: str) -> str | None:
+        return self.labels.get(value)
+
+
+class PageIndex:
+    """
+    Постраничный список вариантов с индексом callback_data → страница.
+
+    Attributes:
+        pages: Варианты, разбитые по страницам.
+        page_of: Номер страницы варианта по его callback_data.
+        options: Вариант по его callback_data.
+
+    Raises:
+        ValueError: Если callback_data вариантов не уникальны.
+    """
+
+    __slots__ = ("pages", "page_of", "options")
+
+    def __init__(self, options: list[dict], per_page: int):
+        self.pages = [options[i:i + per_page] for i in range(0, len(options), per_page)]
+        self.page_of = {}
+        self.options = {}
+        for page, page_options in enumerate(self.pages):
+            for option in page_options:
+                value = option["callback_data"]
+                if value in self.options:
+                    raise ValueError(f"В списке вариантов повторяется callback_data {value}")
+                self.page_of[value] = page
+                self.options[value] = option
+
+    @property
+    def last_page(self) -> int:
+        return len(self.pages) - 1
+
+    def page(self, page: int) -> list[dict]:
+        return self.pages[page] if 0 <= page < len(self.pages) else []
+
+
+BUTTON_MAPS: dict[str, ButtonMap] = {}
+_maps_by_id: dict[int, ButtonMap] = {}
+
+def register_buttons(name: str, buttons: dict[str, str]) -> ButtonMap:
+    """
+    Регистрирует набор кнопок и строит его обратный индекс.
+
+    Args:
+        name (str): Имя набора кнопок.
+        buttons (dict[str, str]): Кнопки {текст: callback_data}.
+
+    Returns:
+        ButtonMap: Зарегистрированный набор кнопок.
+
+    Raises:
+        ValueError: Если callback_data кнопок набора не уникальны.
+    """
+    button_map = ButtonMap(name, buttons)
+    BUTTON_MAPS[name] = button_map
+    _maps_by_id[id(buttons)] = button_map
+    return button_map
+
+def get_button_map(buttons: dict[str, str]) -> ButtonMap:
+    """
+    Возвращает зарегистрированный набор для словаря кнопок.
+
+    Args:
+        buttons (dict[str, str]): Словарь кнопок из keyboards.inline.
+
+    Returns:
+        ButtonMap: Набор кнопок с обратным индексом.
+
+    Raises:
+        KeyError: Если словарь кнопок не зарегистрирован.
+    """
+    return _maps_by_id[id(buttons)]
+
+# Все наборы кнопок из keyboards.inline индексируются при импорте
+for _name, _buttons in vars(inline).items():
+    if _name.endswith("_BUTTONS") and isinstance(_buttons, dict):
+        register_buttons(_name, _buttons)
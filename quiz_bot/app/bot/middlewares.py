@@ -0,0 +1,256 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, TelegramObject, Update
+from app.bot.outbound import TokenBucket
+from app.bot.sessions import SurveySession
+from app.core.config import config
+
+SESSION_EXPIRED_TEXT = "Сессия опроса истекла. Чтобы начать заново, отправьте /start"
+THROTTLED_TEXT = "Слишком много сообщений. Подождите несколько секунд и повторите ответ."
+OVERLOADED_TEXT = "Сейчас бот перегружен. Повторите ответ через минуту — предыдущие ответы сохранены."
+
+class SessionMiddleware(BaseMiddleware):
+    """
+    Загружает сессию опроса пользователя в аргумент обработчика session
+    и сохраняет ее после обработки.
+
+    Сессия, закрытая обработчиком (session.clear()) при завершении или отмене
+    опроса, удаляется из хранилища. Обработчики с флагом new_session (например, /start)
+    выполняются и без существующей сессии; остальным при истекшей сессии
+    пользователь получает предложение начать заново.
+
+    Сессия, не изменившаяся при обработке (листание страниц, повтор ввода после
+    ошибки проверки), повторно не записывается: срок ее жизни уже продлен при чтении.
+    Новая сессия, оставшаяся пустой (сообщение вне опроса), не сохраняется вовсе.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        session = await self.store.get(user.id)
+        if session is None:
+            if data.get("raw_state") is not None and not get_flag(data, "new_session"):
+                state: FSMContext = data["state"]
+                await state.clear()
+                if isinstance(event, CallbackQuery):
+                    await event.answer(SESSION_EXPIRED_TEXT, show_alert=True)
+                else:
+                    await event.answer(SESSION_EXPIRED_TEXT)
+                return None
+            session = SurveySession()
+            loaded = None
+        else:
+            loaded = session.dumps()
+
+        data["session"] = session
+        try:
+            return await handler(event, data)
+        finally:
+            if session.closed:
+                await self.store.delete(user.id)
+            elif loaded is None:
+                # Новая сессия, в которую обработчик ничего не записал, не сохраняется
+                if session != SurveySession():
+                    await self.store.set(user.id, session)
+            elif session.dumps() != loaded:
+                await self.store.set(user.id, session)
+
+
+class UserOrderingMiddleware(BaseMiddleware):
+    """
+    Планировщик обработки обновлений: обновления одного пользователя
+    обрабатываются строго по очереди, разных пользователей — параллельно.
+
+    Регистрируется внешним middleware на dp.update. Сначала захватывается
+    блокировка пользователя, затем общий слот из max_in_flight, поэтому
+    обновления, ожидающие своей очереди у того же пользователя, не занимают
+    слоты других пользователей.
+
+    Attributes:
+        max_in_flight: Максимальное число одновременно обрабатываемых обновлений.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Блокировка и число ожидающих ее обновлений; запись удаляется, когда
+        # у пользователя не остается обновлений в обработке
+        self._locks: dict[int, tuple[asyncio.Lock, int]] = {}
+        self.in_flight = 0
+        self.queued = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            async with self._slots:
+                return await handler(event, data)
+
+        lock, waiters = self._locks.get(user.id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[user.id] = (lock, waiters + 1)
+        self.queued += 1
+        started = False
+        try:
+            async with lock, self._slots:
+                self.queued -= 1
+                started = True
+                self.in_flight += 1
+                try:
+                    return await handler(event, data)
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if not started:
+                self.queued -= 1
+            lock, waiters = self._locks[user.id]
+            if waiters == 1:
+                del self._locks[user.id]
+            else:
+                self._locks[user.id] = (lock, waiters - 1)
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики планировщика обновлений.
+
+        Returns:
+            dict: Метрики планировщика.
+        """
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "active_users": len(self._locks),
+        }
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Ограничение входящих обновлений: лимит на пользователя и сброс нагрузки.
+
+    Регистрируется внешним middleware на dp.update перед планировщиком
+    обновлений. Каждому пользователю выделяется корзина токенов (rate
+    обновлений в секунду, всплеск до burst); обновления сверх лимита
+    отбрасываются. Если в планировщике scheduler обрабатывается и ожидает
+    обработки не меньше shed_threshold обновлений, новые обновления
+    отбрасываются, не дожидаясь очереди. В обоих случаях пользователь
+    получает одно короткое сообщение за notify_interval секунд, а не ответ на
+    каждое отброшенное обновление.
+
+    Attributes:
+        rate: Лимит обновлений пользователя в секунду.
+        burst: Допустимый всплеск обновлений пользователя.
+        shed_threshold: Число обновлений в планировщике, при котором начинается сброс нагрузки.
+        max_users: Число хранимых корзин пользователей.
+        notify_interval: Минимальный интервал между уведомлениями пользователя в секундах.
+    """
+
+    def __init__(self, scheduler: UserOrderingMiddleware, rate: float, burst: int,
+                 shed_threshold: int, max_users: int, notify_interval: float = 10.0):
+        self.scheduler = scheduler
+        self.rate = rate
+        self.burst = burst
+        self.shed_threshold = shed_threshold
+        self.max_users = max_users
+        self.notify_interval = notify_interval
+        # Корзина и время последнего уведомления пользователя; давно
+        # не писавшие пользователи вытесняются первыми
+        self._users: OrderedDict[int, list] = OrderedDict()
+        self.passed = 0
+        self.throttled = 0
+        self.shed = 0
+
+    def _user_entry(self, user_id: int) -> list:
+        entry = self._users.get(user_id)
+        if entry is None:
+            entry = [TokenBucket(self.rate, self.burst), 0.0]
+            self._users[user_id] = entry
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return entry
+
+    async def _notify(self, event: Update, entry: list, text: str):
+        now = time.monotonic()
+        if now - entry[1] < self.notify_interval:
+            if event.callback_query is not None:
+                await event.callback_query.answer()
+            return
+        entry[1] = now
+        if event.callback_query is not None:
+            await event.callback_query.answer(text, show_alert=True)
+        elif event.message is not None:
+            await event.message.answer(text)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        entry = self._user_entry(user.id)
+        bucket: TokenBucket = entry[0]
+        if bucket.delay() > 0:
+            self.throttled += 1
+            await self._notify(event, entry, THROTTLED_TEXT)
+            return None
+        bucket.take()
+        if self.scheduler.in_flight + self.scheduler.queued >= self.shed_threshold:
+            self.shed += 1
+            await self._notify(event, entry, OVERLOADED_TEXT)
+            return None
+        self.passed += 1
+        return await handler(event, data)
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики ограничения входящих обновлений.
+
+        Returns:
+            dict: Метрики ограничения.
+        """
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "shed_threshold": self.shed_threshold,
+            "users": len(self._users),
+            "passed": self.passed,
+            "throttled": self.throttled,
+            "shed": self.shed,
+        }
+
+
+update_scheduler = UserOrderingMiddleware(max_in_flight=config.MAX_IN_FLIGHT_UPDATES)
+throttling = ThrottlingMiddleware(
+    update_scheduler,
+    rate=config.THROTTLE_RATE,
+    burst=config.THROTTLE_BURST,
+    shed_threshold=config.LOAD_SHED_THRESHOLD,
+    max_users=config.THROTTLE_MAX_USERS,
+)
@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from app.core.config import config
+
+# Приоритеты исходящих запросов: меньшее значение отправляется раньше
+INTERACTIVE = 0
+BROADCAST = 1
+
+outbound_priority: ContextVar[int] = ContextVar("outbound_priority", default=INTERACTIVE)
+
+@contextmanager
+def broadcast_priority():
+    """
+    Отправляет запросы внутри блока с приоритетом рассылки: они уступают
+    очередь ответам пользователям, проходящим опрос.
+    """
+    token = outbound_priority.set(BROADCAST)
+    try:
+        yield
+    finally:
+        outbound_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Корзина токенов с резервированием: токен можно занять заранее, тогда
+    запрос ждет, пока корзина снова наполнится. Так запросы к одному чату
+    получают слоты строго в порядке поступления.
+
+    Attributes:
+        rate: Скорость пополнения, токенов в секунду.
+        capacity: Емкость корзины (допустимый всплеск).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """
+        Возвращает время до появления свободного токена в секундах.
+        """
+        self._refill(time.monotonic())
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self):
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def reserve(self) -> float:
+        """
+        Занимает токен и возвращает время, которое нужно подождать до отправки.
+        """
+        delay = self.delay()
+        self.tokens -= 1
+        return delay
+
+    def pause(self, seconds: float):
+        """
+        Опустошает корзину так, чтобы следующий токен появился через seconds секунд.
+        """
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class SendScheduler(BaseRequestMiddleware):
+    """
+    Планировщик исходящих запросов к Telegram Bot API.
+
+    Регистрируется middleware сессии бота (bot.session.middleware), поэтому
+    через него проходят все вызовы message.answer, reply, edit_text и т. п.
+    Запросы, адресованные чату (с chat_id), ограничиваются двумя корзинами
+    токенов: общей для бота и отдельной для каждого чата. Ожидающие общего
+    токена запросы обслуживаются по приоритету: ответы пользователям раньше
+    рассылок (см. broadcast_priority). При ответе 429 запрос повторяется после
+    указанного Telegram retry_after, а корзина чата и общая корзина на это
+    время блокируются.
+    Остальные запросы (getUpdates, answerCallbackQuery) не ограничиваются.
+
+    Attributes:
+        global_rate: Общий лимит запросов в секунду.
+        chat_rate: Лимит запросов в секунду для одного чата.
+        chat_burst: Допустимый всплеск запросов в один чат.
+        max_retries: Число повторов запроса после 429.
+        max_chats: Число хранимых корзин чатов.
+    """
+
+    def __init__(self, global_rate: float, chat_rate: float, chat_burst: int, max_retries: int, max_chats: int):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: OrderedDict[int | str, TokenBucket] = OrderedDict()
+        # Очередь ожидающих общего токена: (приоритет, порядковый номер, future)
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump_task: asyncio.Task | None = None
+        self.sent = 0
+        self.delayed = 0
+        self.retried = 0
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chats[chat_id] = bucket
+            # Вытесняемая корзина простаивает дольше остальных; новая для того же
+            # чата создается полной, что лишь немного ослабляет лимит
+            while len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+        else:
+            self._chats.move_to_end(chat_id)
+        return bucket
+
+    async def _pump(self):
+        while self._waiters:
+            delay = self._global.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            # Отмененный запрос не расходует токен
+            if not future.done():
+                self._global.take()
+                future.set_result(None)
+        self._pump_task = None
+
+    async def _acquire_global(self, priority: int):
+        if not self._waiters and self._global.delay() == 0:
+            self._global.take()
+            return
+        self.delayed += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+        await future
+
+    async def acquire(self, chat_id: int | str, priority: int = INTERACTIVE):
+        """
+        Ждет разрешения на отправку запроса в чат.
+
+        Args:
+            chat_id (int | str): Идентификатор чата.
+            priority (int): Приоритет запроса (INTERACTIVE или BROADCAST).
+        """
+        delay = self._chat_bucket(chat_id).reserve()
+        if delay > 0:
+            self.delayed += 1
+            await asyncio.sleep(delay)
+        await self._acquire_global(priority)
+
+    async def __call__(self, make_request, bot, method):
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+        priority = outbound_priority.get()
+        attempt = 0
+        while True:
+            await self.acquire(chat_id, priority)
+            try:
+                result = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retried += 1
+                logging.warning(f"Превышен лимит Telegram для чата {chat_id}, повтор через {e.retry_after} с")
+                # Flood control Telegram действует на бота целиком, поэтому
+                # приостанавливаются и чат, и общая корзина
+                self._chat_bucket(chat_id).pause(e.retry_after)
+                self._global.pause(e.retry_after)
+                continue
+            self.sent += 1
+            return result
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики планировщика исходящих запросов.
+
+        Returns:
+            dict: Метрики планировщика.
+        """
+        return {
+            "sent": self.sent,
+            "delayed": self.delayed,
+            "retried": self.retried,
+            "waiting": len(self._waiters),
+            "chats": len(self._chats),
+        }
+
+
+send_scheduler = SendScheduler(
+    global_rate=config.SEND_GLOBAL_RATE,
+    chat_rate=config.SEND_CHAT_RATE,
+    chat_burst=config.SEND_CHAT_BURST,
+    max_retries=config.SEND_MAX_RETRIES,
+    max_chats=config.SEND_MAX_CHATS,
+)
@@ -0,0 +1,456 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Optional
+from app.core.config import config
+from app.bot.storage import get_redis
+
+@dataclass(slots=True)
+class SurveySession:
+    """
+    Данные сессии опроса одного пользователя.
+
+    В сессии хранятся только данные, нужные для продолжения опроса: анкета
+    респондента до создания опроса, идентификаторы созданных записей и
+    выбранные направления «болей». Ответы на вопросы сразу уходят в
+    survey_answers и в сессии не дублируются.
+
+    Сериализованная форма (dumps) — JSON-массив значений полей в порядке их
+    объявления с номером версии формата в начале, без имен ключей. Новые
+    поля добавляются только в конец, чтобы ранее сохраненные сессии читались.
+
+    Attributes:
+        step: Имя текущего шага опроса; по нему восстанавливается состояние FSM,
+            если оно потеряно при перезапуске бота.
+        closed: Признак завершения или отмены опроса; закрытая сессия удаляется
+            из хранилища и не сериализуется.
+    """
+
+    consent: bool = False
+    company_name: Optional[str] = None
+    company_inn: Optional[str] = None
+    full_name: Optional[str] = None
+    position: Optional[str] = None
+    phone_number: Optional[str] = None
+    email: Optional[str] = None
+    enterprise_id: Optional[int] = None
+    respondent_id: Optional[int] = None
+    survey_id: Optional[int] = None
+    question_id: Optional[int] = None
+    software_category_id: Optional[int] = None
+    pain_points: list[str] = field(default_factory=list)
+    telegram_user_id: Optional[int] = None
+    step: Optional[str] = None
+    closed: bool = field(default=False, compare=False)
+
+    FORMAT_VERSION = 1
+
+    def reset(self):
+        """
+        Сбрасывает данные сессии для прохождения опроса заново.
+        """
+        for f in _SERIALIZED_FIELDS:
+            setattr(self, f.name, f.default if f.default_factory is MISSING else f.default_factory())
+        self.closed = False
+
+    def clear(self):
+        """
+        Закрывает сессию после завершения или отмены опроса.
+        """
+        self.reset()
+        self.closed = True
+
+    def dumps(self) -> str:
+        """
+        Возвращает компактную сериализованную форму сессии.
+
+        Returns:
+            str: JSON-массив [версия, значения полей...].
+        """
+        values = [self.FORMAT_VERSION]
+        values.extend(getattr(self, f.name) for f in _SERIALIZED_FIELDS)
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, raw: str | bytes) -> "SurveySession":
+        """
+        Восстанавливает сессию из сериализованной формы.
+
+        Args:
+            raw (str | bytes): Результат dumps().
+
+        Returns:
+            SurveySession: Сессия опроса.
+
+        Raises:
+            ValueError: Если версия формата не поддерживается.
+        """
+        values = json.loads(raw)
+        if not values or values[0] != cls.FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемый формат сессии: {values[:1]}")
+        return cls(**{f.name: value for f, value in zip(_SERIALIZED_FIELDS, values[1:])})
+
+
+_SERIALIZED_FIELDS = tuple(f for f in fields(SurveySession) if f.name != "closed")
+
+class MemorySessionStore:
+    """
+    Хранилище данных сессий опроса в памяти процесса.
+
+    Каждая запись живет ttl секунд с момента последнего обращения, а общее число
+    записей ограничено max_entries: при переполнении вытесняются давно не
+    использованные сессии (LRU). Завершенные и отмененные сессии удаляются сразу.
+
+    Attributes:
+        ttl: Время жизни неактивной сессии в секундах.
+        max_entries: Максимальное число хранимых сессий.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Порядок записей совпадает с порядком истечения срока: обращение
+        # продлевает срок и переносит запись в конец
+        self._entries: OrderedDict[int, tuple[float, SurveySession]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.deleted = 0
+        # Счетчик изменений: по нему контрольная точка пропускает запись,
+        # если с прошлого сохранения сессии не менялись
+        self.changes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired(self, now: float):
+        while self._entries:
+            user_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[user_id]
+            self.expired += 1
+
+    async def get(self, user_id: int) -> SurveySession | None:
+        """
+        Возвращает данные сессии пользователя и продлевает срок ее жизни.
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+
+        Returns:
+            SurveySession | None: Сессия или None, если сессии нет или она истекла.
+        """
+        now = time.monotonic()
+        self._purge_expired(now)
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries[user_id] = (now + self.ttl, entry[1])
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, user_id: int, session: SurveySession):
+        """
+        Сохраняет данные сессии пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+            session (SurveySession): Сессия опроса.
+        """
+        now = time.monotonic()
+        self._entries[user_id] = (now + self.ttl, session)
+        self._entries.move_to_end(user_id)
+        self.changes += 1
+        self._purge_expired(now)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    async def delete(self, user_id: int):
+        """
+        Удаляет сессию пользователя (завершение или отмена опроса).
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+        """
+        if self._entries.pop(user_id, None) is not None:
+            self.deleted += 1
+            self.changes += 1
+
+    def snapshot(self) -> list[tuple[int, float, str]]:
+        """
+        Возвращает сериализованные сессии для контрольной точки.
+
+        Returns:
+            list[tuple[int, float, str]]: Идентификатор пользователя, время истечения
+                по системным часам (time.time()) и SurveySession.dumps().
+        """
+        offset = time.time() - time.monotonic()
+        return [
+            (user_id, expires_at + offset, session.dumps())
+            for user_id, (expires_at, session) in self._entries.items()
+        ]
+
+    def restore(self, entries: list[tuple[int, float, str]]) -> int:
+        """
+        Загружает сессии из контрольной точки, пропуская истекшие.
+
+        Args:
+            entries (list[tuple[int, float, str]]): Результат snapshot().
+
+        Returns:
+            int: Число восстановленных сессий.
+        """
+        offset = time.time() - time.monotonic()
+        restored = 0
+        for user_id, expires_at, raw in sorted(entries, key=lambda entry: entry[1]):
+            expires_at -= offset
+            if expires_at <= time.monotonic() or user_id in self._entries:
+                continue
+            self._entries[user_id] = (min(expires_at, time.monotonic() + self.ttl), SurveySession.loads(raw))
+            restored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+        return restored
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики хранилища: размер, попадания и вытеснения.
+
+        Returns:
+            dict: Метрики хранилища сессий.
+        """
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "deleted": self.deleted,
+        }
+
+
+class RedisSessionStore:
+    """
+    Хранилище данных сессий опроса в Redis, общее для всех процессов бота.
+
+    Сессия хранится в компактной форме SurveySession.dumps() под ключом
+    {prefix}:session:{user_id} со сроком жизни ttl секунд, который продлевается
+    при каждом чтении. Объем хранилища ограничивает политика вытеснения самого
+    Redis (maxmemory-policy).
+
+    Attributes:
+        ttl: Время жизни неактивной сессии в секундах.
+    """
+
+    def __init__(self, redis, ttl: float, prefix: str):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.deleted = 0
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}:session:{user_id}"
+
+    async def get(self, user_id: int) -> SurveySession | None:
+        """
+        Возвращает данные сессии пользователя и продлевает срок ее жизни.
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+
+        Returns:
+            SurveySession | None: Сессия или None, если сессии нет или она истекла.
+        """
+        raw = await self.redis.getex(self._key(user_id), ex=int(self.ttl))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return SurveySession.loads(raw)
+
+    async def set(self, user_id: int, session: SurveySession):
+        """
+        Сохраняет данные сессии пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+            session (SurveySession): Сессия опроса.
+        """
+        await self.redis.set(self._key(user_id), session.dumps(), ex=int(self.ttl))
+
+    async def delete(self, user_id: int):
+        """
+        Удаляет сессию пользователя (завершение или отмена опроса).
+
+        Args:
+            user_id (int): Идентификатор пользователя Telegram.
+        """
+        if await self.redis.delete(self._key(user_id)):
+            self.deleted += 1
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики обращений к хранилищу из текущего процесса.
+
+        Returns:
+            dict: Метрики хранилища сессий.
+        """
+        return {
+            "backend": "redis",
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "deleted": self.deleted,
+        }
+
+
+class SessionCheckpointer:
+    """
+    Контрольные точки сессий опроса из памяти процесса в файл.
+
+    Без Redis сессии живут только в памяти процесса, и перезапуск бота
+    (например, при выкладке) обрывал все начатые опросы. Фоновая задача раз в
+    interval секунд записывает все сессии в файл, если с прошлой записи они
+    менялись: частые изменения одной сессии объединяются в одну запись. Файл
+    пишется во временный и атомарно заменяет предыдущий, поэтому падение во
+    время записи не портит последнюю контрольную точку. При старте сессии
+    восстанавливаются из файла, при остановке записывается финальная точка.
+
+    Attributes:
+        store: Хранилище сессий в памяти.
+        path: Путь к файлу контрольной точки.
+        interval: Период записи в секундах.
+    """
+
+    def __init__(self, store: MemorySessionStore, path: str, interval: float):
+        self.store = store
+        self.path = path
+        self.interval = interval
+        self._saved_changes = 0
+        self._task: asyncio.Task | None = None
+        self.checkpoints = 0
+
+    def _write(self, entries: list[tuple[int, float, str]]):
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for user_id, expires_at, raw in entries:
+                f.write(f"{user_id}\t{expires_at:.3f}\t{raw}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> list[tuple[int, float, str]]:
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                user_id, expires_at, raw = line.rstrip("\n").split("\t", 2)
+                entries.append((int(user_id), float(expires_at), raw))
+        return entries
+
+    async def checkpoint(self) -> bool:
+        """
+        Записывает сессии в файл, если они менялись с прошлой записи.
+
+        Returns:
+            bool: True, если контрольная точка записана.
+        """
+        changes = self.store.changes
+        if changes == self._saved_changes:
+            return False
+        # Сериализация выполняется в цикле событий, чтобы сессии не менялись
+        # во время записи; запись в файл вынесена в поток
+        await asyncio.to_thread(self._write, self.store.snapshot())
+        self._saved_changes = changes
+        self.checkpoints += 1
+        return True
+
+    async def load(self) -> int:
+        """
+        Восстанавливает сессии из файла контрольной точки.
+
+        Returns:
+            int: Число восстановленных сессий.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        try:
+            entries = await asyncio.to_thread(self._read)
+            restored = self.store.restore(entries)
+        except (OSError, ValueError) as e:
+            logging.error(f"Не удалось восстановить сессии из {self.path}: {str(e)}")
+            return 0
+        self._saved_changes = self.store.changes
+        logging.info(f"Восстановлено сессий опроса: {restored}")
+        return restored
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.checkpoint()
+            except OSError as e:
+                logging.error(f"Ошибка записи контрольной точки сессий: {str(e)}")
+
+    async def start(self):
+        """
+        Восстанавливает сессии и запускает фоновую запись контрольных точек.
+        """
+        await self.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Останавливает фоновую задачу и записывает финальную контрольную точку.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.checkpoint()
+        except OSError as e:
+            logging.error(f"При остановке не удалось записать контрольную точку сессий: {str(e)}")
+
+
+def create_session_store():
+    """
+    Создает хранилище сессий опроса: Redis при заданном REDIS_URL, иначе
+    хранилище в памяти процесса (для разработки и тестов).
+
+    Returns:
+        MemorySessionStore | RedisSessionStore: Хранилище сессий.
+    """
+    if config.REDIS_URL:
+        return RedisSessionStore(get_redis(), ttl=config.SESSION_TTL, prefix=config.REDIS_KEY_PREFIX)
+    return MemorySessionStore(ttl=config.SESSION_TTL, max_entries=config.SESSION_MAX_ENTRIES)
+
+
+session_store = create_session_store()
+
+# Сессии в Redis переживают перезапуск бота сами по себе (см. appendonly в
+# docker-compose.yml); контрольные точки нужны только хранилищу в памяти
+session_checkpointer = (
+    SessionCheckpointer(session_store, config.SESSION_CHECKPOINT_PATH, config.SESSION_CHECKPOINT_INTERVAL)
+    if config.SESSION_CHECKPOINT_PATH and isinstance(session_store, MemorySessionStore)
+    else None
+)
@@ -1,6 +1,7 @@
 from aiogram.fsm.state import State, StatesGroup
 
 class SurveyStates(StatesGroup):
+    resume = State()
     consent = State()
     company_name = State()
     company_inn = State()
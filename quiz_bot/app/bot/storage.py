@@ -0,0 +1,59 @@
+import logging
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from app.core.config import config
+
+_redis = None
+
+def get_redis():
+    """
+    Возвращает общий клиент Redis для хранилищ бота.
+
+    Клиент создается один раз на процесс по адресу REDIS_URL. Модуль redis
+    импортируется только при использовании внешнего хранилища, поэтому для
+    запуска с хранилищем в памяти он не требуется.
+
+    Returns:
+        redis.asyncio.Redis: Асинхронный клиент Redis.
+
+    Raises:
+        RuntimeError: Если не задан REDIS_URL.
+    """
+    global _redis
+    if not config.REDIS_URL:
+        raise RuntimeError("Для внешнего хранилища необходимо задать REDIS_URL")
+    if _redis is None:
+        from redis.asyncio import Redis
+        _redis = Redis.from_url(config.REDIS_URL)
+    return _redis
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Создает хранилище состояний FSM для диспетчера.
+
+    При заданном REDIS_URL состояния хранятся в Redis и доступны любому
+    процессу бота, иначе используется хранилище в памяти процесса.
+
+    Returns:
+        BaseStorage: Хранилище состояний aiogram.
+    """
+    if not config.REDIS_URL:
+        return MemoryStorage()
+    from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+    ttl = int(config.SESSION_TTL)
+    return RedisStorage(
+        redis=get_redis(),
+        key_builder=DefaultKeyBuilder(prefix=f"{config.REDIS_KEY_PREFIX}:fsm"),
+        state_ttl=ttl,
+        data_ttl=ttl,
+    )
+
+async def close_storage():
+    """
+    Закрывает соединения общего клиента Redis при остановке приложения.
+    """
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+        logging.info("Соединение с Redis закрыто")
@@ -0,0 +1,259 @@
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+from .states import SurveyStates
+from .keyboards.registry import ButtonMap, PageIndex, get_button_map
+from .keyboards.inline import (
+    CONSENT_BUTTONS,
+    IMPLEMENTATION_STAGE_BUTTONS,
+    PAIN_POINTS_BUTTONS,
+    INTEGRATION_DETAILS_BUTTONS,
+    PERSONNEL_DETAILS_BUTTONS,
+    COMPATIBILITY_DETAILS_BUTTONS,
+    COSTS_DETAILS_BUTTONS,
+    SUPPORT_DETAILS_BUTTONS,
+    MAIN_BARRIER_BUTTONS,
+    DIRECT_REPLACEMENT_BUTTONS,
+    PILOT_TESTING_BUTTONS,
+    YES_NO_DEPENDS_BUTTONS,
+    YES_NO_BUTTONS
+)
+
+TEXT = 'text'
+CHOICE = 'choice'
+PAGES = 'pages'
+FINAL = 'final'
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """
+    Шаг опроса.
+
+    Attributes:
+        name: Имя шага; совпадает с именем состояния в SurveyStates.
+        kind: Тип шага: TEXT (ввод текста), CHOICE (выбор кнопкой),
+            PAGES (постраничный список вариантов) или FINAL (завершение опроса).
+        prompt: Текст, который отправляется при переходе на шаг.
+        buttons: Кнопки шага {текст: callback_data}.
+        columns: Число кнопок в строке клавиатуры.
+        session_field: Атрибут SurveySession, в который сохраняется ответ.
+        pattern: Регулярное выражение для проверки введенного текста.
+        error: Текст ответа на непрошедший проверку ввод.
+        encrypt: Сохранять ответ в сессии в зашифрованном виде.
+        skip: callback_data кнопки пропуска шага (в поле сохраняется None).
+        action: Имя действия, выполняемого с ответом (см. ACTIONS в handlers).
+        action_error: Префикс сообщения об ошибке действия.
+        question: Номер вопроса, на который сохраняется ответ.
+        answer_format: Формат значения ответа.
+        answer_label: Сохранять текст кнопки вместо callback_data.
+        answer_extra: Дополнительные поля ответа.
+        process_branches: Выполнять действие и сохранять ответ, ведущий на ветку
+            из branches; иначе такой ответ только переводит на ветку.
+        next: Имя следующего шага.
+        branches: Следующий шаг в зависимости от ответа {ответ: имя шага}.
+        select: Для шага PAGES — шаг выбора варианта со страницы.
+        other: Для шага PAGES — шаг ввода своего варианта.
+    """
+
+    name: str
+    kind: str
+    prompt: str
+    buttons: dict[str, str] = field(default_factory=dict)
+    columns: int = 2
+    session_field: Optional[str] = None
+    pattern: Optional[str] = None
+    error: Optional[str] = None
+    encrypt: bool = False
+    skip: Optional[str] = None
+    action: Optional[str] = None
+    action_error: str = "Ошибка при обработке ответа"
+    question: Optional[int] = None
+    answer_format: str = "{}"
+    answer_label: bool = False
+    answer_extra: dict = field(default_factory=dict)
+    process_branches: bool = True
+    next: Optional[str] = None
+    branches: dict[str, str] = field(default_factory=dict)
+    select: Optional[str] = None
+    other: Optional[str] = None
+
+
+# Тексты вопросов анкеты по их номерам; по ним же при старте заполняется кэш вопросов
+QUESTION_TEXTS = {
+    1: "1. На какой стадии перехода на отечественное ПО находится ваше предприятие?",
+    4: "4. Основные направления «болей» с которыми столкнулось ваше предприятие?",
+    5: "5. Что является главным барьером для перехода на отечественное ПО?",
+    6: "6. Насколько важна для вас возможность прямого замещения зарубежного ПО на отечественное ПО? (аналог «один в один»)",
+    7: "7. Готовы ли вы выделить ресурсы (время специалистов, тестовый контур) для пилотного тестирования потенциальных российских решений?",
+    8: "8. Какие классы ПО вы бы хотели протестировать? (выберите или укажите текстом)",
+    9: "9. Интересно ли вам участие в мероприятии, где можно пообщаться напрямую с разработчиками российского ПО?",
+    10: "10. Хотели ли бы вы, чтобы вам помогли подобрать российское решение под ваш профиль?",
+}
+
+# Направления «болей» с пояснениями для постраничного списка вопроса 4
+PAIN_POINTS_PAGES = [
+    {"label": "Функционал", "description": "(отсутствие нужного функционала для ваших систем/оборудования)", "callback_data": "functionality"},
+    {"label": "Интеграция", "description": "(уровень сложности интеграции ваших систем/оборудования с отечественным ПО)", "callback_data": "integration"},
+    {"label": "Кадры", "description": "(доступность специалистов с опытом работы в нужном отечественном ПО)", "callback_data": "personnel"},
+    {"label": "Совместимость", "description": "(острота проблемы совместимости отечественного ПО с вашим имеющимся ПО)", "callback_data": "compatibility"},
+    {"label": "Затраты", "description": "(направления затрат, которые вызывают наибольшее беспокойство)", "callback_data": "costs"},
+    {"label": "Техническая поддержка", "description": "(важность уровня и скорости тех. поддержки)", "callback_data": "support"},
+]
+
+ITEMS_PER_PAGE = 3
+
+PAIN_POINTS_INDEX = PageIndex(PAIN_POINTS_PAGES, ITEMS_PER_PAGE)
+
+def _pain_point_details(pain_point: str, prompt: str, buttons: dict[str, str] | None = None) -> Step:
+    return Step(
+        f"pain_points_{pain_point}_details", CHOICE if buttons else TEXT, prompt,
+        buttons=buttons or {}, question=4, answer_extra={"pain_point": pain_point}, next="main_barrier",
+    )
+
+SURVEY_STEPS = [
+    Step("consent", CHOICE,
+         "Вы проходите опросник от АО «РНИЦ НСО» для сбора обратной связи. Согласны ли вы на обработку персональных данных вашей компании?",
+         buttons=CONSENT_BUTTONS, action="set_consent",
+         next="company_name", branches={"consent_disagree": "consent_declined"}),
+    Step("consent_declined", FINAL, "Вы не согласились на обработку персональных данных. Опрос завершен."),
+    Step("company_name", TEXT, "Введите полное название вашей компании или организации:",
+         session_field="company_name", pattern=r"\S", error="Пожалуйста, введите непустое название компании.",
+         next="company_inn"),
+    Step("company_inn", TEXT, "Введите ИНН вашей компании:",
+         session_field="company_inn", pattern=r"^(\d{10}|\d{12})?$", error="Пожалуйста, введите ИНН из 10 или 12 цифр.",
+         skip="skip_company_inn", next="full_name"),
+    Step("full_name", TEXT, "Введите ваше ФИО (полностью):", session_field="full_name", skip="skip_full_name", next="position"),
+    Step("position", TEXT, "Введите вашу должность:", session_field="position", skip="skip_position", next="phone_number"),
+    Step("phone_number", TEXT, "Введите телефон для связи:",
+         session_field="phone_number", pattern=r"^\+?\d+$", encrypt=True, skip="skip_phone",
+         error="Пожалуйста, введите телефон, содержащий только цифры (можно с ведущим +).", next="email"),
+    Step("email", TEXT, "Введите email вашей компании для связи:",
+         session_field="email", pattern="@", encrypt=True, skip="skip_email",
+         error="Пожалуйста, введите email, содержащий символ @.",
+         action="begin_survey", action_error="Ошибка при создании опроса", next="implementation_stage"),
+    Step("implementation_stage", CHOICE, QUESTION_TEXTS[1], buttons=IMPLEMENTATION_STAGE_BUTTONS,
+         question=1, answer_label=True, next="pain_points_page"),
+    Step("pain_points_page", PAGES, QUESTION_TEXTS[4], question=4, select="pain_points_selection", other="pain_points_other"),
+    Step("pain_points_selection", CHOICE, "Выберите один из вариантов:", buttons=PAIN_POINTS_BUTTONS, columns=1,
+         action="add_pain_point",
+         branches={p: f"pain_points_{p}_details" for p in PAIN_POINTS_BUTTONS.values()}),
+    Step("pain_points_other", TEXT, "Введите ваш вариант:", action="add_other_pain_point",
+         question=4, answer_format="other: {}", next="main_barrier"),
+    _pain_point_details("functionality", "Укажите конкретные модули/процессы:"),
+    _pain_point_details("integration", "Укажите уровень сложности:", INTEGRATION_DETAILS_BUTTONS),
+    _pain_point_details("personnel", "Укажите:", PERSONNEL_DETAILS_BUTTONS),
+    _pain_point_details("compatibility", "Укажите:", COMPATIBILITY_DETAILS_BUTTONS),
+    _pain_point_details("costs", "Укажите:", COSTS_DETAILS_BUTTONS),
+    _pain_point_details("support", "Укажите:", SUPPORT_DETAILS_BUTTONS),
+    Step("main_barrier", CHOICE, QUESTION_TEXTS[5], buttons=MAIN_BARRIER_BUTTONS,
+         question=5, next="direct_replacement"),
+    Step("direct_replacement", CHOICE, QUESTION_TEXTS[6], buttons=DIRECT_REPLACEMENT_BUTTONS,
+         question=6, next="pilot_testing", branches={"other_repl": "direct_replacement_details"}),
+    Step("direct_replacement_details", TEXT, "Введите свой вариант:",
+         question=6, answer_format="other: {}", next="pilot_testing"),
+    Step("pilot_testing", CHOICE, QUESTION_TEXTS[7], buttons=YES_NO_DEPENDS_BUTTONS,
+         question=7, next="software_classes"),
+    Step("software_classes", CHOICE, QUESTION_TEXTS[8], buttons=PILOT_TESTING_BUTTONS,
+         action="resolve_software_class", action_error="Ошибка при обработке категории ПО",
+         question=8, process_branches=False, next="event_interest", branches={"other": "software_classes_details"}),
+    Step("software_classes_details", TEXT, "Введите свой вариант:",
+         action="resolve_custom_software_class", action_error="Ошибка при обработке категории ПО",
+         question=8, answer_format="other: {}", next="event_interest"),
+    Step("event_interest", CHOICE, QUESTION_TEXTS[9], buttons=YES_NO_BUTTONS, question=9, next="solution_help"),
+    Step("solution_help", CHOICE, QUESTION_TEXTS[10], buttons=YES_NO_BUTTONS, question=10,
+         action="complete_survey", next="finished"),
+    Step("finished", FINAL, "Спасибо, что прошли наш опрос!"),
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Survey:
+    """
+    Скомпилированный опрос: таблица переходов по состояниям FSM.
+
+    Attributes:
+        steps: Шаги по имени.
+        by_state: Шаги по строке состояния FSM (raw_state) для поиска за O(1).
+        patterns: Скомпилированные регулярные выражения проверки ввода по имени шага.
+        button_maps: Наборы кнопок шагов с обратным индексом по имени шага.
+        question_steps: Первый шаг каждого вопроса по номеру вопроса в порядке опроса.
+    """
+
+    steps: dict[str, Step]
+    by_state: dict[str, Step]
+    patterns: dict[str, re.Pattern]
+    button_maps: dict[str, ButtonMap]
+    question_steps: dict[int, Step]
+
+    def state_of(self, step: Step) -> str:
+        return getattr(SurveyStates, step.name).state
+
+    def resume_step(self, answered: list[int]) -> Step | None:
+        """
+        Возвращает шаг, с которого продолжается прерванный опрос.
+
+        Args:
+            answered (list[int]): Номера вопросов, на которые уже есть ответы.
+
+        Returns:
+            Step | None: Шаг первого вопроса без ответа или None, если отвечены все вопросы.
+        """
+        answered = set(answered)
+        for number, step in self.question_steps.items():
+            if number not in answered:
+                return step
+        return None
+
+
+def compile_survey(steps: list[Step], actions: dict) -> Survey:
+    """
+    Проверяет определение опроса и строит таблицу переходов.
+
+    Args:
+        steps (list[Step]): Шаги опроса.
+        actions (dict): Действия, доступные шагам, по имени.
+
+    Returns:
+        Survey: Скомпилированный опрос.
+
+    Raises:
+        ValueError: Если определение опроса некорректно.
+    """
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        raise ValueError("Имена шагов опроса должны быть уникальными")
+
+    by_state = {}
+    patterns = {}
+    button_maps = {}
+    question_steps = {}
+    for step in steps:
+        if step.question is not None:
+            question_steps.setdefault(step.question, step)
+        targets = [step.next, step.select, step.other, *step.branches.values()]
+        for target in filter(None, targets):
+            if target not in by_name:
+                raise ValueError(f"Шаг {step.name} ссылается на неизвестный шаг {target}")
+        if step.action and step.action not in actions:
+            raise ValueError(f"Шаг {step.name} ссылается на неизвестное действие {step.action}")
+        if step.kind == FINAL:
+            continue
+        if step.kind == CHOICE and not step.buttons:
+            raise ValueError(f"У шага выбора {step.name} нет кнопок")
+        if step.kind != PAGES and not (step.next or step.branches):
+            raise ValueError(f"У шага {step.name} нет перехода")
+        state = getattr(SurveyStates, step.name, None)
+        if state is None:
+            raise ValueError(f"Для шага {step.name} нет состояния в SurveyStates")
+        by_state[state.state] = step
+        if step.pattern:
+            patterns[step.name] = re.compile(step.pattern)
+        if step.buttons:
+            try:
+                button_maps[step.name] = get_button_map(step.buttons)
+            except KeyError:
+                raise ValueError(f"Кнопки шага {step.name} не зарегистрированы в keyboards.registry")
+    return Survey(
+        steps=by_name, by_state=by_state, patterns=patterns,
+        button_maps=button_maps, question_steps=question_steps,
+    )
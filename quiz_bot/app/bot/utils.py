@@ -1,11 +1,22 @@
+from functools import lru_cache
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 def create_inline_keyboard(buttons_dict, columns=2):
+    """
+    Возвращает клавиатуру из кнопок {текст: callback_data}.
+
+    Клавиатуры aiogram неизменяемы, поэтому для одного набора кнопок и числа
+    колонок объект строится один раз и переиспользуется во всех сообщениях.
+    """
+    return _build_inline_keyboard(tuple(buttons_dict.items()), columns)
+
+@lru_cache(maxsize=256)
+def _build_inline_keyboard(buttons, columns):
     keyboard = []
     row = []
-    for i, (text, callback_data) in enumerate(buttons_dict.items()):
+    for i, (text, callback_data) in enumerate(buttons):
         row.append(InlineKeyboardButton(text=text, callback_data=callback_data))
-        if (i + 1) % columns == 0 or i == len(buttons_dict) - 1:
+        if (i + 1) % columns == 0 or i == len(buttons) - 1:
             keyboard.append(row)
             row = []
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
\ No newline at end of file
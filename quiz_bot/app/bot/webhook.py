@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from app.core.config import config
+
+WEBHOOK_PATH = '/bot/webhook'
+
+def _user_key(update: dict) -> int | None:
+    """
+    Возвращает идентификатор пользователя, от которого пришло обновление.
+    """
+    for key, value in update.items():
+        if key != "update_id" and isinstance(value, dict):
+            user = value.get("from") or value.get("user")
+            return user.get("id") if isinstance(user, dict) else None
+    return None
+
+
+class UpdateQueue:
+    """
+    Очередь обновлений Telegram для режима webhook.
+
+    Маршрут webhook только кладет обновление в очередь и сразу отвечает
+    Telegram. Обновления каждого пользователя образуют свою цепочку, которую
+    по порядку обрабатывает отдельная задача; задача завершается, когда
+    цепочка пуста. Поэтому медленный пользователь (запрос к API, ожидание
+    лимита) задерживает только свои обновления, а общее число одновременно
+    обрабатываемых обновлений ограничивает планировщик обновлений
+    (UserOrderingMiddleware). Очередь ограничена maxsize ожидающими
+    обновлениями: при переполнении обновление не принимается, и Telegram
+    повторит его доставку позже. Повторно доставленные обновления
+    отбрасываются по update_id (помнятся последние dedup_size идентификаторов).
+
+    Attributes:
+        maxsize: Максимальное число ожидающих обработки обновлений.
+        dedup_size: Число запоминаемых update_id.
+    """
+
+    def __init__(self, maxsize: int, dedup_size: int):
+        self.maxsize = maxsize
+        self.dedup_size = dedup_size
+        # Цепочки обновлений по пользователю; обновления без пользователя
+        # обрабатываются каждое в своей задаче
+        self._chains: dict[int | tuple, deque[dict]] = {}
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._bot: Bot | None = None
+        self._dispatcher: Dispatcher | None = None
+        # Прием новых обновлений; при остановке выключается раньше, чем
+        # дорабатываются уже принятые
+        self._accepting = False
+        self.pending = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def put(self, update: dict) -> bool:
+        """
+        Кладет обновление в цепочку его пользователя без ожидания.
+
+        Args:
+            update (dict): Тело обновления Telegram.
+
+        Returns:
+            bool: True, если обновление принято или уже было принято ранее,
+                False, если очередь переполнена или остановлена.
+        """
+        if not self._accepting:
+            # Идет остановка: Telegram повторит доставку другому процессу или после перезапуска
+            self.rejected += 1
+            return False
+        update_id = update.get("update_id")
+        if update_id in self._seen:
+            self.duplicates += 1
+            return True
+        if self.pending >= self.maxsize:
+            self.rejected += 1
+            return False
+        if update_id is not None:
+            self._seen[update_id] = None
+            if len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+        self.accepted += 1
+        self.pending += 1
+        self._idle.clear()
+        user_id = _user_key(update)
+        key = user_id if user_id is not None else ("update", update_id, self.accepted)
+        chain = self._chains.get(key)
+        if chain is not None:
+            chain.append(update)
+        else:
+            self._chains[key] = deque([update])
+            task = asyncio.create_task(self._run_chain(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _process(self, raw: dict):
+        try:
+            update = Update.model_validate(raw, context={"bot": self._bot})
+            await self._dispatcher.feed_update(self._bot, update)
+            self.processed += 1
+        except Exception as e:
+            self.failed += 1
+            logging.error(f"Ошибка при обработке обновления {raw.get('update_id')}: {str(e)}")
+
+    async def _run_chain(self, key: int | tuple):
+        chain = self._chains[key]
+        try:
+            while chain:
+                await self._process(chain[0])
+                chain.popleft()
+                self.pending -= 1
+        finally:
+            # При отмене задачи необработанные обновления цепочки теряются
+            self.pending -= len(chain)
+            del self._chains[key]
+            if self.pending == 0:
+                self._idle.set()
+
+    def start(self, bot: Bot, dispatcher: Dispatcher):
+        """
+        Включает прием обновлений.
+
+        Args:
+            bot (Bot): Бот, от имени которого обрабатываются обновления.
+            dispatcher (Dispatcher): Диспетчер с подключенными роутерами.
+        """
+        self._bot = bot
+        self._dispatcher = dispatcher
+        self._accepting = True
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Дожидается обработки принятых обновлений и останавливает обработку.
+
+        Args:
+            timeout (float): Максимальное время ожидания в секундах.
+        """
+        if not self._accepting:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"При остановке не обработано {self.pending} обновлений")
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики очереди обновлений.
+
+        Returns:
+            dict: Метрики очереди.
+        """
+        return {
+            "size": self.pending,
+            "maxsize": self.maxsize,
+            "active_users": len(self._chains),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+update_queue = UpdateQueue(
+    maxsize=config.UPDATE_QUEUE_SIZE,
+    dedup_size=config.UPDATE_DEDUP_SIZE,
+)
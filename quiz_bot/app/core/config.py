@@ -11,6 +11,47 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
     ECHO: bool = True
     DEBUG: bool = True
+    API_URL: str = 'http://localhost:8000/'
+    API_TRANSPORT: str = 'http'
+    API_MAX_CONNECTIONS: int = 100
+    API_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    API_KEEPALIVE_EXPIRY: float = 30.0
+    API_TIMEOUT: float = 10.0
+    API_CONNECT_TIMEOUT: float = 5.0
+    API_MAX_CONCURRENCY: int = 32
+    EXPORT_BATCH_SIZE: int = 1000
+    SOFTWARE_CATEGORY_CACHE_SIZE: int = 1000
+    ANSWER_FLUSH_INTERVAL_MS: int = 200
+    ANSWER_FLUSH_MAX_ROWS: int = 100
+    ANSWER_BUFFER_MAX_ROWS: int = 10000
+    ANSWER_MAX_RETRIES: int = 20
+    SESSION_TTL: float = 86400.0
+    SESSION_MAX_ENTRIES: int = 10000
+    SESSION_CHECKPOINT_PATH: Optional[str] = None
+    SESSION_CHECKPOINT_INTERVAL: float = 5.0
+    REDIS_URL: Optional[str] = None
+    REDIS_KEY_PREFIX: str = 'quiz_bot'
+    PII_ENCRYPTION_KEYS: Optional[str] = None
+    PII_KEY_FILE: Optional[str] = None
+    # Ключ HMAC слепого индекса контактов: hex-строка от 32 байт (64 символа),
+    # например вывод `openssl rand -hex 32` или содержимое файла PII_KEY_FILE.index
+    PII_INDEX_KEY: Optional[str] = None
+    PII_CRYPTO_BATCH_THRESHOLD: int = 16
+    PII_CRYPTO_WORKERS: int = 2
+    WEBHOOK_URL: Optional[str] = None
+    WEBHOOK_SECRET: Optional[str] = None
+    UPDATE_QUEUE_SIZE: int = 1000
+    UPDATE_DEDUP_SIZE: int = 10000
+    MAX_IN_FLIGHT_UPDATES: int = 64
+    THROTTLE_RATE: float = 2.0
+    THROTTLE_BURST: int = 5
+    THROTTLE_MAX_USERS: int = 10000
+    LOAD_SHED_THRESHOLD: int = 256
+    SEND_GLOBAL_RATE: float = 30.0
+    SEND_CHAT_RATE: float = 1.0
+    SEND_CHAT_BURST: int = 3
+    SEND_MAX_RETRIES: int = 3
+    SEND_MAX_CHATS: int = 10000
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from app.core.config import config
+
+# Токен Fernet начинается с байта версии 0x80 и старших (нулевых) байтов
+# метки времени, что в base64 дает этот префикс
+FERNET_TOKEN_PREFIX = "gAAAAA"
+
+# Минимальная длина ключа слепого индекса (HMAC-SHA256)
+INDEX_KEY_MIN_BYTES = 32
+
+def _parse_index_key(value: str, source: str) -> bytes:
+    try:
+        key = bytes.fromhex(value.strip())
+    except ValueError:
+        raise RuntimeError(f"Ключ слепого индекса в {source} должен быть шестнадцатеричной строкой")
+    if len(key) < INDEX_KEY_MIN_BYTES:
+        raise RuntimeError(f"Ключ слепого индекса в {source} короче {INDEX_KEY_MIN_BYTES} байт")
+    return key
+
+class KeyProvider:
+    """
+    Источник ключей шифрования персональных данных.
+
+    Ключи берутся из PII_ENCRYPTION_KEYS (через запятую) или из файла
+    PII_KEY_FILE (по ключу в строке). Первый ключ основной: им шифруются
+    новые значения, остальные используются только для расшифровки, что
+    позволяет менять ключ без потери ранее зашифрованных данных: новый ключ
+    добавляется первым, старый остается в списке до перешифровки данных.
+    Если файл ключей задан, но не существует, в нем создается новый ключ.
+    """
+
+    def __init__(self, keys: str | None, key_file: str | None, index_key: str | None = None):
+        self.keys = keys
+        self.key_file = key_file
+        self.index_key = index_key
+
+    def _read_file(self) -> list[str]:
+        if not os.path.exists(self.key_file):
+            try:
+                fd = os.open(self.key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                # Файл одновременно создал другой процесс
+                pass
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(Fernet.generate_key().decode() + "\n")
+                logging.warning(f"Создан новый ключ шифрования персональных данных в {self.key_file}")
+        with open(self.key_file) as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    def load(self) -> list[bytes]:
+        """
+        Возвращает ключи шифрования, основной первым.
+
+        Returns:
+            list[bytes]: Ключи Fernet.
+
+        Raises:
+            RuntimeError: Если ключи не заданы.
+        """
+        if self.keys:
+            keys = [key.strip() for key in self.keys.split(",") if key.strip()]
+        elif self.key_file:
+            keys = self._read_file()
+        else:
+            # Временный ключ сделал бы сохраненные контакты нечитаемыми после перезапуска
+            raise RuntimeError("Ключи шифрования персональных данных не заданы: укажите PII_ENCRYPTION_KEYS или PII_KEY_FILE")
+        if not keys:
+            raise RuntimeError("Список ключей шифрования персональных данных пуст")
+        return [key.encode() for key in keys]
+
+    def load_index_key(self, keys: list[bytes]) -> bytes:
+        """
+        Возвращает ключ HMAC для слепого индекса контактов.
+
+        Ключ не зависит от списка ключей шифрования, иначе смена основного
+        ключа сделала бы индекс бесполезным. Он берется из PII_INDEX_KEY, а при
+        использовании PII_KEY_FILE хранится рядом с ним в файле с суффиксом
+        .index. Файл создается при первом запуске с ключом, выведенным из
+        текущего основного ключа, поэтому уже вычисленные индексы остаются
+        действительными. В обоих источниках ключ записывается одинаково —
+        шестнадцатеричной строкой не короче INDEX_KEY_MIN_BYTES байт, — поэтому
+        значение из файла можно перенести в PII_INDEX_KEY без изменения индексов.
+
+        Args:
+            keys (list[bytes]): Ключи шифрования, основной первым.
+
+        Returns:
+            bytes: Ключ HMAC.
+
+        Raises:
+            RuntimeError: Если ключ не задан и файла ключей нет или ключ
+                записан не в шестнадцатеричном виде.
+        """
+        if self.index_key:
+            return _parse_index_key(self.index_key, "PII_INDEX_KEY")
+        if not self.key_file:
+            raise RuntimeError("Ключ слепого индекса не задан: укажите PII_INDEX_KEY")
+        index_file = f"{self.key_file}.index"
+        if not os.path.exists(index_file):
+            try:
+                fd = os.open(index_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(hmac.new(keys[0], b"pii-blind-index", hashlib.sha256).hexdigest() + "\n")
+                logging.warning(f"Создан ключ слепого индекса в {index_file}")
+        with open(index_file) as f:
+            return _parse_index_key(f.read(), index_file)
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    Приводит телефон к цифрам в формате 7XXXXXXXXXX для российских номеров.
+    """
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    return digits
+
+def normalize_email(email: str) -> str:
+    """
+    Приводит email к нижнему регистру без пробелов по краям.
+    """
+    return email.strip().lower()
+
+
+class PiiCipher:
+    """
+    Шифрование персональных данных (телефон, email) ключами KeyProvider.
+
+    Одиночные значения шифруются сразу, а пачки больше batch_threshold
+    значений обрабатываются в пуле потоков, чтобы не занимать цикл событий.
+    Значения, не похожие на токены Fernet (записи, сохраненные до
+    включения шифрования), при расшифровке возвращаются как есть; токен,
+    который не расшифровывается ни одним ключом, считается ошибкой.
+
+    Attributes:
+        batch_threshold: Размер пачки, начиная с которого работа уходит в пул потоков.
+    """
+
+    def __init__(self, provider: KeyProvider, batch_threshold: int, workers: int):
+        self.provider = provider
+        self.batch_threshold = batch_threshold
+        self.workers = workers
+        self._fernet: MultiFernet | None = None
+        self._index_key: bytes | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def load(self):
+        """
+        Загружает ключи. Вызывается при старте приложения, чтобы ошибка
+        конфигурации ключей обнаруживалась сразу, а не при первом запросе.
+
+        Raises:
+            RuntimeError: Если ключи не заданы.
+        """
+        keys = self.provider.load()
+        self._fernet = MultiFernet([Fernet(key) for key in keys])
+        self._index_key = self.provider.load_index_key(keys)
+
+    @property
+    def fernet(self) -> MultiFernet:
+        if self._fernet is None:
+            self.load()
+        return self._fernet
+
+    def blind_index(self, kind: str, value: str | None) -> str | None:
+        """
+        Возвращает слепой индекс (HMAC-SHA256) нормализованного значения.
+
+        Индекс позволяет искать записи по телефону или email через обычный
+        btree-индекс, не расшифровывая таблицу.
+
+        Args:
+            kind (str): Вид значения: 'phone' или 'email'.
+            value (str | None): Открытое значение.
+
+        Returns:
+            str | None: Шестнадцатеричный HMAC или None для пустого значения.
+        """
+        normalized = normalize_phone(value or "") if kind == "phone" else normalize_email(value or "")
+        if not normalized:
+            return None
+        if self._index_key is None:
+            self.load()
+        return hmac.new(self._index_key, f"{kind}:{normalized}".encode(), hashlib.sha256).hexdigest()
+
+    def encrypt(self, value: str | None) -> str | None:
+        """
+        Шифрует значение основным ключом; пустые значения не шифруются.
+
+        Args:
+            value (str | None): Открытое значение.
+
+        Returns:
+            str | None: Токен Fernet или исходное пустое значение.
+        """
+        if not value:
+            return value
+        return self.fernet.encrypt(value.encode()).decode()
+
+    def decrypt(self, value: str | None) -> str | None:
+        """
+        Расшифровывает значение любым из ключей.
+
+        Args:
+            value (str | None): Токен Fernet.
+
+        Returns:
+            str | None: Открытое значение.
+
+        Raises:
+            InvalidToken: Если токен не расшифровывается ни одним из ключей.
+        """
+        if not value or not value.startswith(FERNET_TOKEN_PREFIX):
+            return value
+        try:
+            return self.fernet.decrypt(value.encode()).decode()
+        except InvalidToken:
+            logging.error("Не удалось расшифровать персональные данные: ключ, которым они зашифрованы, отсутствует в списке ключей")
+            raise
+
+    async def _run_batch(self, func, values: list):
+        if len(values) < self.batch_threshold:
+            return [func(value) for value in values]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pii-crypto")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: [func(value) for value in values])
+
+    async def encrypt_many(self, values: list[str | None]) -> list[str | None]:
+        """
+        Шифрует пачку значений.
+
+        Args:
+            values (list[str | None]): Открытые значения.
+
+        Returns:
+            list[str | None]: Токены в том же порядке.
+        """
+        return await self._run_batch(self.encrypt, values)
+
+    async def decrypt_many(self, values: list[str | None]) -> list[str | None]:
+        """
+        Расшифровывает пачку значений.
+
+        Args:
+            values (list[str | None]): Токены Fernet.
+
+        Returns:
+            list[str | None]: Открытые значения в том же порядке.
+        """
+        return await self._run_batch(self.decrypt, values)
+
+    def close(self):
+        """
+        Останавливает пул потоков шифрования.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+pii_cipher = PiiCipher(
+    KeyProvider(config.PII_ENCRYPTION_KEYS, config.PII_KEY_FILE, config.PII_INDEX_KEY),
+    batch_threshold=config.PII_CRYPTO_BATCH_THRESHOLD,
+    workers=config.PII_CRYPTO_WORKERS,
+)
@@ -1,5 +1,13 @@
-URL = 'http://localhost:8000/'
+from app.core.config import config
+
+URL = config.API_URL
 ALL = 'all'
+GET_OR_CREATE = 'get_or_create'
+UPSERT = 'upsert'
+SEARCH = 'search'
+BULK = 'bulk'
+START = 'start'
+ACTIVE = 'active'
 ENTERPRISES = 'enterprises/'
 QUESTIONS = 'questions/'
 RESPONDENTS = 'respondents/'
@@ -3,12 +3,27 @@ from datetime import datetime
 import json
 import logging
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
 from app.db.models import Enterprises
-from app.db.schemas.enterprise import EnterpriseOut, EnterpriseCreate, EnterpriseUpdate
+from app.db.schemas.enterprise import EnterpriseOut, EnterpriseCreate, EnterpriseUpdate, EnterpriseFilter
+from app.crud.pagination import filter_date_range, paginate
+
+def normalize_inn(inn: str | None) -> str | None:
+    """
+    Приводит ИНН к виду, в котором он хранится: пустой ИНН (вопрос пропущен)
+    хранится как NULL, чтобы предприятия без ИНН не совпадали между собой.
+
+    Args:
+        inn (str | None): ИНН из запроса.
+
+    Returns:
+        str | None: ИНН без пробелов по краям или None.
+    """
+    return (inn or "").strip() or None
 
 async def create(session: AsyncSession, data: EnterpriseCreate) -> EnterpriseOut | object:
     """
@@ -23,7 +38,7 @@ async def create(session: AsyncSession, data: EnterpriseCreate) -> EnterpriseOut
     """
     try:
         enterprise_data = data.model_dump()
-        
+        enterprise_data["inn"] = normalize_inn(data.inn)
         enterprise = Enterprises(**enterprise_data)
         session.add(enterprise)
         await session.commit()
@@ -49,6 +64,58 @@ async def create(session: AsyncSession, data: EnterpriseCreate) -> EnterpriseOut
         }))
         return []
     
+async def upsert(session: AsyncSession, data: EnterpriseCreate) -> int:
+    """
+    Находит по ИНН или создает предприятие в текущей транзакции одним запросом.
+
+    Для существующего ИНН обновляется название (INSERT ... ON CONFLICT (inn)
+    DO UPDATE ... RETURNING id), поэтому повторная анкета той же компании не
+    приводит к ошибке уникальности и откату транзакции. Предприятие без ИНН
+    сопоставить не с чем: оно всегда создается с inn = NULL.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (EnterpriseCreate): Данные предприятия.
+
+    Returns:
+        int: Идентификатор предприятия.
+    """
+    values = data.model_dump()
+    values["inn"] = normalize_inn(data.inn)
+    stmt = insert(Enterprises).values(**values)
+    if values["inn"] is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Enterprises.inn],
+            set_={"name": stmt.excluded.name},
+        )
+    result = await session.execute(stmt.returning(Enterprises.id))
+    return result.scalar_one()
+
+async def upsert_by_inn(session: AsyncSession, data: EnterpriseCreate) -> EnterpriseOut | object:
+    """
+    Возвращает предприятие с таким же ИНН (обновив название) или создает новое.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (EnterpriseCreate): Данные предприятия.
+
+    Returns:
+        EnterpriseOut | list: Объект предприятия или пустой список при ошибке.
+    """
+    try:
+        enterprise_id = await upsert(session, data)
+        await session.commit()
+        return await get(session, enterprise_id)
+    except Exception as e:
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ошибка сохранения предприятия по ИНН",
+            "data": data.model_dump(),
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
 async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> EnterpriseOut | object:
     """
     Получает предприятие по ID из базы данных.
@@ -77,18 +144,23 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Enter
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[EnterpriseOut] | object:
+async def get_all(session: AsyncSession, filters: EnterpriseFilter) -> list[EnterpriseOut] | object:
     """
-    Получает все предприятия из базы данных.
+    Получает страницу списка предприятий из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (EnterpriseFilter): Фильтры и параметры страницы.
 
     Returns:
         list[EnterpriseOut] | list: Список предприятий или пустой список при ошибке.
     """
     try:
-        result = await session.execute(select(Enterprises))
+        stmt = select(Enterprises)
+        if filters.is_active is not None:
+            stmt = stmt.where(Enterprises.is_active == filters.is_active)
+        stmt = filter_date_range(stmt, Enterprises.create_at, filters)
+        result = await session.execute(paginate(stmt, Enterprises, filters))
         enterprises = result.scalars().all()
         return [enterprise.to_pydantic() for enterprise in enterprises]
     except Exception as e:
@@ -109,7 +181,7 @@ async def update(session: AsyncSession, id: int, data: EnterpriseUpdate) -> Ente
             return None
         
         for key, value in data.model_dump(exclude_unset=True).items():
-            setattr(enterprise, key, value)
+            setattr(enterprise, key, normalize_inn(value) if key == "inn" else value)
         
         await session.commit()
         await session.refresh(enterprise)
@@ -2,12 +2,14 @@ from datetime import datetime
 import json
 import logging
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
 from app.db.models import Questions
-from app.db.schemas.question import QuestionOut, QuestionCreate, QuestionUpdate
+from app.db.schemas.question import QuestionOut, QuestionCreate, QuestionUpdate, QuestionFilter
+from app.crud.pagination import paginate
 
 async def create(session: AsyncSession, data: QuestionCreate) -> QuestionOut | object:
     """
@@ -45,6 +47,64 @@ async def create(session: AsyncSession, data: QuestionCreate) -> QuestionOut | o
         }))
         return []
     
+async def upsert(session: AsyncSession, data: QuestionCreate) -> int:
+    """
+    Находит или создает вопрос по уникальному номеру в текущей транзакции.
+
+    Вставка и чтение существующей строки выполняются одним запросом:
+    INSERT ... ON CONFLICT (number) DO NOTHING RETURNING, объединенный с
+    выборкой по номеру. Если конфликтующая строка зафиксирована параллельной
+    транзакцией после начала запроса, она не видна его снимку и читается
+    повторно отдельным запросом.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (QuestionCreate): Данные вопроса.
+
+    Returns:
+        int: Идентификатор вопроса.
+    """
+    inserted = (
+        insert(Questions)
+        .values(**data.model_dump())
+        .on_conflict_do_nothing(index_elements=[Questions.number])
+        .returning(Questions.id)
+        .cte('inserted')
+    )
+    stmt = select(inserted.c.id).union_all(
+        select(Questions.id).where(Questions.number == data.number)
+    ).limit(1)
+    question_id = (await session.execute(stmt)).scalar_one_or_none()
+    if question_id is None:
+        result = await session.execute(select(Questions.id).where(Questions.number == data.number))
+        question_id = result.scalar_one()
+    return question_id
+
+async def get_or_create(session: AsyncSession, data: QuestionCreate) -> QuestionOut | object:
+    """
+    Возвращает вопрос с таким же номером или создает новый.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (QuestionCreate): Данные вопроса.
+
+    Returns:
+        QuestionOut | list: Существующий или созданный вопрос или пустой список при ошибке.
+    """
+    try:
+        question_id = await upsert(session, data)
+        await session.commit()
+        return await get(session, question_id)
+    except Exception as e:
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ошибка получения или создания вопроса",
+            "data": data.model_dump(),
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
 async def get(session: AsyncSession, id: int, as_pydantic = True) -> QuestionOut | object:
     """
     Получает вопрос по его идентификатору.
@@ -73,18 +133,22 @@ async def get(session: AsyncSession, id: int, as_pydantic = True) -> QuestionOut
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[QuestionOut] | object:
+async def get_all(session: AsyncSession, filters: QuestionFilter) -> list[QuestionOut] | object:
     """
-    Получает все вопросы из базы данных.
+    Получает страницу списка вопросов из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (QuestionFilter): Фильтры и параметры страницы.
 
     Returns:
         list[QuestionOut] | list: Список вопросов или пустой список при ошибке.
     """
     try:
-        result = await session.execute(select(Questions))
+        stmt = select(Questions)
+        if filters.number is not None:
+            stmt = stmt.where(Questions.number == filters.number)
+        result = await session.execute(paginate(stmt, Questions, filters))
         questions = result.scalars().all()
         return [question.to_pydantic() for question in questions]
     except Exception as e:
@@ -2,12 +2,56 @@ from datetime import datetime
 import json
 import logging
 
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
+from app.core.crypto import pii_cipher
 from app.db.models import Respondents
-from app.db.schemas.respondent import RespondentOut, RespondentCreate, RespondentUpdate
+from app.db.schemas.respondent import RespondentOut, RespondentCreate, RespondentUpdate, RespondentFilter
+from app.crud.pagination import filter_date_range, paginate
+
+# Контакты респондента хранятся в БД в зашифрованном виде
+CONTACT_FIELDS = ("phone", "email")
+
+async def encrypt_contacts(values: dict) -> dict:
+    """
+    Шифрует контакты респондента перед записью в БД и вычисляет их слепые
+    индексы (phone_hash, email_hash) для поиска.
+
+    Args:
+        values (dict): Поля респондента.
+
+    Returns:
+        dict: Поля респондента с зашифрованными телефоном и email и их индексами.
+    """
+    fields = [field for field in CONTACT_FIELDS if field in values]
+    encrypted = await pii_cipher.encrypt_many([values[field] for field in fields])
+    indexes = {f"{field}_hash": pii_cipher.blind_index(field, values[field]) for field in fields}
+    return {**values, **dict(zip(fields, encrypted)), **indexes}
+
+async def decrypt_respondents(respondents: list[Respondents]) -> list[RespondentOut]:
+    """
+    Преобразует респондентов в схемы ответа с расшифрованными контактами.
+
+    Контакты всех респондентов расшифровываются одной пачкой; ORM-объекты
+    не изменяются, поэтому открытые значения не попадают обратно в БД.
+
+    Args:
+        respondents (list[Respondents]): Респонденты из БД.
+
+    Returns:
+        list[RespondentOut]: Респонденты с открытыми телефоном и email.
+    """
+    items = [respondent.to_pydantic() for respondent in respondents]
+    values = iter(await pii_cipher.decrypt_many(
+        [getattr(item, field) for item in items for field in CONTACT_FIELDS]
+    ))
+    for item in items:
+        for field in CONTACT_FIELDS:
+            setattr(item, field, next(values))
+    return items
 
 async def create(session: AsyncSession, data: RespondentCreate) -> RespondentOut | object:
     """
@@ -21,17 +65,18 @@ async def create(session: AsyncSession, data: RespondentCreate) -> RespondentOut
         RespondentOut | list: Объект респондента или пустой список при ошибке.
     """
     try:
-        respondent_data = data.model_dump()
+        respondent_data = await encrypt_contacts(data.model_dump())
         respondent = Respondents(**respondent_data)
         session.add(respondent)
         await session.commit()
         await session.refresh(respondent)
-        return respondent.to_pydantic()
+        return (await decrypt_respondents([respondent]))[0]
     except Exception as e:
         await session.rollback()
         logging.error(json.dumps({
             "message": "Ошибка создания респондента",
-            "data": respondent_data,
+            # Контакты в журнал не пишутся ни открытыми, ни зашифрованными
+            "data": data.model_dump(exclude=set(CONTACT_FIELDS)),
             "error": str(e),
             "time": datetime.now().isoformat(),
         }))
@@ -55,7 +100,7 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Respo
         respondent = result.scalar_one_or_none()
         if as_pydantic is False:
             return respondent if respondent else None
-        return respondent.to_pydantic() if respondent else None
+        return (await decrypt_respondents([respondent]))[0] if respondent else None
     except Exception as e:
         logging.error(json.dumps({
             "message": "Ошибка получения респондента",
@@ -65,20 +110,101 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Respo
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[RespondentOut] | object:
+async def get_by_contact(session: AsyncSession, phone: str | None = None, email: str | None = None) -> list[RespondentOut] | object:
+    """
+    Находит респондентов по телефону и/или email через слепой индекс.
+
+    Значения нормализуются так же, как при записи, поэтому «8 (999) 000-11-22»
+    и «+79990001122» находят одного и того же респондента.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        phone (str | None): Телефон для поиска.
+        email (str | None): Email для поиска.
+
+    Returns:
+        list[RespondentOut] | list: Найденные респонденты или пустой список при ошибке.
+    """
+    conditions = []
+    phone_hash = pii_cipher.blind_index("phone", phone)
+    if phone_hash:
+        conditions.append(Respondents.phone_hash == phone_hash)
+    email_hash = pii_cipher.blind_index("email", email)
+    if email_hash:
+        conditions.append(Respondents.email_hash == email_hash)
+    if not conditions:
+        return []
+    try:
+        result = await session.execute(select(Respondents).where(or_(*conditions)).order_by(Respondents.id))
+        return await decrypt_respondents(result.scalars().all())
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка поиска респондентов по контактам",
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
+async def reindex_contacts(session: AsyncSession, batch_size: int = 500) -> int:
     """
-    Получает всех респондентов из базы данных.
+    Заполняет слепые индексы контактов у респондентов, сохраненных до их появления.
+
+    Респонденты обрабатываются пачками по batch_size с фиксацией каждой пачки;
+    контакты пачки расшифровываются в пуле потоков.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        batch_size (int): Размер пачки.
+
+    Returns:
+        int: Число обработанных респондентов.
+
+    Raises:
+        SQLAlchemyError: При ошибке работы с БД.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        result = await session.execute(
+            select(Respondents)
+            .where(Respondents.id > last_id, or_(Respondents.phone_hash.is_(None), Respondents.email_hash.is_(None)))
+            .order_by(Respondents.id)
+            .limit(batch_size)
+        )
+        respondents = result.scalars().all()
+        if not respondents:
+            return processed
+        values = iter(await pii_cipher.decrypt_many(
+            [getattr(respondent, field) for respondent in respondents for field in CONTACT_FIELDS]
+        ))
+        for respondent in respondents:
+            for field in CONTACT_FIELDS:
+                setattr(respondent, f"{field}_hash", pii_cipher.blind_index(field, next(values)))
+        await session.commit()
+        processed += len(respondents)
+        last_id = respondents[-1].id
+
+async def get_all(session: AsyncSession, filters: RespondentFilter) -> list[RespondentOut] | object:
+    """
+    Получает страницу списка респондентов из базы данных.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (RespondentFilter): Фильтры и параметры страницы.
 
     Returns:
         list[RespondentOut] | list: Список респондентов или пустой список при ошибке.
     """
     try:
-        result = await session.execute(select(Respondents))
+        stmt = select(Respondents)
+        if filters.enterprise_id is not None:
+            stmt = stmt.where(Respondents.enterprise_id == filters.enterprise_id)
+        if filters.telegram_user_id is not None:
+            stmt = stmt.where(Respondents.telegram_user_id == filters.telegram_user_id)
+        stmt = filter_date_range(stmt, Respondents.create_at, filters)
+        result = await session.execute(paginate(stmt, Respondents, filters))
         respondents = result.scalars().all()
-        return [respondent.to_pydantic() for respondent in respondents]
+        return await decrypt_respondents(respondents)
     except Exception as e:
         logging.error(json.dumps({
             "message": "Ошибка получения списка респондентов",
@@ -96,18 +222,19 @@ async def update(session: AsyncSession, id: int, data: RespondentUpdate) -> Resp
         if not respondent:
             return None
         
-        for key, value in data.model_dump(exclude_unset=True).items():
+        for key, value in (await encrypt_contacts(data.model_dump(exclude_unset=True))).items():
             setattr(respondent, key, value)
         
         await session.commit()
         await session.refresh(respondent)
-        return respondent.to_pydantic()
+        return (await decrypt_respondents([respondent]))[0]
     
     except Exception as e:
         await session.rollback()
         logging.error(json.dumps({
-            "message": "Ошибка создания респондента",
-            "data": respondent.model_dump(),
+            "message": "Ошибка обновления респондента",
+            "id": id,
+            "data": data.model_dump(exclude=set(CONTACT_FIELDS), exclude_unset=True),
             "error": str(e),
             "time": datetime.now().isoformat(),
         }))
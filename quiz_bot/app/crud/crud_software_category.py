@@ -2,12 +2,30 @@ from datetime import datetime
 import json
 import logging
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
 from app.db.models import SoftwareCategories
-from app.db.schemas.software_category import SoftwareCategoryOut, SoftwareCategoryCreate, SoftwareCategoryUpdate
+from app.db.schemas.software_category import SoftwareCategoryOut, SoftwareCategoryCreate, SoftwareCategoryUpdate, SoftwareCategoryFilter, SoftwareCategorySearch
+from app.crud.pagination import paginate
+
+NAME_MAX_LENGTH = 100
+
+def normalize_name(name: str) -> str:
+    """
+    Приводит название категории ПО к виду, в котором оно хранится: без
+    лишних пробелов и не длиннее NAME_MAX_LENGTH символов.
+
+    Args:
+        name (str): Название, введенное пользователем.
+
+    Returns:
+        str: Нормализованное название.
+    """
+    return " ".join(name.split())[:NAME_MAX_LENGTH]
 
 async def create(session: AsyncSession, data: SoftwareCategoryCreate) -> SoftwareCategoryOut | object:
     """
@@ -75,19 +93,132 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Softw
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[SoftwareCategoryOut] | object:
+async def get_by_name(session: AsyncSession, name: str) -> SoftwareCategoryOut | None:
+    """
+    Получает категорию программного обеспечения по имени без учета регистра.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        name (str): Название категории.
+
+    Returns:
+        SoftwareCategoryOut: Найденная категория в формате схемы.
+        None: Если категория не найдена или произошла ошибка.
+    """
+    try:
+        result = await session.execute(
+            select(SoftwareCategories)
+            .where(func.lower(SoftwareCategories.name) == normalize_name(name).lower())
+        )
+        soft_cat = result.scalar_one_or_none()
+        return soft_cat.to_pydantic() if soft_cat else None
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка получения категории ПО по имени",
+            "name": name,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return None
+
+async def get_or_create(session: AsyncSession, data: SoftwareCategoryCreate) -> SoftwareCategoryOut | object:
+    """
+    Возвращает категорию ПО с таким же именем без учета регистра или создаёт новую.
+
+    Поиск и вставка выполняются одним запросом по уникальному индексу
+    lower(name): INSERT ... ON CONFLICT DO NOTHING RETURNING, объединенный с
+    выборкой существующей строки. Категория, зафиксированная параллельной
+    транзакцией после начала запроса, читается повторно.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        data (SoftwareCategoryCreate): Данные категории.
+
+    Returns:
+        SoftwareCategoryOut: Существующая или созданная категория в формате схемы.
+        object: Пустой список, если произошла ошибка.
+    """
+    soft_cat_data = data.model_dump()
+    soft_cat_data["name"] = normalize_name(data.name)
+    try:
+        inserted = (
+            insert(SoftwareCategories)
+            .values(**soft_cat_data)
+            .on_conflict_do_nothing(index_elements=[func.lower(SoftwareCategories.name)])
+            .returning(*SoftwareCategories.__table__.c)
+            .cte('inserted')
+        )
+        stmt = select(*inserted.c).union_all(
+            select(*SoftwareCategories.__table__.c)
+            .where(func.lower(SoftwareCategories.name) == soft_cat_data["name"].lower())
+        ).limit(1)
+        row = (await session.execute(stmt)).mappings().one_or_none()
+        await session.commit()
+        if row is None:
+            return await get_by_name(session, soft_cat_data["name"]) or []
+        return SoftwareCategoryOut(**row)
+    except Exception as e:
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ошибка получения или создания категории ПО",
+            "data": soft_cat_data,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
+async def search(session: AsyncSession, params: SoftwareCategorySearch) -> list[SoftwareCategoryOut] | object:
+    """
+    Ищет категории ПО по началу названия без учета регистра (для автодополнения).
+
+    Префикс превращается в диапазон [prefix, следующая строка) по операторам
+    ~>=~ и ~<~, которые обслуживает индекс lower(name) text_pattern_ops, в том
+    числе в подготовленных запросах, где LIKE с параметром индекс не использует.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        params (SoftwareCategorySearch): Префикс и максимальное число результатов.
+
+    Returns:
+        list[SoftwareCategoryOut]: Найденные категории по алфавиту.
+        object: Пустой список, если произошла ошибка.
+    """
+    prefix = normalize_name(params.prefix).lower()
+    if not prefix:
+        return []
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    name = func.lower(SoftwareCategories.name)
+    try:
+        result = await session.execute(
+            select(SoftwareCategories)
+            .where(name.op('~>=~')(prefix), name.op('~<~')(upper))
+            .order_by(name)
+            .limit(params.limit)
+        )
+        return [soft_cat.to_pydantic() for soft_cat in result.scalars().all()]
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка поиска категорий ПО",
+            "prefix": params.prefix,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
+async def get_all(session: AsyncSession, filters: SoftwareCategoryFilter) -> list[SoftwareCategoryOut] | object:
     """
-    Возвращает список всех категорий программного обеспечения.
+    Возвращает страницу списка категорий программного обеспечения.
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        filters (SoftwareCategoryFilter): Фильтры и параметры страницы.
 
     Returns:
         list[SoftwareCategoryOut]: Список всех категорий.
         object: Пустой список, если произошла ошибка.
     """
     try:
-        result = await session.execute(select(SoftwareCategories))
+        result = await session.execute(paginate(select(SoftwareCategories), SoftwareCategories, filters))
         soft_cats = result.scalars().all()
         return [soft_cat.to_pydantic() for soft_cat in soft_cats]
     except Exception as e:
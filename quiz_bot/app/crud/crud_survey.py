@@ -7,8 +7,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
-from app.db.models import Surveys
-from app.db.schemas.survey import SurveyOut, SurveyCreate, SurveyUpdate
+from app.crud.crud_enterprise import upsert as upsert_enterprise
+from app.crud.crud_question import upsert as upsert_question
+from app.crud.crud_respondent import encrypt_contacts
+from app.db.models import Questions, Respondents, SurveyAnswers, Surveys
+from app.db.schemas.survey import SurveyOut, SurveyCreate, SurveyUpdate, SurveyStart, SurveyStartOut, SurveyActiveOut, SurveyFilter
+from app.crud.pagination import filter_date_range, paginate
 
 async def parse_naive_datetime(date_input: str | datetime) -> datetime:
     """
@@ -48,7 +52,8 @@ async def create(session: AsyncSession, data: SurveyCreate) -> SurveyOut | objec
             respondent_id=data.respondent_id,
             started_at=started_at,
             completed_at=completed_at,
-            user_agent=data.user_agent
+            user_agent=data.user_agent,
+            telegram_user_id=data.telegram_user_id
         )
         session.add(survey)
         await session.commit()
@@ -64,6 +69,122 @@ async def create(session: AsyncSession, data: SurveyCreate) -> SurveyOut | objec
         }))
         return []
     
+async def start(session: AsyncSession, data: SurveyStart) -> SurveyStartOut | object:
+    """
+    Начинает опрос в одной транзакции: находит или создает предприятие по ИНН,
+    находит (по telegram_user_id) или создает респондента, создает опрос и
+    находит или создает первый вопрос. Повторно проходящий опрос пользователь
+    Telegram не порождает нового респондента: его данные обновляются.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (SurveyStart): Данные предприятия, респондента, опроса и первого вопроса.
+
+    Returns:
+        SurveyStartOut | list: Идентификаторы созданных записей или пустой список при ошибке.
+    """
+    try:
+        enterprise_id = await upsert_enterprise(session, data.enterprise)
+
+        contacts = await encrypt_contacts({"phone": data.phone or "", "email": data.email or ""})
+        respondent_data = dict(
+            enterprise_id=enterprise_id,
+            full_name=data.full_name,
+            position=data.position,
+            telegram_user_id=data.telegram_user_id,
+            consent=data.consent,
+            **contacts
+        )
+        respondent = None
+        if data.telegram_user_id is not None:
+            result = await session.execute(
+                select(Respondents)
+                .where(Respondents.telegram_user_id == data.telegram_user_id, Respondents.enterprise_id == enterprise_id)
+                .order_by(Respondents.id.desc())
+                .limit(1)
+            )
+            respondent = result.scalar_one_or_none()
+        if respondent is None:
+            respondent = Respondents(**respondent_data)
+            session.add(respondent)
+        else:
+            for key, value in respondent_data.items():
+                setattr(respondent, key, value)
+        await session.flush()
+
+        survey = Surveys(
+            respondent_id=respondent.id,
+            started_at=await parse_naive_datetime(data.started_at),
+            user_agent=data.user_agent,
+            telegram_user_id=data.telegram_user_id
+        )
+        session.add(survey)
+
+        question_id = await upsert_question(session, data.question) if data.question else None
+
+        await session.flush()
+        started = SurveyStartOut(
+            enterprise_id=enterprise_id,
+            respondent_id=respondent.id,
+            survey_id=survey.id,
+            question_id=question_id
+        )
+        await session.commit()
+        return started
+    except Exception as e:
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ошибка начала опроса",
+            "inn": data.enterprise.inn,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return []
+
+async def get_active(session: AsyncSession, telegram_user_id: int) -> SurveyActiveOut | None:
+    """
+    Получает последний незавершенный опрос пользователя Telegram.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        telegram_user_id (int): Идентификатор пользователя Telegram.
+
+    Returns:
+        SurveyActiveOut | None: Опрос с номерами отвеченных вопросов или None, если его нет.
+    """
+    try:
+        result = await session.execute(
+            select(Surveys.id, Surveys.respondent_id, Surveys.started_at, Respondents.enterprise_id)
+            .join(Respondents, Respondents.id == Surveys.respondent_id)
+            .where(Surveys.telegram_user_id == telegram_user_id, Surveys.completed_at.is_(None))
+            .order_by(Surveys.id.desc())
+            .limit(1)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        answered = await session.execute(
+            select(Questions.number)
+            .join(SurveyAnswers, SurveyAnswers.question_id == Questions.id)
+            .where(SurveyAnswers.survey_id == row.id)
+            .distinct()
+        )
+        return SurveyActiveOut(
+            enterprise_id=row.enterprise_id,
+            respondent_id=row.respondent_id,
+            survey_id=row.id,
+            started_at=row.started_at,
+            answered_questions=sorted(answered.scalars().all())
+        )
+    except Exception as e:
+        logging.error(json.dumps({
+            "message": "Ошибка получения незавершенного опроса",
+            "telegram_user_id": telegram_user_id,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        return None
+
 async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> SurveyOut | object:
     """
     Получает опрос по его идентификатору.
@@ -92,18 +213,27 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Surve
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[SurveyOut] | object:
+async def get_all(session: AsyncSession, filters: SurveyFilter) -> list[SurveyOut] | object:
     """
-    Получает все опросы из базы данных.
+    Получает страницу списка опросов из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (SurveyFilter): Фильтры и параметры страницы.
 
     Returns:
         list[SurveyOut] | list: Список опросов или пустой список при ошибке.
     """
     try:
-        result = await session.execute(select(Surveys))
+        stmt = select(Surveys)
+        if filters.respondent_id is not None:
+            stmt = stmt.where(Surveys.respondent_id == filters.respondent_id)
+        if filters.telegram_user_id is not None:
+            stmt = stmt.where(Surveys.telegram_user_id == filters.telegram_user_id)
+        if filters.completed is not None:
+            stmt = stmt.where(Surveys.completed_at.is_not(None) if filters.completed else Surveys.completed_at.is_(None))
+        stmt = filter_date_range(stmt, Surveys.started_at, filters)
+        result = await session.execute(paginate(stmt, Surveys, filters))
         surveys = result.scalars().all()
         return [survey.to_pydantic() for survey in surveys]
     except Exception as e:
@@ -1,13 +1,17 @@
 from datetime import datetime
 import json
 import logging
+from typing import AsyncIterator
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (DataError, ProgrammingError, SQLAlchemyError, IntegrityError)
 
-from app.db.models import SurveyAnswers
-from app.db.schemas.survey_answer import SurveyAnswerOut, SurveyAnswerCreate, SurveyAnswerUpdate
+from app.core.crypto import pii_cipher
+from app.db.models import Enterprises, Questions, Respondents, SurveyAnswers, Surveys
+from app.db.schemas.survey_answer import SurveyAnswerOut, SurveyAnswerCreate, SurveyAnswerUpdate, SurveyAnswerFilter, SurveyAnswerExportParams
+from app.crud.pagination import filter_date_range, paginate
 
 async def create(session: AsyncSession, data: SurveyAnswerCreate) -> SurveyAnswerOut | object:
     """
@@ -20,14 +24,28 @@ async def create(session: AsyncSession, data: SurveyAnswerCreate) -> SurveyAnswe
     Returns:
         SurveyAnswerOut | object: Объект ответа в формате Pydantic при успешном создании,
         либо пустой список при ошибке.
+
+    Raises:
+        IntegrityError: Если ответ ссылается на несуществующий опрос или вопрос.
+        DataError: Если данные ответа не подходят под типы столбцов.
     """
+    sur_ans_data = data.model_dump()
     try:
-        sur_ans_data = data.model_dump()
         sur_ans = SurveyAnswers(**sur_ans_data)
         session.add(sur_ans)
         await session.commit()
         await session.refresh(sur_ans)
         return sur_ans.to_pydantic()
+    except (IntegrityError, DataError) as e:
+        # Некорректные данные: вызывающий отвечает клиенту 4xx, и бот не повторяет запрос
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ответ на вопрос отклонен базой данных",
+            "data": sur_ans_data,
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        raise
     except Exception as e:
         await session.rollback()
         logging.error(json.dumps({
@@ -38,6 +56,38 @@ async def create(session: AsyncSession, data: SurveyAnswerCreate) -> SurveyAnswe
         }))
         return []
     
+async def create_many(session: AsyncSession, data: list[SurveyAnswerCreate]) -> list[SurveyAnswerOut] | object:
+    """
+    Создает пачку ответов на вопросы одним многострочным INSERT ... RETURNING.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с базой данных.
+        data (list[SurveyAnswerCreate]): Данные для создания ответов на вопросы.
+
+    Returns:
+        list[SurveyAnswerOut] | object: Список созданных ответов в формате Pydantic,
+        либо пустой список при ошибке.
+    """
+    if not data:
+        return []
+    sur_ans_data = [item.model_dump() for item in data]
+    try:
+        result = await session.scalars(
+            insert(SurveyAnswers).values(sur_ans_data).returning(SurveyAnswers)
+        )
+        sur_anss = result.all()
+        await session.commit()
+        return [sur_ans.to_pydantic() for sur_ans in sur_anss]
+    except Exception as e:
+        await session.rollback()
+        logging.error(json.dumps({
+            "message": "Ошибка создания пачки ответов на вопросы",
+            "count": len(sur_ans_data),
+            "error": str(e),
+            "time": datetime.now().isoformat(),
+        }))
+        raise
+
 async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> SurveyAnswerOut | object:
     """
     Получает ответ на вопрос по ID из базы данных.
@@ -67,19 +117,26 @@ async def get(session: AsyncSession, id: int, as_pydantic: bool = True) -> Surve
         }))
         return None
 
-async def get_all(session: AsyncSession) -> list[SurveyAnswerOut] | object:
+async def get_all(session: AsyncSession, filters: SurveyAnswerFilter) -> list[SurveyAnswerOut] | object:
     """
-    Получает список всех ответов на вопросы из базы данных.
+    Получает страницу списка ответов на вопросы из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с базой данных.
+        filters (SurveyAnswerFilter): Фильтры и параметры страницы.
 
     Returns:
         list[SurveyAnswerOut] | object: Список объектов ответов в формате Pydantic;
         пустой список при ошибке запроса.
     """
     try:
-        result = await session.execute(select(SurveyAnswers))
+        stmt = select(SurveyAnswers)
+        if filters.survey_id is not None:
+            stmt = stmt.where(SurveyAnswers.survey_id == filters.survey_id)
+        if filters.question_id is not None:
+            stmt = stmt.where(SurveyAnswers.question_id == filters.question_id)
+        stmt = filter_date_range(stmt, SurveyAnswers.created_at, filters)
+        result = await session.execute(paginate(stmt, SurveyAnswers, filters))
         sur_anss = result.scalars().all()
         return [sur_ans.to_pydantic() for sur_ans in sur_anss]
     except Exception as e:
@@ -114,4 +171,66 @@ async def update(session: AsyncSession, id: int, data: SurveyAnswerUpdate) -> Su
             "error": str(e),
             "time": datetime.now().isoformat(),
         }))
-        return []
\ No newline at end of file
+        return []
+
+EXPORT_COLUMNS = [
+    "id", "created_at", "survey_id", "started_at", "completed_at",
+    "question_number", "question_text", "answer",
+    "respondent_id", "full_name", "position",
+    "enterprise_id", "enterprise_name", "enterprise_inn",
+]
+EXPORT_CONTACT_COLUMNS = ["phone", "email"]
+
+async def export(session: AsyncSession, params: SurveyAnswerExportParams, batch_size: int) -> AsyncIterator[list[dict]]:
+    """
+    Выгружает ответы вместе с вопросами, опросами, респондентами и предприятиями.
+
+    Запрос выполняется через серверный курсор: строки читаются из БД пачками
+    по batch_size и сразу отдаются вызывающему, поэтому память не зависит от
+    объема выгрузки. Строки идут по возрастанию id ответа.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия, открытая на время выгрузки.
+        params (SurveyAnswerExportParams): Фильтры выгрузки.
+        batch_size (int): Число строк, читаемых из курсора за раз.
+
+    Yields:
+        list[dict]: Пачка строк выгрузки с полями EXPORT_COLUMNS (и контактами
+            EXPORT_CONTACT_COLUMNS при include_contacts).
+    """
+    columns = [
+        SurveyAnswers.id, SurveyAnswers.created_at, SurveyAnswers.survey_id,
+        Surveys.started_at, Surveys.completed_at,
+        Questions.number.label("question_number"), Questions.text.label("question_text"), SurveyAnswers.answer,
+        Respondents.id.label("respondent_id"), Respondents.full_name, Respondents.position,
+        Enterprises.id.label("enterprise_id"), Enterprises.name.label("enterprise_name"), Enterprises.inn.label("enterprise_inn"),
+    ]
+    if params.include_contacts:
+        columns += [Respondents.phone, Respondents.email]
+    stmt = (
+        select(*columns)
+        .join(Questions, Questions.id == SurveyAnswers.question_id)
+        .join(Surveys, Surveys.id == SurveyAnswers.survey_id)
+        .join(Respondents, Respondents.id == Surveys.respondent_id)
+        .join(Enterprises, Enterprises.id == Respondents.enterprise_id)
+        .order_by(SurveyAnswers.id)
+    )
+    if params.survey_id is not None:
+        stmt = stmt.where(SurveyAnswers.survey_id == params.survey_id)
+    if params.question_id is not None:
+        stmt = stmt.where(SurveyAnswers.question_id == params.question_id)
+    if params.after_id is not None:
+        stmt = stmt.where(SurveyAnswers.id > params.after_id)
+    stmt = filter_date_range(stmt, SurveyAnswers.created_at, params)
+
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions():
+        rows = [dict(row) for row in partition]
+        if params.include_contacts:
+            values = iter(await pii_cipher.decrypt_many(
+                [row[field] for row in rows for field in EXPORT_CONTACT_COLUMNS]
+            ))
+            for row in rows:
+                for field in EXPORT_CONTACT_COLUMNS:
+                    row[field] = next(values)
+        yield rows
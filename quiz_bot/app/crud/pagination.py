@@ -0,0 +1,54 @@
+from sqlalchemy import Select
+from app.db.schemas.pagination import DateRangeParams, PageParams
+
+def paginate(stmt: Select, model, page: PageParams) -> Select:
+    """
+    Добавляет к запросу keyset-пагинацию по первичному ключу.
+
+    В отличие от OFFSET, условие id > after_id обслуживается индексом
+    первичного ключа, и стоимость страницы не растет с ее номером.
+
+    Args:
+        stmt (Select): Запрос списка.
+        model: Модель с первичным ключом id.
+        page (PageParams): Параметры страницы.
+
+    Returns:
+        Select: Запрос страницы.
+    """
+    if page.after_id is not None:
+        stmt = stmt.where(model.id > page.after_id)
+    return stmt.order_by(model.id).limit(page.limit)
+
+def filter_date_range(stmt: Select, column, params: DateRangeParams) -> Select:
+    """
+    Добавляет к запросу фильтр по диапазону дат [date_from, date_to).
+
+    Args:
+        stmt (Select): Запрос списка.
+        column: Столбец с датой.
+        params (DateRangeParams): Параметры с границами диапазона.
+
+    Returns:
+        Select: Запрос с фильтром.
+    """
+    if params.date_from is not None:
+        stmt = stmt.where(column >= params.date_from)
+    if params.date_to is not None:
+        stmt = stmt.where(column < params.date_to)
+    return stmt
+
+def next_cursor(items: list, page: PageParams) -> int | None:
+    """
+    Возвращает курсор следующей страницы или None, если страница последняя.
+
+    Args:
+        items (list): Записи страницы.
+        page (PageParams): Параметры страницы.
+
+    Returns:
+        int | None: id последней записи полной страницы.
+    """
+    if len(items) < page.limit:
+        return None
+    return items[-1].id
@@ -1,5 +1,5 @@
-from sqlalchemy import (CheckConstraint, Integer, String, DateTime, ForeignKey,
-                        Boolean, func, Index)
+from sqlalchemy import (BigInteger, CheckConstraint, Integer, String, DateTime, ForeignKey,
+                        Boolean, func, Index, text)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from typing import Optional
@@ -18,7 +18,7 @@ class Enterprises(Base):
         id: Уникальный идентификатор предприятия.
         name: Полное название предприятия.
         industry: Отрасль деятельности предприятия.
-        inn: ИНН предприятия (уникальный).
+        inn: ИНН предприятия (уникальный; NULL, если не указан).
         short_name: Сокращенное название.
         is_active: Флаг активности предприятия.
         create_at: Дата создания записи.
@@ -31,7 +31,7 @@ class Enterprises(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    inn: Mapped[str] = mapped_column(String(12), unique=True)
+    inn: Mapped[Optional[str]] = mapped_column(String(12), unique=True)
     short_name: Mapped[str] = mapped_column(String(100))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     create_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -57,8 +57,11 @@ class Respondents(Base):
         enterprise_id: Ссылка на предприятие респондента.
         full_name: Полное имя респондента.
         position: Должность респондента.
-        phone: Контактный телефон.
-        email: Электронная почта.
+        phone: Контактный телефон (зашифрован).
+        email: Электронная почта (зашифрована).
+        phone_hash: Слепой индекс нормализованного телефона (HMAC).
+        email_hash: Слепой индекс нормализованного email (HMAC).
+        telegram_user_id: Идентификатор пользователя Telegram.
         consent: Флаг согласия на обработку данных.
         create_at: Дата создания записи.
     """
@@ -66,6 +69,9 @@ class Respondents(Base):
     
     __table_args__ = (
         Index('idx_respondents_enterprise', 'enterprise_id'),
+        Index('idx_respondents_phone_hash', 'phone_hash'),
+        Index('idx_respondents_email_hash', 'email_hash'),
+        Index('idx_respondents_telegram_user', 'telegram_user_id'),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -74,6 +80,9 @@ class Respondents(Base):
     position: Mapped[str] = mapped_column(String(100), nullable=False)
     phone: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str] = mapped_column(String)
+    phone_hash: Mapped[Optional[str]] = mapped_column(String(64), default=None)
+    email_hash: Mapped[Optional[str]] = mapped_column(String(64), default=None)
+    telegram_user_id: Mapped[Optional[int]] = mapped_column(BigInteger, default=None)
     consent: Mapped[bool] = mapped_column(Boolean, default=False)
     create_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -88,6 +97,7 @@ class Respondents(Base):
             position=self.position,
             phone=self.phone,
             email=self.email,
+            telegram_user_id=self.telegram_user_id,
             consent=self.consent,
             create_at=self.create_at
         )
@@ -102,11 +112,15 @@ class Surveys(Base):
         started_at: Время начала опроса.
         completed_at: Время завершения опроса (если завершен).
         user_agent: Информация о браузере/устройстве респондента.
+        telegram_user_id: Идентификатор пользователя Telegram, проходящего опрос.
     """
     __tablename__ = 'surveys'
 
     __table_args__ = (
         Index('idx_surveys_respondent', 'respondent_id'),
+        # Поиск незавершенного опроса пользователя для продолжения
+        Index('idx_surveys_telegram_user_active', 'telegram_user_id', 'id',
+              postgresql_where=text('completed_at IS NULL')),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -114,6 +128,7 @@ class Surveys(Base):
     started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
     user_agent: Mapped[Optional[str]] = mapped_column(String, default=None)
+    telegram_user_id: Mapped[Optional[int]] = mapped_column(BigInteger, default=None)
     
     respondent: Mapped['Respondents'] = relationship(back_populates='survey')
     answers: Mapped[list["SurveyAnswers"]] = relationship(back_populates="survey")
@@ -124,7 +139,8 @@ class Surveys(Base):
             respondent_id=self.respondent_id,
             started_at=self.started_at,
             completed_at=self.completed_at if self.completed_at else None,
-            user_agent=self.user_agent
+            user_agent=self.user_agent,
+            telegram_user_id=self.telegram_user_id
         )
 
 class Questions(Base):
@@ -138,6 +154,10 @@ class Questions(Base):
         answer_type: Тип ожидаемого ответа.
     """
     __tablename__ = 'questions'
+    __table_args__ = (
+        Index('idx_questions_number', 'number', unique=True),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     number: Mapped[int] = mapped_column(Integer, nullable=False)  # номер вопроса  
     text: Mapped[str] = mapped_column(String, nullable=False)  # текст вопроса
@@ -203,9 +223,14 @@ class SoftwareCategories(Base):
         description: Описание категории ПО.
     """
     __tablename__ = 'software_categories'
+    # Уникальность имени без учета регистра; класс операторов text_pattern_ops
+    # позволяет тому же индексу обслуживать поиск по префиксу
+    __table_args__ = (
+        Index('idx_software_categories_name_lower', text('lower(name) text_pattern_ops'), unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(String)
 
     def to_pydantic(self):
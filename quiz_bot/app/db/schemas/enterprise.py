@@ -1,9 +1,11 @@
+from typing import Optional
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from app.db.schemas.pagination import DateRangeParams
 
 class EnterpriseBase(BaseModel):
     name: str
-    inn: str
+    inn: Optional[str] = None
     short_name: str
     is_active: bool = True
 
@@ -12,11 +14,15 @@ class EnterpriseCreate(EnterpriseBase):
 
 class EnterpriseUpdate(BaseModel):
     name: str
-    inn: str
+    inn: Optional[str] = None
     short_name: str
 
 class EnterpriseOut(EnterpriseBase):
     id: int
     create_at: datetime
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class EnterpriseFilter(DateRangeParams):
+    """Фильтр списка предприятий; диапазон дат — по create_at."""
+    is_active: Optional[bool] = None
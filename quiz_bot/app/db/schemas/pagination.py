@@ -0,0 +1,37 @@
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+
+# Заголовок ответа списка с курсором следующей страницы (after_id)
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def naive_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    # Даты в БД хранятся без часового пояса
+    if value is not None and value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return value
+
+class PageParams(BaseModel):
+    """
+    Параметры постраничного (keyset) получения списка: записи отдаются по
+    возрастанию id, следующая страница запрашивается с after_id, равным id
+    последней записи предыдущей страницы.
+    """
+    after_id: Optional[int] = Field(None, ge=0)
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+class DateRangeParams(PageParams):
+    """
+    Параметры постраничного получения списка с фильтром по диапазону дат
+    [date_from, date_to).
+    """
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+    @field_validator('date_from', 'date_to')
+    @classmethod
+    def to_naive(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return naive_datetime(value)
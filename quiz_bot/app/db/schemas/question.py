@@ -1,6 +1,7 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from app.db.schemas.pagination import PageParams
 
 class QuestionBase(BaseModel):
     number: int
@@ -16,4 +17,8 @@ class QuestionUpdate(QuestionBase):
 class QuestionOut(QuestionBase):
     id: int
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class QuestionFilter(PageParams):
+    """Фильтр списка вопросов."""
+    number: Optional[int] = None
@@ -1,5 +1,7 @@
+from typing import Optional
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from app.db.schemas.pagination import DateRangeParams
 
 class RespondentBase(BaseModel):
     enterprise_id: int
@@ -7,6 +9,7 @@ class RespondentBase(BaseModel):
     position: str
     phone: str
     email: str
+    telegram_user_id: Optional[int] = None
     consent: bool = False
 
 class RespondentCreate(RespondentBase):
@@ -23,4 +26,9 @@ class RespondentOut(RespondentBase):
     id: int
     create_at: datetime
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class RespondentFilter(DateRangeParams):
+    """Фильтр списка респондентов; диапазон дат — по create_at."""
+    enterprise_id: Optional[int] = None
+    telegram_user_id: Optional[int] = None
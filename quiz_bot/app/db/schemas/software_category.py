@@ -1,6 +1,7 @@
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from app.db.schemas.pagination import PageParams
 
 class SoftwareCategoryBase(BaseModel):
     name: str
@@ -15,4 +16,12 @@ class SoftwareCategoryUpdate(SoftwareCategoryBase):
 class SoftwareCategoryOut(SoftwareCategoryBase):
     id: int
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class SoftwareCategoryFilter(PageParams):
+    """Фильтр списка категорий ПО."""
+
+class SoftwareCategorySearch(BaseModel):
+    """Параметры поиска категорий ПО по началу названия без учета регистра."""
+    prefix: str = Field(min_length=1, max_length=100)
+    limit: int = Field(10, ge=1, le=50)
@@ -1,12 +1,16 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from app.db.schemas.pagination import DateRangeParams
+from app.db.schemas.enterprise import EnterpriseCreate
+from app.db.schemas.question import QuestionCreate
 
 class SurveyBase(BaseModel):
     respondent_id: int
     started_at: datetime
     completed_at: Optional[datetime] = None
     user_agent: Optional[str] = None
+    telegram_user_id: Optional[int] = None
 
 class SurveyCreate(SurveyBase):
     pass
@@ -17,4 +21,35 @@ class SurveyUpdate(BaseModel):
 class SurveyOut(SurveyBase):
     id: int
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class SurveyStart(BaseModel):
+    enterprise: EnterpriseCreate
+    full_name: str
+    position: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    consent: bool = False
+    started_at: datetime
+    user_agent: Optional[str] = None
+    telegram_user_id: Optional[int] = None
+    question: Optional[QuestionCreate] = None
+
+class SurveyStartOut(BaseModel):
+    enterprise_id: int
+    respondent_id: int
+    survey_id: int
+    question_id: Optional[int] = None
+
+class SurveyActiveOut(BaseModel):
+    enterprise_id: int
+    respondent_id: int
+    survey_id: int
+    started_at: datetime
+    answered_questions: list[int] = []
+
+class SurveyFilter(DateRangeParams):
+    """Фильтр списка опросов; диапазон дат — по started_at."""
+    respondent_id: Optional[int] = None
+    telegram_user_id: Optional[int] = None
+    completed: Optional[bool] = None
@@ -1,6 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
+from app.db.schemas.pagination import DateRangeParams, naive_datetime
 
 class SurveyAnswerBase(BaseModel):
     survey_id: int
@@ -17,4 +18,27 @@ class SurveyAnswerOut(SurveyAnswerBase):
     id: int
     created_at: datetime
     class Config:
-        model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+        model_config = ConfigDict(from_attributes=True)
+
+class SurveyAnswerFilter(DateRangeParams):
+    """Фильтр списка ответов; диапазон дат — по created_at."""
+    survey_id: Optional[int] = None
+    question_id: Optional[int] = None
+
+class SurveyAnswerExportParams(BaseModel):
+    """
+    Параметры выгрузки ответов. after_id позволяет продолжить прерванную
+    выгрузку с id последней полученной строки.
+    """
+    format: Literal['ndjson', 'csv'] = 'ndjson'
+    survey_id: Optional[int] = None
+    question_id: Optional[int] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    after_id: Optional[int] = Field(None, ge=0)
+    include_contacts: bool = False
+
+    @field_validator('date_from', 'date_to')
+    @classmethod
+    def to_naive(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return naive_datetime(value)
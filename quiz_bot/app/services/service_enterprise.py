@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_enterprise as crud
-from app.db.schemas.enterprise import EnterpriseCreate, EnterpriseUpdate
+from app.db.schemas.enterprise import EnterpriseCreate, EnterpriseUpdate, EnterpriseFilter
 from app.db.models import Enterprises
 
 async def create(session: AsyncSession, data: EnterpriseCreate)-> Enterprises | object:
@@ -16,6 +16,19 @@ async def create(session: AsyncSession, data: EnterpriseCreate)-> Enterprises |
     """
     return await crud.create(session, data)
 
+async def upsert_by_inn(session: AsyncSession, data: EnterpriseCreate) -> Enterprises | object:
+    """
+    Возвращает предприятие с таким же ИНН (обновив название) или создает новое.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (EnterpriseCreate): Данные предприятия.
+
+    Returns:
+        Enterprises | list: Объект предприятия или пустой список при ошибке.
+    """
+    return await crud.upsert_by_inn(session, data)
+
 async def get(session: AsyncSession, enterprise_id: int) ->  Enterprises | object:
     """
     Получает предприятие по его идентификатору.
@@ -29,17 +42,18 @@ async def get(session: AsyncSession, enterprise_id: int) ->  Enterprises | objec
     """
     return await crud.get(session, enterprise_id)
 
-async def get_all(session: AsyncSession) -> list[Enterprises] | object:
+async def get_all(session: AsyncSession, filters: EnterpriseFilter) -> list[Enterprises] | object:
     """
-    Получает все предприятия из базы данных.
+    Получает страницу списка предприятий из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (EnterpriseFilter): Фильтры и параметры страницы.
 
     Returns:
         list[Enterprises] | list: Список предприятий или пустой список при ошибке.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, enterprise_id: int, data: EnterpriseUpdate)-> Enterprises | object:
 
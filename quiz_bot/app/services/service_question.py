@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_question as crud
-from app.db.schemas.question import QuestionCreate
+from app.db.schemas.question import QuestionCreate, QuestionFilter
 from app.db.models import Questions 
 
 async def create(session: AsyncSession, data: QuestionCreate)-> Questions | object:
@@ -16,6 +16,19 @@ async def create(session: AsyncSession, data: QuestionCreate)-> Questions | obje
     """
     return await crud.create(session, data)
 
+async def get_or_create(session: AsyncSession, data: QuestionCreate) -> Questions | object:
+    """
+    Возвращает вопрос с таким же номером или создает новый.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для взаимодействия с базой данных.
+        data (QuestionCreate): Данные вопроса.
+
+    Returns:
+        Questions | object: Существующий или созданный вопрос или объект ошибки при неудаче.
+    """
+    return await crud.get_or_create(session, data)
+
 async def get(session: AsyncSession, question_id: int) ->  Questions | object:
     """
     Получает вопрос по его идентификатору.
@@ -29,17 +42,18 @@ async def get(session: AsyncSession, question_id: int) ->  Questions | object:
     """
     return await crud.get(session, question_id)
 
-async def get_all(session: AsyncSession) -> list[Questions] | object:
+async def get_all(session: AsyncSession, filters: QuestionFilter) -> list[Questions] | object:
     """
-    Получает список всех вопросов из базы данных.
+    Получает страницу списка вопросов из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для взаимодействия с базой данных.
+        filters (QuestionFilter): Фильтры и параметры страницы.
 
     Returns:
         list[Questions] | object: Список объектов вопросов или объект ошибки при неудаче.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, question_id: int, data: QuestionCreate)-> Questions | object:
 
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_respondent as crud
-from app.db.schemas.respondent import RespondentCreate, RespondentUpdate
+from app.db.schemas.respondent import RespondentCreate, RespondentUpdate, RespondentFilter
 from app.db.models import Respondents 
 
 async def create(session: AsyncSession, data: RespondentCreate)-> Respondents | object:
@@ -29,17 +29,44 @@ async def get(session: AsyncSession, respondent_id: int) ->  Respondents | objec
     """
     return await crud.get(session, respondent_id)
 
-async def get_all(session: AsyncSession) -> list[Respondents] | object:
+async def get_by_contact(session: AsyncSession, phone: str | None = None, email: str | None = None) -> list[Respondents] | object:
     """
-    Получает всех респондентов из базы данных.
+    Находит респондентов по телефону и/или email.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        phone (str | None): Телефон для поиска.
+        email (str | None): Email для поиска.
+
+    Returns:
+        list[Respondents] | list: Найденные респонденты или пустой список при ошибке.
+    """
+    return await crud.get_by_contact(session, phone, email)
+
+async def reindex_contacts(session: AsyncSession) -> int:
+    """
+    Заполняет слепые индексы контактов у ранее сохраненных респондентов.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+
+    Returns:
+        int: Число обработанных респондентов.
+    """
+    return await crud.reindex_contacts(session)
+
+async def get_all(session: AsyncSession, filters: RespondentFilter) -> list[Respondents] | object:
+    """
+    Получает страницу списка респондентов из базы данных.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (RespondentFilter): Фильтры и параметры страницы.
 
     Returns:
         list[Respondents] | list: Список респондентов или пустой список при ошибке.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, respondent_id: int, data: RespondentUpdate) -> Respondents | object:
 
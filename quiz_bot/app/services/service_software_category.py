@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_software_category as crud
-from app.db.schemas.software_category import SoftwareCategoryCreate, SoftwareCategoryUpdate
+from app.db.schemas.software_category import SoftwareCategoryCreate, SoftwareCategoryUpdate, SoftwareCategoryFilter, SoftwareCategorySearch
 from app.db.models import SoftwareCategories
 
 async def create(session: AsyncSession, data: SoftwareCategoryCreate)-> SoftwareCategories | object:
@@ -31,18 +31,47 @@ async def get(session: AsyncSession, software_category_id: int) ->  SoftwareCate
     """
     return await crud.get(session, software_category_id)
 
-async def get_all(session: AsyncSession) -> list[SoftwareCategories] | object:
+async def get_or_create(session: AsyncSession, data: SoftwareCategoryCreate) -> SoftwareCategories | object:
     """
-    Возвращает список всех категорий программного обеспечения.
+    Возвращает категорию программного обеспечения по имени без учета регистра или создаёт новую.
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        data (SoftwareCategoryCreate): Данные категории ПО.
+
+    Returns:
+        SoftwareCategories: Существующий или созданный объект категории ПО.
+        object: Альтернативный тип при ошибке.
+    """
+    return await crud.get_or_create(session, data)
+
+async def search(session: AsyncSession, params: SoftwareCategorySearch) -> list[SoftwareCategories] | object:
+    """
+    Ищет категории программного обеспечения по началу названия без учета регистра.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        params (SoftwareCategorySearch): Префикс и максимальное число результатов.
+
+    Returns:
+        list[SoftwareCategories]: Найденные категории.
+        object: Альтернативный тип при ошибке.
+    """
+    return await crud.search(session, params)
+
+async def get_all(session: AsyncSession, filters: SoftwareCategoryFilter) -> list[SoftwareCategories] | object:
+    """
+    Возвращает страницу списка категорий программного обеспечения.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        filters (SoftwareCategoryFilter): Фильтры и параметры страницы.
 
     Returns:
         list[SoftwareCategories]: Список всех объектов категорий.
         object: Альтернативный тип при ошибке.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, software_category_id: int, data: SoftwareCategoryUpdate) -> SoftwareCategories | object:
 
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_survey as crud
-from app.db.schemas.survey import SurveyCreate
+from app.db.schemas.survey import SurveyCreate, SurveyStart, SurveyStartOut, SurveyActiveOut, SurveyFilter
 from app.db.models import Surveys 
 
 async def create(session: AsyncSession, data: SurveyCreate)-> Surveys | object:
@@ -16,6 +16,32 @@ async def create(session: AsyncSession, data: SurveyCreate)-> Surveys | object:
     """
     return await crud.create(session, data)
 
+async def start(session: AsyncSession, data: SurveyStart) -> SurveyStartOut | object:
+    """
+    Начинает опрос: предприятие, респондент, опрос и первый вопрос в одной транзакции.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        data (SurveyStart): Данные для начала опроса.
+
+    Returns:
+        SurveyStartOut | list: Идентификаторы записей или пустой список при ошибке.
+    """
+    return await crud.start(session, data)
+
+async def get_active(session: AsyncSession, telegram_user_id: int) -> SurveyActiveOut | None:
+    """
+    Получает последний незавершенный опрос пользователя Telegram.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия для работы с БД.
+        telegram_user_id (int): Идентификатор пользователя Telegram.
+
+    Returns:
+        SurveyActiveOut | None: Опрос с номерами отвеченных вопросов или None, если его нет.
+    """
+    return await crud.get_active(session, telegram_user_id)
+
 async def get(session: AsyncSession, survey_id: int) ->  Surveys | object:
     """
     Получает опрос по его идентификатору.
@@ -29,17 +55,18 @@ async def get(session: AsyncSession, survey_id: int) ->  Surveys | object:
     """
     return await crud.get(session, survey_id)
 
-async def get_all(session: AsyncSession) -> list[Surveys] | object:
+async def get_all(session: AsyncSession, filters: SurveyFilter) -> list[Surveys] | object:
     """
-    Получает все опросы из базы данных.
+    Получает страницу списка опросов из базы данных.
 
     Args:
         session (AsyncSession): Асинхронная сессия для работы с БД.
+        filters (SurveyFilter): Фильтры и параметры страницы.
 
     Returns:
         list[Surveys] | list: Список опросов или пустой список при ошибке.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, survey_id: int, data: SurveyCreate)-> Surveys | object:
 
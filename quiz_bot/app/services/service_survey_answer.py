@@ -1,6 +1,7 @@
+from typing import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import crud_survey_answer as crud
-from app.db.schemas.survey_answer import SurveyAnswerCreate, SurveyAnswerUpdate
+from app.db.schemas.survey_answer import SurveyAnswerCreate, SurveyAnswerUpdate, SurveyAnswerFilter, SurveyAnswerExportParams
 from app.db.models import SurveyAnswers 
 
 async def create(session: AsyncSession, data: SurveyAnswerCreate)-> SurveyAnswers | object:
@@ -14,9 +15,26 @@ async def create(session: AsyncSession, data: SurveyAnswerCreate)-> SurveyAnswer
     Returns:
         SurveyAnswers | object: Объект модели SQLAlchemy при успешном создании,
         либо объект с ошибкой или пустой список при сбое.
+
+    Raises:
+        IntegrityError: Если ответ ссылается на несуществующий опрос или вопрос.
+        DataError: Если данные ответа не подходят под типы столбцов.
     """
     return await crud.create(session, data)
 
+async def create_many(session: AsyncSession, data: list[SurveyAnswerCreate]) -> list[SurveyAnswers] | object:
+    """
+    Создает пачку ответов на вопросы одним запросом к базе данных.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy для работы с базой данных.
+        data (list[SurveyAnswerCreate]): Данные для создания ответов.
+
+    Returns:
+        list[SurveyAnswers] | object: Список созданных ответов или пустой список для пустой пачки.
+    """
+    return await crud.create_many(session, data)
+
 async def get(session: AsyncSession, survey_answer_id: int) ->  SurveyAnswers | object:
     """
     Получает ответ на вопрос по его идентификатору.
@@ -30,18 +48,33 @@ async def get(session: AsyncSession, survey_answer_id: int) ->  SurveyAnswers |
     """
     return await crud.get(session, survey_answer_id)
 
-async def get_all(session: AsyncSession) -> list[SurveyAnswers] | object:
+async def get_all(session: AsyncSession, filters: SurveyAnswerFilter) -> list[SurveyAnswers] | object:
     """
-    Получает список всех ответов на вопросы.
+    Получает страницу списка ответов на вопросы.
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy для работы с базой данных.
+        filters (SurveyAnswerFilter): Фильтры и параметры страницы.
 
     Returns:
         list[SurveyAnswers] | object: Список объектов ответов или пустой список при ошибке.
     """
-    return await crud.get_all(session)
+    return await crud.get_all(session, filters)
 
 async def update(session: AsyncSession, survey_answer_id: int, data: SurveyAnswerUpdate)-> SurveyAnswers | object:
     
-    return await crud.update(session, survey_answer_id, data)
\ No newline at end of file
+    return await crud.update(session, survey_answer_id, data)
+
+def export(session: AsyncSession, params: SurveyAnswerExportParams, batch_size: int) -> AsyncIterator[list[dict]]:
+    """
+    Выгружает ответы вместе с вопросами, опросами, респондентами и предприятиями пачками строк.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия, открытая на время выгрузки.
+        params (SurveyAnswerExportParams): Фильтры выгрузки.
+        batch_size (int): Число строк, читаемых из БД за раз.
+
+    Returns:
+        AsyncIterator[list[dict]]: Пачки строк выгрузки.
+    """
+    return crud.export(session, params, batch_size)
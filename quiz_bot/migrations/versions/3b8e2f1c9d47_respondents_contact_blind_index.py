@@ -0,0 +1,34 @@
+"""respondents contact blind index
+
+Revision ID: 3b8e2f1c9d47
+Revises: 15ed0bf0a23e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e2f1c9d47'
+down_revision: Union[str, None] = '15ed0bf0a23e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('respondents', sa.Column('phone_hash', sa.String(length=64), nullable=True))
+    op.add_column('respondents', sa.Column('email_hash', sa.String(length=64), nullable=True))
+    op.create_index('idx_respondents_phone_hash', 'respondents', ['phone_hash'], unique=False)
+    op.create_index('idx_respondents_email_hash', 'respondents', ['email_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_respondents_email_hash', table_name='respondents')
+    op.drop_index('idx_respondents_phone_hash', table_name='respondents')
+    op.drop_column('respondents', 'email_hash')
+    op.drop_column('respondents', 'phone_hash')
@@ -0,0 +1,32 @@
+"""nullable enterprise inn
+
+Revision ID: 4f8b1d6e3a92
+Revises: 9d2e5b7a4c18
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b1d6e3a92'
+down_revision: Union[str, None] = '9d2e5b7a4c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Предприятия без ИНН хранятся с NULL: уникальность по ИНН их не объединяет
+    op.alter_column('enterprises', 'inn', existing_type=sa.String(length=12), nullable=True)
+    op.execute(sa.text("UPDATE enterprises SET inn = NULL WHERE inn = ''"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("UPDATE enterprises SET inn = '' WHERE inn IS NULL AND id = (SELECT min(id) FROM enterprises WHERE inn IS NULL)"))
+    op.execute(sa.text("UPDATE enterprises SET inn = left('-' || id::text, 12) WHERE inn IS NULL"))
+    op.alter_column('enterprises', 'inn', existing_type=sa.String(length=12), nullable=False)
@@ -0,0 +1,41 @@
+"""software category name lower unique
+
+Revision ID: 6a3c9e2f7b51
+Revises: 4f8b1d6e3a92
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a3c9e2f7b51'
+down_revision: Union[str, None] = '4f8b1d6e3a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Из категорий, совпадающих после нормализации без учета регистра,
+    # остается созданная первой. Удаление выполняется до нормализации: иначе
+    # UPDATE столкнулся бы с UNIQUE(name) на парах вроде "CRM" / "CRM "
+    normalized = r"lower(regexp_replace(btrim({0}.name), '\s+', ' ', 'g'))"
+    op.execute(sa.text(
+        "DELETE FROM software_categories s USING software_categories k "
+        f"WHERE {normalized.format('k')} = {normalized.format('s')} AND k.id < s.id"
+    ))
+    op.drop_constraint('software_categories_name_key', 'software_categories', type_='unique')
+    # Названия приводятся к виду, который сохраняет API
+    op.execute(sa.text(r"UPDATE software_categories SET name = regexp_replace(btrim(name), '\s+', ' ', 'g')"))
+    op.create_index('idx_software_categories_name_lower', 'software_categories',
+                    [sa.text('lower(name) text_pattern_ops')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_software_categories_name_lower', table_name='software_categories')
+    op.create_unique_constraint('software_categories_name_key', 'software_categories', ['name'])
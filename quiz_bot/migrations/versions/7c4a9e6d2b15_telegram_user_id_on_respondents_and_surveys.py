@@ -0,0 +1,35 @@
+"""telegram user id on respondents and surveys
+
+Revision ID: 7c4a9e6d2b15
+Revises: 3b8e2f1c9d47
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4a9e6d2b15'
+down_revision: Union[str, None] = '3b8e2f1c9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('respondents', sa.Column('telegram_user_id', sa.BigInteger(), nullable=True))
+    op.add_column('surveys', sa.Column('telegram_user_id', sa.BigInteger(), nullable=True))
+    op.create_index('idx_respondents_telegram_user', 'respondents', ['telegram_user_id'], unique=False)
+    op.create_index('idx_surveys_telegram_user_active', 'surveys', ['telegram_user_id', 'id'], unique=False,
+                    postgresql_where=sa.text('completed_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_surveys_telegram_user_active', table_name='surveys')
+    op.drop_index('idx_respondents_telegram_user', table_name='respondents')
+    op.drop_column('surveys', 'telegram_user_id')
+    op.drop_column('respondents', 'telegram_user_id')
@@ -0,0 +1,44 @@
+"""unique question number
+
+Revision ID: 9d2e5b7a4c18
+Revises: 7c4a9e6d2b15
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e5b7a4c18'
+down_revision: Union[str, None] = '7c4a9e6d2b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубликаты вопросов с одним номером сводятся к вопросу с наименьшим id:
+    # ответы переносятся на него, остальные строки удаляются
+    op.execute(sa.text("""
+        WITH keep AS (
+            SELECT number, min(id) AS id FROM questions GROUP BY number
+        )
+        UPDATE survey_answers AS a
+        SET question_id = keep.id
+        FROM questions AS q JOIN keep ON keep.number = q.number
+        WHERE a.question_id = q.id AND q.id <> keep.id
+    """))
+    op.execute(sa.text("""
+        DELETE FROM questions AS q
+        USING questions AS k
+        WHERE k.number = q.number AND k.id < q.id
+    """))
+    op.create_index('idx_questions_number', 'questions', ['number'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_questions_number', table_name='questions')